@@ -1,8 +1,9 @@
-from electrical_values import VoltageVariable
+from electrical_values import VoltageVariable, VIResultStore
 from electrical_relations import calculate_current
 from base_elements import Element1Terminal, CompositeElement
 
 from abc import abstractmethod
+import numpy as np
 
 
 class ActiveElement1Terminal(Element1Terminal):
@@ -74,10 +75,40 @@ class ActiveElement1Terminal(Element1Terminal):
         self.v_internal.define_values_pos_fault_pu(0, v_internal, 0)
 
 
-# The ActiveCompositeElement is only present to maintain symmetry with the PassiveCompositeElement and can be removed
-# in the future if it remains unnecessary
 class ActiveCompositeElement(CompositeElement):
 
     def __init__(self, elements: list[ActiveElement1Terminal]):
 
         super().__init__(elements)
+
+        self.v_internal = VoltageVariable(self.base_m)
+
+    def calculate_internal_voltage(self, impressed_bus_current_pre_fault: complex = None):
+        """
+        Defines the internal voltage of the composite as the EMF of the Norton equivalent of its sources in parallel,
+        sum(y * e) / sum(y) with the seq1 admittance y and the internal voltage e of each element, so the composite
+        impresses on its bus the sum of the currents its elements impress.
+
+        Args:
+            impressed_bus_current_pre_fault (complex): The pre-fault current impressed on the bus by the composite. It
+                is first shared by the elements in proportion to their admittances, which defines their internal
+                voltages (as the load flow shares the generation of a bus by its sources). None to keep the internal
+                voltages the elements have.
+        """
+        y_elements_pu = np.array([element.branches_seq1[0].y_pu for element in self.elements], dtype=complex)
+        if impressed_bus_current_pre_fault is not None:
+            for element, y_element_pu in zip(self.elements, y_elements_pu):
+                element.calculate_internal_voltage(impressed_bus_current_pre_fault * y_element_pu /
+                                                   self.branches_seq1[0].y_pu)
+
+        # The internal voltage is defined when the internal voltages of all the elements are
+        internal_voltages = [element.v_internal for element in self.elements]
+        v_elements_pu = np.array([variable.result_store.values[variable.slot, VIResultStore.PRE_FAULT]
+                                  for variable in internal_voltages], dtype=complex)
+        defined = all(variable.result_store.defined[variable.slot, VIResultStore.PRE_FAULT]
+                      for variable in internal_voltages)
+
+        v_internal = np.sum(y_elements_pu * v_elements_pu) / self.branches_seq1[0].y_pu
+        self.v_internal.result_store.write(self.v_internal.slot,
+                                           slice(VIResultStore.PRE_FAULT, VIResultStore.POS_FAULT_SEQ2 + 1),
+                                           (v_internal, 0, v_internal, 0), defined)
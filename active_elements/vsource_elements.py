@@ -1,6 +1,7 @@
 from active_elements.base_elements import ActiveElement1Terminal
-from electrical_values import ImmittanceConstant, VoltageVariable
+from electrical_values import ImmittanceConstant, VoltageVariable, PuBaseManager
 from electrical_relations import equivalent_y_series
+import numpy as np
 
 
 class NetworkEquivalent(ActiveElement1Terminal):
@@ -8,9 +9,10 @@ class NetworkEquivalent(ActiveElement1Terminal):
     def __init__(self, z_series_seq0_pu: complex, z_series_seq1_pu: complex, z_series_seq2_pu: complex, id_bus_m: int,
                  v_nom_kv: float, s_nom_mva: float):
 
-        y_series_seq0_pu = z_series_seq0_pu**(-1)
-        y_series_seq1_pu = z_series_seq1_pu**(-1)
-        y_series_seq2_pu = z_series_seq2_pu**(-1)
+        # 1 / z gives 0 for an open (infinite) sequence impedance, z**(-1) gives NaN
+        y_series_seq0_pu = 1 / z_series_seq0_pu
+        y_series_seq1_pu = 1 / z_series_seq1_pu
+        y_series_seq2_pu = 1 / z_series_seq2_pu
 
         super().__init__(y_series_seq0_pu, y_series_seq1_pu, y_series_seq2_pu, id_bus_m, v_nom_kv * 1000,
                          s_nom_mva * (10**6))
@@ -33,6 +35,87 @@ class NetworkEquivalent(ActiveElement1Terminal):
         self.branches_seq0 = [ImmittanceConstant(y_series_seq0_pu, self.base_m, self.id_bus_m, 0)]
 
 
+class MultiPortEquivalent:
+    """
+    A reduced equivalent of a network seen from a set of boundary buses (the ports), e.g. the upstream grid of a
+    distribution study, obtained by Network.kron_reduction.
+
+    The reduced admittance matrix of each sequence is represented by branches: -Y[i, j] between the ports i and j and
+    the row sum of Y[i] from the port i to the ground.
+
+    Attributes:
+        id_buses (np.ndarray): The bus ids of the ports.
+        v_bases_kv (np.ndarray): The voltage bases of the ports the matrices are in pu of, in kV.
+        s_base_mva (float): The power base the matrices are in pu of, in MVA.
+        admittance_matrices (dict): The reduced admittance matrix of each sequence in pu, shape (ports, ports).
+    """
+
+    def __init__(self, admittance_matrices: dict, id_buses, v_bases_kv, s_base_mva: float):
+        self.id_buses = np.asarray(id_buses, dtype=np.int64)
+        self.v_bases_kv = np.asarray(v_bases_kv, dtype=float)
+        self.s_base_mva = s_base_mva
+        self.admittance_matrices = {seq: np.asarray(admittance_matrix, dtype=complex)
+                                    for seq, admittance_matrix in admittance_matrices.items()}
+
+        self.bases = [PuBaseManager.create_pu_base(v_base_kv * 1000, s_base_mva * (10**6), id_bus)
+                      for v_base_kv, id_bus in zip(self.v_bases_kv, self.id_buses)]
+
+        self.branches_seq0: list[ImmittanceConstant] = self._matrix_branches('seq0')
+        self.branches_seq1: list[ImmittanceConstant] = self._matrix_branches('seq1')
+        self.branches_seq2: list[ImmittanceConstant] = self._matrix_branches('seq2')
+
+    def _matrix_branches(self, seq: str) -> list[ImmittanceConstant]:
+        admittance_matrix = self.admittance_matrices[seq]
+        shunts = admittance_matrix.sum(axis=1)
+
+        branches = []
+        for i, (id_bus_i, base_i) in enumerate(zip(self.id_buses, self.bases)):
+            ports = [(0, shunts[i])] + [(self.id_buses[j], -admittance_matrix[i, j])
+                                        for j in range(i + 1, len(self.id_buses))]
+
+            for id_bus_j, y_pu in ports:
+                if y_pu == 0:
+                    continue
+
+                branch = ImmittanceConstant(complex(y_pu), base_i, int(id_bus_i), int(id_bus_j))
+                # The matrices are in pu of the bases of the reduction, which base_i may not have been created with
+                branch.z_baseM = (self.v_bases_kv[i] * 1000) ** 2 / (self.s_base_mva * (10**6))
+                branches.append(branch)
+
+        return branches
+
+    def admittance_representation(self, seq: str) -> list[ImmittanceConstant]:
+        if seq == "seq0":
+            return self.branches_seq0
+        elif seq == "seq1":
+            return self.branches_seq1
+        elif seq == "seq2":
+            return self.branches_seq2
+
+    def port_currents_pu(self, seq: str, v_ports_pu) -> np.ndarray:
+        """
+        Returns the currents injected into the equivalent at its ports for the given port voltages of a sequence.
+        """
+        return self.admittance_matrices[seq] @ np.asarray(v_ports_pu, dtype=complex)
+
+    def save(self, file):
+        """
+        Saves the equivalent into a .npz file.
+        """
+        np.savez(file, id_buses=self.id_buses, v_bases_kv=self.v_bases_kv, s_base_mva=self.s_base_mva,
+                 **self.admittance_matrices)
+
+    @classmethod
+    def load(cls, file):
+        """
+        Loads an equivalent saved by save.
+        """
+        with np.load(file) as data:
+            admittance_matrices = {seq: data[seq] for seq in ('seq0', 'seq1', 'seq2')}
+
+            return cls(admittance_matrices, data['id_buses'], data['v_bases_kv'], float(data['s_base_mva']))
+
+
 class SynchronousGenerator(ActiveElement1Terminal):
 
     def __init__(self, z_series_seq0_pu: complex, z_series_seq1_pu: complex, z_series_seq2_pu: complex, id_bus_m: int,
@@ -41,12 +124,16 @@ class SynchronousGenerator(ActiveElement1Terminal):
         self.connection = connection
         self.electromotive_force = None
 
+        # The grounding admittance is needed by _define_seq0_topology, which runs inside super().__init__, so the base
+        # is fetched here (it is the same base the element gets afterwards)
+        base_m = PuBaseManager.create_pu_base(v_nom_kv * 1000, s_nom_mva * (10**6), id_bus_m)
+
         if connection == 'Yg':
-            self.y_grounded = ImmittanceConstant(float('inf'), self.base_m, 0, 0)
+            self.y_grounded = ImmittanceConstant(float('inf'), base_m, 0, 0)
         elif connection == 'Yzn':
-            self.y_grounded = ImmittanceConstant(zn_grounded_pu ** (-1), self.base_m, 0, 0)
+            self.y_grounded = ImmittanceConstant(zn_grounded_pu ** (-1), base_m, 0, 0)
         elif (connection == 'Y') or (connection == 'Yn') or (connection == 'D'):
-            self.y_grounded = ImmittanceConstant(0, self.base_m, 0, 0)
+            self.y_grounded = ImmittanceConstant(0, base_m, 0, 0)
         else:
             # ! exception here:
             pass
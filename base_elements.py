@@ -1,5 +1,10 @@
-from electrical_values import VoltageVariable, CurrentVariable, PuBase, PuBaseManager, ImmittanceConstant
+from electrical_values import (VoltageVariable, CurrentVariable, PuBase, PuBaseManager, ImmittanceConstant,
+                               VIResultStore)
 from abc import abstractmethod
+import numpy as np
+
+# The terminals joined by the branches i_mn, i_np and i_mp of Element3Terminals, by position
+BRANCH_TERMINALS = ((0, 1), (1, 2), (0, 2))
 
 
 class Element3Terminals:
@@ -45,6 +50,12 @@ class Element3Terminals:
 
         self._define_seq0_topology(y_series_mn_seq0_pu, y_series_np_seq0_pu, y_series_mp_seq0_pu)
 
+        # The admittances are given in pu of the nominal values of the element, while base_m is shared by every
+        # element of the bus and may have been created with other values, so they are referred to the nominal base
+        z_base_nominal_m = v_base_m ** 2 / s_base
+        for branch in self.branches_seq0 + self.branches_seq1 + self.branches_seq2:
+            branch.z_baseM = z_base_nominal_m
+
     @abstractmethod
     def _define_seq0_topology(self, y_series_mn_seq0_pu: complex, y_series_np_seq0_pu: complex,
                               y_series_mp_seq0_pu: complex):
@@ -165,10 +176,6 @@ class CompositeElement:
 
     def _composite_immittance(self, seq: str):
 
-        y_series_mn_pu = 0
-        y_series_np_pu = 0
-        y_series_mp_pu = 0
-
         branches_seq = []
 
         if seq == 'seq0':
@@ -186,87 +193,47 @@ class CompositeElement:
             pass
             # ! Raise an exception
 
+        # The elements have the same branches, so the branches in the same position are in parallel. Some elements
+        # have less than three branches in a sequence (e.g. the seq0 of a NetworkEquivalent)
+        reference_branches = branches_seq[0]
+        y_series_pu = [0] * len(reference_branches)
         for branches in branches_seq:
-            y_series_mn_pu += branches[0].y_pu
-            y_series_np_pu += branches[1].y_pu
-            y_series_mp_pu += branches[2].y_pu
+            for index, branch in enumerate(branches):
+                y_series_pu[index] += branch.y_pu
 
-        reference_branches = branches_seq[0]
-        id_bus_m_immitance_0, id_bus_n_immitance_0 = reference_branches[0].id_bus_m, reference_branches[0].id_bus_n
-        id_bus_n_immitance_1, id_bus_p_immitance_1 = reference_branches[1].id_bus_m, reference_branches[1].id_bus_n
-        id_bus_m_immitance_2, id_bus_p_immitance_2 = reference_branches[2].id_bus_m, reference_branches[2].id_bus_n
+        return [ImmittanceConstant(y_pu, self.elements[0].base_m, branch.id_bus_m, branch.id_bus_n)
+                for y_pu, branch in zip(y_series_pu, reference_branches)]
 
-        return [ImmittanceConstant(y_series_mn_pu, self.elements[0].base_m, id_bus_m_immitance_0, id_bus_n_immitance_0),
-                ImmittanceConstant(y_series_np_pu, self.elements[0].base_m, id_bus_n_immitance_1, id_bus_p_immitance_1),
-                ImmittanceConstant(y_series_mp_pu, self.elements[0].base_m, id_bus_m_immitance_2, id_bus_p_immitance_2)]
+    def _sum_element_currents(self, columns: slice):
+        # Sums the currents of the elements straight from their slots in the result store, so a current the elements
+        # don't define stays undefined in the composite instead of failing
+        for name in ('i_mn', 'i_np', 'i_mp', 'i_bus_m', 'i_bus_n', 'i_bus_p'):
+            current = getattr(self, name)
+            element_currents = [getattr(element, name) for element in self.elements]
 
-    def calculate_internal_currents_pre_fault_pu(self):
-        i_mn_pu, i_mp_pu, i_np_pu = 0, 0, 0
-        i_bus_m_pu, i_bus_n_pu, i_bus_p_pu = 0, 0, 0
+            values = sum(element_current.result_store.values[element_current.slot, columns]
+                         for element_current in element_currents)
+            defined = np.logical_and.reduce([element_current.result_store.defined[element_current.slot, columns]
+                                             for element_current in element_currents])
+            current.result_store.write(current.slot, columns, values, defined)
 
+    def calculate_internal_currents_pre_fault_pu(self):
         for element in self.elements:
             element.calculate_internal_currents_pre_fault_pu()
 
-            i_mn_pu += element.i_mn.pre().a().pu().rec()
-            i_mp_pu += element.i_mp.pre().a().pu().rec()
-            i_np_pu += element.i_np.pre().a().pu().rec()
-
-            i_bus_m_pu += element.i_bus_m.pre().a().pu().rec()
-            i_bus_n_pu += element.i_bus_n.pre().a().pu().rec()
-            i_bus_p_pu += element.i_bus_p.pre().a().pu().rec()
-
-        self.i_mn.define_value_pre_fault_pu(i_mn_pu)
-        self.i_np.define_value_pre_fault_pu(i_np_pu)
-        self.i_mp.define_value_pre_fault_pu(i_mp_pu)
-
-        self.i_bus_m.define_value_pre_fault_pu(i_bus_m_pu)
-        self.i_bus_n.define_value_pre_fault_pu(i_bus_n_pu)
-        self.i_bus_p.define_value_pre_fault_pu(i_bus_p_pu)
+        self._sum_element_currents(slice(VIResultStore.PRE_FAULT, VIResultStore.PRE_FAULT + 1))
 
     def calculate_internal_currents_pos_fault_pu(self):
-        i_mn_seq0_pu, i_np_seq0_pu, i_mp_seq0_pu = 0, 0, 0
-        i_bus_m_seq0_pu, i_bus_n_seq0_pu, i_bus_p_seq0_pu = 0, 0, 0
-
-        i_mn_seq1_pu, i_np_seq1_pu, i_mp_seq1_pu = 0, 0, 0
-        i_bus_m_seq1_pu, i_bus_n_seq1_pu, i_bus_p_seq1_pu = 0, 0, 0
-
-        i_mn_seq2_pu, i_np_seq2_pu, i_mp_seq2_pu = 0, 0, 0
-        i_bus_m_seq2_pu, i_bus_n_seq2_pu, i_bus_p_seq2_pu = 0, 0, 0
-
         for element in self.elements:
             element.calculate_internal_currents_pos_fault_pu()
 
-            i_mn_seq0_pu += element.i_mn.pos().seq0().pu().rec()
-            i_np_seq0_pu += element.i_np.pos().seq0().pu().rec()
-            i_mp_seq0_pu += element.i_mp.pos().seq0().pu().rec()
-
-            i_bus_m_seq0_pu += element.i_bus_m.pos().seq0().pu().rec()
-            i_bus_n_seq0_pu += element.i_bus_n.pos().seq0().pu().rec()
-            i_bus_p_seq0_pu += element.i_bus_p.pos().seq0().pu().rec()
-
-            i_mn_seq1_pu += element.i_mn.pos().seq1().pu().rec()
-            i_np_seq1_pu += element.i_np.pos().seq1().pu().rec()
-            i_mp_seq1_pu += element.i_mp.pos().seq1().pu().rec()
-
-            i_bus_m_seq1_pu += element.i_bus_m.pos().seq1().pu().rec()
-            i_bus_n_seq1_pu += element.i_bus_n.pos().seq1().pu().rec()
-            i_bus_p_seq1_pu += element.i_bus_p.pos().seq1().pu().rec()
-
-            i_mn_seq2_pu += element.i_mn.pos().seq2().pu().rec()
-            i_np_seq2_pu += element.i_np.pos().seq2().pu().rec()
-            i_mp_seq2_pu += element.i_mp.pos().seq2().pu().rec()
-
-            i_bus_m_seq2_pu += element.i_bus_m.pos().seq2().pu().rec()
-            i_bus_n_seq2_pu += element.i_bus_n.pos().seq2().pu().rec()
-            i_bus_p_seq2_pu += element.i_bus_p.pos().seq2().pu().rec()
-
-        self.i_mn.define_values_pos_fault_pu(i_mn_seq0_pu, i_mn_seq1_pu, i_mn_seq2_pu)
-        self.i_np.define_values_pos_fault_pu(i_np_seq0_pu, i_np_seq1_pu, i_np_seq2_pu)
-        self.i_mp.define_values_pos_fault_pu(i_mp_seq0_pu, i_mp_seq1_pu, i_mp_seq2_pu)
+        self.sum_element_currents_pos_fault_pu()
 
-        self.i_bus_m.define_values_pos_fault_pu(i_bus_m_seq0_pu, i_bus_m_seq1_pu, i_bus_m_seq2_pu)
-        self.i_bus_n.define_values_pos_fault_pu(i_bus_n_seq0_pu, i_bus_n_seq1_pu, i_bus_n_seq2_pu)
-        self.i_bus_p.define_values_pos_fault_pu(i_bus_p_seq0_pu, i_bus_p_seq1_pu, i_bus_p_seq2_pu)
+    def sum_element_currents_pos_fault_pu(self):
+        """
+        Defines the post-fault currents of the composite as the sums of those of its elements, already calculated.
+        """
+        self._sum_element_currents(slice(VIResultStore.POS_FAULT_SEQ0, VIResultStore.POS_FAULT_SEQ2 + 1))
 
     def admittance_representation(self, seq: str) -> list[ImmittanceConstant]:
         if seq == "seq0":
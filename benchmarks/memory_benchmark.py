@@ -0,0 +1,138 @@
+"""
+Measures the memory footprint of the object API: the memory a network with many TransmissionLine objects allocates,
+per bus and per element, and the size of the small objects each element creates (PuBase, ImmittanceConstant,
+VIVariable).
+
+Run it from the root of the package, e.g. `python -m benchmarks.memory_benchmark`, which builds 100000 lines on 50000
+buses. The memory per bus and per line is checked against the baseline below, measured the same way on the tree before
+PuBase, ImmittanceConstant, VIVariable and Bus were slot-based: the run fails when most of the reduction is lost. The
+numbers depend on the Python build and on the size of the network, so the check only holds on a similar build with the
+default size.
+"""
+from network_elements.generic_elements import Network, Bus
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine
+from electrical_values import PuBase, PuBaseManager, ImmittanceConstant, VoltageVariable, CurrentVariable
+from passive_elements.element_tables import LineTable
+import numpy as np
+import tracemalloc
+import sys
+import gc
+
+
+# The baseline: the bytes per bus of the Network and per TransmissionLine allocated by measure_objects with 100000 lines
+# on the tree before the small objects were slot-based, on CPython 3.11.7 with NumPy 2.4.6. That tree has neither
+# 'with network:' nor trim, so its elements were created with the global bases and added to the network. The same
+# build measures 567 B per bus and 2881 B per line after the change, a reduction of 78 % and 60 %
+BASELINE_BYTES_PER_BUS = 2628
+BASELINE_BYTES_PER_LINE = 7187
+REQUIRED_BUS_REDUCTION = 0.5
+REQUIRED_LINE_REDUCTION = 0.5
+DEFAULT_NUMBER_ELEMENTS = 100000
+
+
+def object_size(instance) -> int:
+    """
+    Returns the size of an object with its __dict__, if it has one.
+    """
+    size = sys.getsizeof(instance)
+    if hasattr(instance, '__dict__'):
+        size += sys.getsizeof(instance.__dict__)
+
+    return size
+
+
+def line_buses(number_elements: int, seed: int = 0) -> tuple[int, np.ndarray, np.ndarray]:
+    # A meshed network with two lines per bus: a chain through every bus plus random links
+    number_buses = max(2, number_elements // 2)
+    rng = np.random.default_rng(seed)
+
+    id_buses_m = rng.integers(1, number_buses + 1, number_elements)
+    id_buses_n = rng.integers(1, number_buses + 1, number_elements)
+    chain = min(number_buses - 1, number_elements)
+    id_buses_m[:chain] = np.arange(1, chain + 1)
+    id_buses_n[:chain] = np.arange(2, chain + 2)
+
+    return number_buses, id_buses_m, id_buses_n
+
+
+def measure_objects(number_elements: int) -> tuple[float, float]:
+    """
+    Builds a network of TransmissionLine objects and returns the memory allocated by the network and by the elements,
+    in bytes.
+    """
+    number_buses, id_buses_m, id_buses_n = line_buses(number_elements)
+
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    network = Network(number_buses, 100e6, 1, 230e3)
+    network_memory = tracemalloc.get_traced_memory()[0] - start
+
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100)]
+        elements.extend(TransmissionLine(0.3 + 1j, 0.1 + 0.5j, 0.1 + 0.5j, 2.0, int(id_bus_m), int(id_bus_n))
+                        for id_bus_m, id_bus_n in zip(id_buses_m, id_buses_n))
+    network.add_elements(elements)
+    network.result_store.trim()
+    elements_memory = tracemalloc.get_traced_memory()[0] - start - network_memory
+
+    tracemalloc.stop()
+    network.release_pu_bases()
+
+    return network_memory, elements_memory
+
+
+def check_reduction(number_buses: int, number_elements: int, network_memory: float, elements_memory: float):
+    """
+    Raises an AssertionError when the memory per bus or per line lost the reduction against the baseline.
+    """
+    bytes_per_bus, bytes_per_line = network_memory / number_buses, elements_memory / number_elements
+
+    assert bytes_per_bus <= (1 - REQUIRED_BUS_REDUCTION) * BASELINE_BYTES_PER_BUS, \
+        f'{bytes_per_bus:.0f} bytes per bus, the baseline is {BASELINE_BYTES_PER_BUS}'
+    assert bytes_per_line <= (1 - REQUIRED_LINE_REDUCTION) * BASELINE_BYTES_PER_LINE, \
+        f'{bytes_per_line:.0f} bytes per line, the baseline is {BASELINE_BYTES_PER_LINE}'
+
+
+def measure_table(number_elements: int) -> float:
+    """
+    Returns the memory allocated by a LineTable with the same lines, in bytes.
+    """
+    _, id_buses_m, id_buses_n = line_buses(number_elements)
+
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    table = LineTable(0.3 + 1j, 0.1 + 0.5j, 0.1 + 0.5j, 2.0, id_buses_m, id_buses_n)
+    table_memory = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    del table
+
+    return table_memory
+
+
+if __name__ == '__main__':
+    number_elements = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_ELEMENTS
+    number_buses = line_buses(number_elements)[0]
+
+    pu_base = PuBase(13.8e3, 100e6, 1)
+    objects = {'PuBase': pu_base, 'ImmittanceConstant': ImmittanceConstant(1 - 10j, pu_base, 1, 2),
+               'VoltageVariable': VoltageVariable(pu_base), 'CurrentVariable': CurrentVariable(pu_base),
+               'Bus': Bus(1, pu_base_manager=PuBaseManager())}
+    for name, instance in objects.items():
+        print(f'{name:>20}: {object_size(instance):6d} bytes')
+
+    network_memory, elements_memory = measure_objects(number_elements)
+    table_memory = measure_table(number_elements)
+
+    print(f'Network of {number_buses} buses: {network_memory / 1e6:.1f} MB, '
+          f'{network_memory / number_buses:.0f} bytes per bus (baseline {BASELINE_BYTES_PER_BUS})')
+    print(f'{number_elements} TransmissionLine objects: {elements_memory / 1e6:.1f} MB, '
+          f'{elements_memory / number_elements:.0f} bytes per element (baseline {BASELINE_BYTES_PER_LINE})')
+    print(f'LineTable of {number_elements} rows: {table_memory / 1e6:.1f} MB, '
+          f'{table_memory / number_elements:.0f} bytes per row')
+
+    check_reduction(number_buses, number_elements, network_memory, elements_memory)
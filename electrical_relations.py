@@ -67,6 +67,96 @@ def calculate_central_v_star(v_bus_m: complex, v_bus_n: complex, v_bus_p: comple
     return v_central
 
 
+def calculate_current_array(y_pu: np.ndarray, v_bus_m: np.ndarray, v_bus_n: np.ndarray) -> np.ndarray:
+    """
+    calculate_current element-wise.
+    """
+    v_pu = np.asarray(v_bus_m, dtype=complex) - np.asarray(v_bus_n, dtype=complex)
+
+    return v_pu * np.asarray(y_pu, dtype=complex)
+
+
+def equivalent_y_series_array(y_1: np.ndarray, y_2: np.ndarray) -> np.ndarray:
+    """
+    equivalent_y_series element-wise. Two open admittances in series give an open one (the scalar version divides by
+    zero there).
+    """
+    y_1, y_2 = np.broadcast_arrays(np.asarray(y_1, dtype=complex), np.asarray(y_2, dtype=complex))
+
+    # The open and infinite admittances give 0 / 0 and inf / inf, which the masks below replace
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_series = (y_1 * y_2) / (y_1 + y_2)
+
+    y_series = np.where((y_1 == 0) & (y_2 == 0), 0, y_series)
+    y_series = np.where(y_2 == np.inf, y_1, y_series)
+
+    return np.where(y_1 == np.inf, y_2, y_series)
+
+
+def delta2star_array(y_mn: np.ndarray, y_np: np.ndarray, y_mp: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    delta2star element-wise, with the same results for the deltas with open branches: an infinite star admittance
+    opposite a single open branch, and twice the sum of the adjacent branches when two branches are open.
+    """
+    y_mn, y_np, y_mp = np.broadcast_arrays(np.asarray(y_mn, dtype=complex), np.asarray(y_np, dtype=complex),
+                                           np.asarray(y_mp, dtype=complex))
+
+    # The open branches divide by zero, which the masks below replace
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_product_sum = y_np * y_mp + y_mn * y_np + y_mn * y_mp
+        y_m = y_product_sum / y_np
+        y_n = y_product_sum / y_mp
+        y_p = y_product_sum / y_mn
+
+    y_m = np.where(y_np == 0, np.inf, y_m)
+    y_n = np.where(y_mp == 0, np.inf, y_n)
+    y_p = np.where(y_mn == 0, np.inf, y_p)
+
+    number_open = (y_mn == 0).astype(int) + (y_np == 0) + (y_mp == 0)
+    two_open = number_open == 2
+    y_m = np.where(two_open, y_mp * 2 + y_mn * 2, y_m)
+    y_n = np.where(two_open, y_mn * 2 + y_np * 2, y_n)
+    y_p = np.where(two_open, y_mp * 2 + y_np * 2, y_p)
+
+    all_open = number_open == 3
+
+    return np.where(all_open, 0, y_m), np.where(all_open, 0, y_n), np.where(all_open, 0, y_p)
+
+
+def star2delta_array(y_m: np.ndarray, y_n: np.ndarray, y_p: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    star2delta element-wise. A star without admittances gives a delta without admittances (the scalar version divides
+    by zero there).
+    """
+    y_m, y_n, y_p = np.broadcast_arrays(np.asarray(y_m, dtype=complex), np.asarray(y_n, dtype=complex),
+                                        np.asarray(y_p, dtype=complex))
+
+    y_sum = y_m + y_n + y_p
+    empty = y_sum == 0
+    # The empty stars divide by zero, the mask replaces them
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_mn = (y_m * y_n) / y_sum
+        y_np = (y_n * y_p) / y_sum
+        y_mp = (y_m * y_p) / y_sum
+
+    return np.where(empty, 0, y_mn), np.where(empty, 0, y_np), np.where(empty, 0, y_mp)
+
+
+def calculate_central_v_star_array(v_bus_m: np.ndarray, v_bus_n: np.ndarray, v_bus_p: np.ndarray, y_m: np.ndarray,
+                                   y_n: np.ndarray, y_p: np.ndarray) -> np.ndarray:
+    """
+    calculate_central_v_star element-wise. The voltage of a floating star point (no admittances) is NaN (the scalar
+    version divides by zero there).
+    """
+    y_m, y_n, y_p = (np.asarray(y, dtype=complex) for y in (y_m, y_n, y_p))
+
+    y_sum = y_m + y_n + y_p
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_central = (np.asarray(v_bus_m) * y_m + np.asarray(v_bus_n) * y_n + np.asarray(v_bus_p) * y_p) / y_sum
+
+    return np.where(y_sum == 0, complex('nan+nanj'), v_central)
+
+
 # ! Perhaps there is a conceptual error in using the following matrix for current calculation to the 3 windings
 # ! transformer
 def calculate_admittance_matrix_mnp_directly(branches: list[ImmittanceConstant], id_bus_m: int, id_bus_n: int,
@@ -155,3 +245,22 @@ if __name__ == '__main__':
         raise Warning('star2delta have mistakes')
     elif not (2.9410, 0.5882, 1.1764) < star2delta(10, 5, 2) < (2.9412, 0.5883, 1.1765):
         raise Warning('star2delta have mistakes')
+
+    y_deltas = (np.array([10, 0.5, 10, 0]), np.array([10, 10, 0, 0]), np.array([10, 0.2, 0, 0]))
+    print("\nTest for the array functions (expected result = the scalar functions element by element):\n"
+          f"    delta2star_array: {np.transpose(delta2star_array(*y_deltas))}\n"
+          f"    star2delta_array: {np.transpose(star2delta_array(*y_deltas))}")
+
+    for index in range(3):
+        y_delta = [float(y_delta[index]) for y_delta in y_deltas]
+        np.testing.assert_allclose([y[index] for y in delta2star_array(*y_deltas)], delta2star(*y_delta),
+                                   err_msg='delta2star_array have mistakes')
+        np.testing.assert_allclose([y[index] for y in star2delta_array(*y_deltas)], star2delta(*y_delta),
+                                   err_msg='star2delta_array have mistakes')
+        np.testing.assert_allclose(equivalent_y_series_array(*y_deltas[:2])[index], equivalent_y_series(*y_delta[:2]),
+                                   err_msg='equivalent_y_series_array have mistakes')
+        np.testing.assert_allclose(calculate_current_array(*y_deltas)[index], calculate_current(*y_delta),
+                                   err_msg='calculate_current_array have mistakes')
+        np.testing.assert_allclose(calculate_central_v_star_array(*y_deltas, *y_deltas)[index],
+                                   calculate_central_v_star(*y_delta, *y_delta),
+                                   err_msg='calculate_central_v_star_array have mistakes')
@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
-from math import sqrt, pi, cos, sin
+from math import sqrt, pi, cos, sin, degrees
+from cmath import phase
+from weakref import WeakSet
+from symmetrical_components import SEQ2PHASE_MATRIX
+import numpy as np
 
 # ! Review docstrings in all classes
 
@@ -14,9 +18,13 @@ class PuBase:
         z_base (float): The base impedance value.
         i_base (float): The base current value.
         id_bus (int): The id of the bus holding the per-unit base.
-        _electrical_variables (list): A list to store electrical variables that observes the per-unit base.
     """
 
+    __slots__ = ('v_base', 's_base', 'id_bus', 'z_base', 'i_base')
+
+    DEFAULT_V_BASE = 100 * 10 ** 3
+    DEFAULT_S_BASE = 100 * 10 ** 6
+
     def __init__(self, v_base: float, s_base: float, id_bus: int):
         """
         Initializes a new instance of the PuBase class.
@@ -30,7 +38,6 @@ class PuBase:
              - s_base (float): The base power value.
              - z_base (float): The base impedance value.
              - i_base (float): The base current value.
-             - _electrical_variables (list): A list to store electrical variables.
         """
         self.v_base = v_base
         self.s_base = s_base
@@ -41,9 +48,6 @@ class PuBase:
 
         # Calculate the base current value
         self.i_base = v_base / (sqrt(3) * self.z_base)
-
-        # Initialize a list to store electrical variables
-        self._electrical_variables = []
         
     @classmethod
     def default(cls):
@@ -53,78 +57,429 @@ class PuBase:
         Returns:
             cls: An instance of the class with default values for v_base and s_base.
         """
-        v_base = 100*10**3
-        s_base = 100*10**6
-
-        return cls(v_base, s_base, 0)
+        return cls(cls.DEFAULT_V_BASE, cls.DEFAULT_S_BASE, 0)
         
-    def add_electrical_variable(self, electrical_variable):
+    def set_base_values(self, v_base: float, s_base: float):
         """
-        Appends the given electrical variable to the list of stored electrical variables.
-        Args:
-            electrical_variable: The electrical variable to be added.
-        Returns:
-            None
+        Sets the base values without rescaling the observers, for callers that rescale them in bulk.
         """
-        self._electrical_variables.append(electrical_variable)
-        
-    def update_base(self, v_base: complex, s_base: complex):
+        self.v_base = v_base
+        self.s_base = s_base
+        self.z_base = v_base ** 2 / s_base
+        self.i_base = v_base / (sqrt(3) * self.z_base)
+
+    def update_base(self, v_base: float, s_base: float):
         """
         Update the base values of the object.
 
         Args:
-            v_base (complex): The new base voltage value.
-            s_base (complex): The new base power value.
+            v_base (float): The new base voltage value.
+            s_base (float): The new base power value.
 
-        This function updates the base values of the object. It then iterates over all electrical variables stored in
-        the object and calls the "change_base" method on each variable.
+        The immittances follow the base without being visited, since their pu value is derived from the current
+        z_base. The pu values of the voltage and current variables are rescaled by a single factor per kind, one
+        vectorized operation over their slots in each result store that holds values in the base.
         """
-        self.v_base = v_base
-        self.s_base = s_base
-        self.z_base = self.v_base**2 / self.s_base.conjugate()
-        self.i_base = self.v_base / (sqrt(3)*self.z_base)
-        
-        for electrical_variable in self._electrical_variables:
-            electrical_variable.change_base
+        v_base_ratio = self.v_base / v_base
+        old_i_base = self.i_base
+
+        self.set_base_values(v_base, s_base)
+        i_base_ratio = old_i_base / self.i_base
+
+        for result_store in list(VIResultStore.instances):
+            result_store.rescale_base(self, v_base_ratio, i_base_ratio)
 
 
 class PuBaseManager:
+    """
+    Manages the per-unit bases of a study, with one PuBase per bus id.
+
+    The bases are indexed by bus id, so looking a base up is O(1). Elements get their bases from the manager in scope
+    (see create_pu_base), which is entered with a with statement and restores the previous one on exit:
+
+        with network:
+            elements = [TransmissionLine(...), ...]
+
+    so each study has its own bases, no manager stays active outside its scope and the bases can be released all at
+    once. Elements created outside any scope get their bases from the process-wide default manager, and
+    Network.add_elements moves them to the bases of the network.
+
+    Attributes:
+        pu_bases (dict[int, PuBase]): The per-unit base of each bus id.
+        result_store (VIResultStore): The store of the variables created in the scope of the manager, the default
+            store if None.
+    """
+
+    # The managers in scope, the last one is used by the elements being created
+    _scopes = []
+
+    _default = None
 
-    pu_bases: list[PuBase] = []
+    def __init__(self, result_store=None):
+        self.pu_bases: dict[int, PuBase] = {}
+        self.result_store = result_store
+
+    def __enter__(self):
+        PuBaseManager._scopes.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        PuBaseManager._scopes.remove(self)
+
+    @classmethod
+    def default(cls):
+        """
+        Returns the manager used by the elements created outside any scope.
+        """
+        if cls._default is None:
+            cls._default = cls()
+
+        return cls._default
+
+    @classmethod
+    def active(cls):
+        """
+        Returns the manager used by the elements being created, the one of the innermost scope or the default manager.
+        """
+        if not cls._scopes:
+            return cls.default()
+
+        return cls._scopes[-1]
+
+    @classmethod
+    def active_result_store(cls):
+        """
+        Returns the store of the variables being created, the one of the innermost scope or the default store.
+        """
+        if cls._scopes and cls._scopes[-1].result_store is not None:
+            return cls._scopes[-1].result_store
+
+        return VIResultStore.default()
 
     @classmethod
     def create_pu_base(cls, v_base: float, s_base: float, id_bus: int):
+        """
+        Returns the per-unit base of the bus from the manager in scope, creating it if the bus doesn't have one.
+        """
+        return cls.active().get_pu_base(v_base, s_base, id_bus)
 
-        for pu_base in cls.pu_bases:
-            id_bus_base = pu_base.id_bus
-            if id_bus == id_bus_base:
-                return pu_base
+    def get_pu_base(self, v_base: float, s_base: float, id_bus: int):
+        """
+        Returns the per-unit base of the bus, creating it with the given values if the bus doesn't have one.
+        """
+        pu_base = self.pu_bases.get(id_bus)
+        if pu_base is None:
+            pu_base = PuBase(v_base, s_base, id_bus)
+            self.pu_bases[id_bus] = pu_base
 
-        pu_base = PuBase(v_base, s_base, id_bus)
-        cls.pu_bases.append(pu_base)
         return pu_base
 
+    def release(self):
+        """
+        Releases all bases of the study.
+        """
+        self.pu_bases.clear()
+
 
 class ImmittanceConstant:
+    """
+    Represents a branch admittance in pu of the base of its first terminal.
+
+    The admittance is kept in pu of z_baseM, the base impedance it was defined in, and y_pu converts it to the
+    current z_base of base_m. A change of base_m is therefore seen by every immittance of the bus at once, without
+    visiting them.
+    """
+
+    __slots__ = ('_y_pu', 'base_m', 'z_baseM', 'id_bus_m', 'id_bus_n')
 
     def __init__(self, y_pu: complex, base_m: PuBase, id_bus_m: int, id_bus_n: int):
-        self.y_pu = y_pu
+        self._y_pu = y_pu
 
+        self.base_m = base_m
         self.z_baseM = base_m.z_base
-        base_m.add_electrical_variable(self)
 
         self.id_bus_m = id_bus_m
         self.id_bus_n = id_bus_n
 
     @classmethod
     def defined_by_impedance(cls, z_pu: complex, base_m: PuBase, id_bus_m: int, id_bus_n: int):
-        y_pu = z_pu**(-1)
+        # A zero impedance is an ideal branch, its buses are merged when the bus matrices are built
+        y_pu = z_pu**(-1) if z_pu != 0 else float('inf')
 
         return cls(y_pu, base_m, id_bus_m, id_bus_n)
 
+    @property
+    def y_pu(self) -> complex:
+        if self.base_m.z_base == self.z_baseM:
+            return self._y_pu
+
+        return self._y_pu * self.base_m.z_base / self.z_baseM
+
+    @y_pu.setter
+    def y_pu(self, y_pu: complex):
+        self._y_pu = y_pu
+        self.z_baseM = self.base_m.z_base
+
     def change_base(self, pu_base: PuBase):
-        self.y_pu = (self.y_pu * pu_base.z_base) / self.z_baseM
+        self._y_pu = (self._y_pu * pu_base.z_base) / self.z_baseM
         self.z_baseM = pu_base.z_base
+        self.base_m = pu_base
+
+    @staticmethod
+    def admittances_pu(immittances: list) -> np.ndarray:
+        """
+        Returns the y_pu of many immittances as a complex vector, moved to the current z_base of their bases in one
+        vectorized operation instead of one y_pu call each.
+        """
+        values = np.array([(immittance._y_pu, immittance.z_baseM, immittance.base_m.z_base)
+                           for immittance in immittances], dtype=complex).reshape(-1, 3)
+        y_pu = values[:, 0].copy()
+
+        # Only the immittances whose base changed are scaled, as y_pu does, and their parts on their own, so an ideal
+        # branch (inf + 0j) doesn't get a NaN part
+        rebased = values[:, 2].real != values[:, 1].real
+        z_bases, z_bases_m = values[rebased, 2].real, values[rebased, 1].real
+        y_pu.real[rebased] = y_pu.real[rebased] * z_bases / z_bases_m
+        y_pu.imag[rebased] = y_pu.imag[rebased] * z_bases / z_bases_m
+
+        return y_pu
+
+
+class VIResultStore:
+    """
+    Holds the values of many VIVariables in one contiguous complex128 array.
+
+    Each variable owns a slot (a row of the array). The column PRE_FAULT holds the pre-fault value and the columns
+    POS_FAULT_SEQ0, POS_FAULT_SEQ1 and POS_FAULT_SEQ2 the post-fault sequence values, all in pu. Whether a value is
+    defined is kept apart from it, so a computed NaN stays a value. Bulk reads and writes of many variables are single
+    NumPy operations on values[slots, columns] (see write).
+
+    The arrays grow by half when they are full and trim drops the capacity left unused, so they hold about the slots
+    actually used.
+
+    Attributes:
+        values (np.ndarray): The values of all slots, shape (capacity, 4).
+        defined (np.ndarray): Whether each value is defined, shape (capacity, 4).
+        base_positions (np.ndarray): The position in pu_bases of the per-unit base of each slot.
+        kinds (np.ndarray): Whether each slot holds a VOLTAGE or a CURRENT.
+        pu_bases (list[PuBase]): The per-unit bases of the slots, None at the positions no slot uses anymore.
+        _pu_base_positions (dict): The position in pu_bases of each base, by id.
+        _base_counts (list): The number of slots in use of each position of pu_bases. A base is dropped when its last
+            slot is released or moved to another base, and its position is reused.
+        _free_base_positions (list): The positions of pu_bases dropped, reused before growing the list.
+        _free_slots (list): Slots released by variables that no longer exist, reused before growing the array.
+        _number_slots (int): The number of slots ever allocated.
+    """
+
+    # The stores alive, weakly referenced, so a base change reaches the values in its pu without each base keeping a
+    # registry of its own
+    instances = WeakSet()
+
+    PRE_FAULT = 0
+    POS_FAULT_SEQ0 = 1
+    POS_FAULT_SEQ1 = 2
+    POS_FAULT_SEQ2 = 3
+
+    VOLTAGE = 0
+    CURRENT = 1
+
+    _default = None
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initializes an empty store.
+
+        Args:
+            capacity (int): The number of slots allocated up front, the arrays grow by half when they are full.
+        """
+        self.values = np.zeros((capacity, 4), dtype=complex)
+        self.defined = np.zeros((capacity, 4), dtype=bool)
+        self.base_positions = np.zeros(capacity, dtype=np.int32)
+        self.kinds = np.zeros(capacity, dtype=np.int8)
+
+        self.pu_bases = []
+        self._pu_base_positions = {}
+        self._base_counts = []
+        self._free_base_positions = []
+
+        self._free_slots = []
+        self._number_slots = 0
+
+        VIResultStore.instances.add(self)
+
+    @classmethod
+    def default(cls):
+        """
+        Returns the store used by variables created outside a network.
+        """
+        if cls._default is None:
+            cls._default = cls()
+
+        return cls._default
+
+    def _base_position(self, pu_base: PuBase) -> int:
+        # The position of the base, counting one more slot in it
+        position = self._pu_base_positions.get(id(pu_base))
+        if position is None:
+            if self._free_base_positions:
+                position = self._free_base_positions.pop()
+                self.pu_bases[position] = pu_base
+            else:
+                position = len(self.pu_bases)
+                self.pu_bases.append(pu_base)
+                self._base_counts.append(0)
+            self._pu_base_positions[id(pu_base)] = position
+
+        self._base_counts[position] += 1
+
+        return position
+
+    def _release_base_position(self, position: int):
+        # Counts one slot less in the position, dropping the base when no slot uses it anymore
+        self._base_counts[position] -= 1
+        if self._base_counts[position] == 0:
+            del self._pu_base_positions[id(self.pu_bases[position])]
+            self.pu_bases[position] = None
+            self._free_base_positions.append(position)
+
+    def allocate(self, pu_base: PuBase, kind: int = VOLTAGE) -> int:
+        """
+        Returns a free slot with no defined value, growing the arrays when needed.
+
+        Args:
+            pu_base (PuBase): The per-unit base of the values.
+            kind (int): VOLTAGE or CURRENT, which base of the bus the values are relative to.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._number_slots == len(self.values):
+                self._resize(max(16, len(self.values) + len(self.values) // 2))
+
+            slot = self._number_slots
+            self._number_slots += 1
+
+        self.base_positions[slot] = self._base_position(pu_base)
+        self.kinds[slot] = kind
+
+        return slot
+
+    def _resize(self, capacity: int):
+        number_slots = self._number_slots
+
+        for name in ('values', 'defined', 'base_positions', 'kinds'):
+            array = getattr(self, name)
+            resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            resized[:number_slots] = array[:number_slots]
+            setattr(self, name, resized)
+
+    def trim(self):
+        """
+        Drops the capacity beyond the last slot in use, e.g. once the elements of a network are created.
+        """
+        if len(self.values) > self._number_slots:
+            self._resize(self._number_slots)
+
+    def release(self, slot: int):
+        """
+        Clears the slot and makes it available to new variables.
+        """
+        self.values[slot] = 0
+        self.defined[slot] = False
+        self._release_base_position(self.base_positions[slot])
+        self._free_slots.append(slot)
+
+    def adopt(self, electrical_variable):
+        """
+        Moves the values of a variable from its current store into this one.
+        """
+        if electrical_variable.result_store is self:
+            return
+
+        old_store, old_slot = electrical_variable.result_store, electrical_variable.slot
+
+        slot = self.allocate(old_store.pu_base(old_slot), old_store.kinds[old_slot])
+        self.values[slot] = old_store.values[old_slot]
+        self.defined[slot] = old_store.defined[old_slot]
+        old_store.release(old_slot)
+
+        electrical_variable.result_store = self
+        electrical_variable.slot = slot
+
+    def pu_base(self, slot: int) -> PuBase:
+        """
+        Returns the per-unit base of the values of a slot.
+        """
+        return self.pu_bases[self.base_positions[slot]]
+
+    def set_pu_base(self, slot: int, pu_base: PuBase):
+        """
+        Changes the per-unit base a slot is relative to, without changing its values.
+        """
+        old_position = self.base_positions[slot]
+        self.base_positions[slot] = self._base_position(pu_base)
+        self._release_base_position(old_position)
+
+    def rescale_bases(self, pu_bases: list, v_base_ratios: np.ndarray, i_base_ratios: np.ndarray):
+        """
+        Multiplies the values of the slots of the given bases by the ratio old base / new base of their kind, in one
+        operation over the slots. The bases the store doesn't hold are skipped.
+
+        Args:
+            pu_bases (list[PuBase]): The bases that changed.
+            v_base_ratios (np.ndarray): The ratio old v_base / new v_base of each base.
+            i_base_ratios (np.ndarray): The ratio old i_base / new i_base of each base.
+        """
+        positions = np.array([self._pu_base_positions.get(id(pu_base), -1) for pu_base in pu_bases], dtype=np.int64)
+        held = positions >= 0
+        if not held.any():
+            return
+
+        position_v_ratios = np.ones(len(self.pu_bases))
+        position_i_ratios = np.ones(len(self.pu_bases))
+        position_v_ratios[positions[held]] = np.asarray(v_base_ratios, dtype=float)[held]
+        position_i_ratios[positions[held]] = np.asarray(i_base_ratios, dtype=float)[held]
+
+        base_positions = self.base_positions[:self._number_slots]
+        is_current = self.kinds[:self._number_slots] == self.CURRENT
+
+        ratios = np.where(is_current, position_i_ratios[base_positions], position_v_ratios[base_positions])
+        self.values[:self._number_slots] *= ratios[:, np.newaxis]
+
+    def rescale_base(self, pu_base: PuBase, v_base_ratio: float, i_base_ratio: float):
+        """
+        Multiplies the values of the slots of one base by the ratio old base / new base of their kind.
+        """
+        self.rescale_bases([pu_base], np.array([v_base_ratio]), np.array([i_base_ratio]))
+
+    def get(self, slot: int, column: int):
+        """
+        Returns a single value, or None if it isn't defined.
+        """
+        if not self.defined[slot, column]:
+            return None
+
+        return complex(self.values[slot, column])
+
+    def set(self, slot: int, column: int, value):
+        """
+        Defines a single value, None undefines it.
+        """
+        self.values[slot, column] = 0 if value is None else value
+        self.defined[slot, column] = value is not None
+
+    def write(self, slots, columns, values, defined=True):
+        """
+        Defines the values of many slots in one operation, values[slots, columns] = values.
+
+        Args:
+            slots: The slots, in any form NumPy indexing accepts.
+            columns: The columns, in any form NumPy indexing accepts.
+            values: The values, broadcast to the indexed shape.
+            defined: Whether the written values are defined, broadcast the same way.
+        """
+        self.values[slots, columns] = values
+        self.defined[slots, columns] = defined
 
 
 class VIVariable(ABC):
@@ -132,30 +487,87 @@ class VIVariable(ABC):
     Abstract base class for electrical variables.
 
     This class represents a base class for electrical variables, such as voltage and current.
+
+    A variable is a thin view of its slot in a result store: its values and its per-unit base are held by the store,
+    so the variable only holds the store and the slot.
     """
-    
-    def __init__(self, pu_base: PuBase):
+
+    __slots__ = ('result_store', 'slot')
+
+    def __init__(self, pu_base: PuBase, result_store: VIResultStore = None):
         """
         Initializes the object with the given PuBase object.
 
         Args:
             pu_base (PuBase): The PuBase object used to set the voltage and power bases.
+            result_store (VIResultStore): The store holding the values, the store of the per-unit base manager in scope
+                (see PuBaseManager.active_result_store) if None.
         """
-        self.v_base = pu_base.v_base
-        self.s_base = pu_base.s_base
-        pu_base.add_electrical_variable(self)
-        
-        self.value_base = None
-        
-        self.value_pre_fault_pu = None
-        self.value_seq0_pos_fault_pu = None
-        self.value_seq1_pos_fault_pu = None
-        self.value_seq2_pos_fault_pu = None
-        
-        self.request_seq_values = None
-        self.request_value_pu = None
-        self.request_value = None
-        
+        self.result_store = result_store if result_store is not None else PuBaseManager.active_result_store()
+        self.slot = self.result_store.allocate(pu_base, self.kind)
+
+    @property
+    def pu_base(self) -> PuBase:
+        return self.result_store.pu_base(self.slot)
+
+    @property
+    def v_base(self):
+        return self.pu_base.v_base
+
+    @property
+    def s_base(self):
+        return self.pu_base.s_base
+
+    @property
+    @abstractmethod
+    def value_base(self):
+        """
+        The base of the values of the variable, read from its PuBase so it follows base changes.
+        """
+        pass
+
+    def _set_pu_base(self, pu_base: PuBase):
+        self.result_store.set_pu_base(self.slot, pu_base)
+
+    def __del__(self):
+        try:
+            self.result_store.release(self.slot)
+        except (AttributeError, TypeError):
+            # Partially initialized object or interpreter shutdown
+            pass
+
+    @property
+    def value_pre_fault_pu(self):
+        return self.result_store.get(self.slot, VIResultStore.PRE_FAULT)
+
+    @value_pre_fault_pu.setter
+    def value_pre_fault_pu(self, value):
+        self.result_store.set(self.slot, VIResultStore.PRE_FAULT, value)
+
+    @property
+    def value_seq0_pos_fault_pu(self):
+        return self.result_store.get(self.slot, VIResultStore.POS_FAULT_SEQ0)
+
+    @value_seq0_pos_fault_pu.setter
+    def value_seq0_pos_fault_pu(self, value):
+        self.result_store.set(self.slot, VIResultStore.POS_FAULT_SEQ0, value)
+
+    @property
+    def value_seq1_pos_fault_pu(self):
+        return self.result_store.get(self.slot, VIResultStore.POS_FAULT_SEQ1)
+
+    @value_seq1_pos_fault_pu.setter
+    def value_seq1_pos_fault_pu(self, value):
+        self.result_store.set(self.slot, VIResultStore.POS_FAULT_SEQ1, value)
+
+    @property
+    def value_seq2_pos_fault_pu(self):
+        return self.result_store.get(self.slot, VIResultStore.POS_FAULT_SEQ2)
+
+    @value_seq2_pos_fault_pu.setter
+    def value_seq2_pos_fault_pu(self, value):
+        self.result_store.set(self.slot, VIResultStore.POS_FAULT_SEQ2, value)
+
     @abstractmethod
     def change_base(self, pu_base: PuBase):
         """
@@ -230,187 +642,265 @@ class VIVariable(ABC):
         self.value_seq1_pos_fault_pu = value_seq1 
         self.value_seq2_pos_fault_pu = value_seq2 
     
-    def request_value(self, time, phase_seq, pu_si, notation):
+    def value(self, time: str, component: str, unit: str, notation: str):
         """
-        Request the value of the object.
+        Returns a value of the variable without changing its state, so it can be called concurrently.
 
         Args:
-            time (str): The time of the request.
-            phase_seq (str): The phase sequence of the request.
-            pu_si (str): The unit of the requested value.
-            notation (str): The notation of the requested value.
+            time (str): 'pre' for the pre-fault value or 'pos' for the post-fault value.
+            component (str): The phase ('a', 'b' or 'c') or the sequence ('seq0', 'seq1' or 'seq2').
+            unit (str): 'pu' or 'si'.
+            notation (str): 'rec' for the complex value, 'mag' for the magnitude or 'ang' for the angle in degrees.
 
         Returns:
-            The requested value.
+            The requested value, or None if it isn't defined.
         """
-        if time == 'pre':
-            self.pre()
-        elif time == 'pos':
-            self.pos()
-        else:
-            pass
-            
-        if phase_seq == 'a':
-            self.a()
-        elif phase_seq == 'b':
-            self.b()
-        elif phase_seq == 'c':
-            self.c()
-        elif phase_seq == 'seq0':
-            self.seq0()
-        elif phase_seq == 'seq1':
-            self.seq1()
-        elif phase_seq == 'seq2':
-            self.seq2()
-        else:
-            pass
-            
-        if pu_si == 'pu':
-            self.pu()
-        elif pu_si == 'si':
-            self.si()
-        else:
-            pass
-        
-        if notation == 'rec':
-            value = self.rec()
-        elif notation == 'mag':
-            value = self.mag()
-        elif notation == 'ang':
-            value = self.ang()
-        else:
-            pass
-        
-        return value
+        values, defined = _query_values([self], time, component, unit, notation)
+        if not defined[0]:
+            return None
+
+        return values[0].item()
+
+    def request_value(self, time, phase_seq, pu_si, notation):
+        """
+        Request the value of the object, see value.
+        """
+        return self.value(time, phase_seq, pu_si, notation)
 
     # * Request functions
     def pre(self):
         """
         Request the value before fault.
         """
-        self.request_seq_values = (0, self.value_pre_fault_pu, 0)
-
-        return self
+        return VIValueRequest(self, (0, self.value_pre_fault_pu, 0))
     
     def pos(self):
         """
         Request the values after fault.
         """
-        self.request_seq_values = (self.value_seq0_pos_fault_pu, self.value_seq1_pos_fault_pu,
-                                   self.value_seq2_pos_fault_pu)
+        return VIValueRequest(self, (self.value_seq0_pos_fault_pu, self.value_seq1_pos_fault_pu,
+                                     self.value_seq2_pos_fault_pu))
+        
+        
+class VoltageVariable(VIVariable):
 
-        return self
+    __slots__ = ()
+
+    kind = VIResultStore.VOLTAGE
+    
+    def __init__(self, pu_base: PuBase, result_store: VIResultStore = None):
+        super().__init__(pu_base, result_store)
+
+    @property
+    def value_base(self):
+        return self.pu_base.v_base
+        
+    def change_base(self, pubase: PuBase):
+        self.update_base_values(self.value_base, pubase.v_base)
+        self._set_pu_base(pubase)
+        
+
+class CurrentVariable(VIVariable):
+
+    __slots__ = ()
+
+    kind = VIResultStore.CURRENT
+    
+    def __init__(self, pu_base: PuBase, result_store: VIResultStore = None):
+        super().__init__(pu_base, result_store)
+
+    @property
+    def value_base(self):
+        return self.pu_base.i_base
+        
+    def change_base(self, pubase: PuBase):
+        self.update_base_values(self.value_base, pubase.i_base)
+        self._set_pu_base(pubase)
+
+
+class VIValueRequest:
+    """
+    A step of a fluent value request such as variable.pos().seq1().pu().rec().
+
+    Each step returns a new request instead of changing the variable, so requests of different threads never share
+    state.
+
+    Attributes:
+        variable (VIVariable): The requested variable.
+        seq_values (tuple): The seq0, seq1 and seq2 values in pu of the requested time.
+        value_pu (complex): The value of the requested phase or sequence in pu.
+        value (complex): The value in the requested unit.
+    """
+
+    __slots__ = ('variable', 'seq_values', 'value_pu', 'value')
+
+    def __init__(self, variable: VIVariable, seq_values: tuple, value_pu: complex = None, value: complex = None):
+        self.variable = variable
+        self.seq_values = seq_values
+        self.value_pu = value_pu
+        self.value = value
+
+    def _component(self, component: str):
+        coefficients = _COMPONENT_COEFFICIENTS[component]
+        value_pu = sum(coefficient * seq_value for coefficient, seq_value in zip(coefficients, self.seq_values)
+                       if coefficient != 0)
+
+        return VIValueRequest(self.variable, self.seq_values, value_pu)
 
     def a(self):
         """
         Request the value in phase A.
         """
-        self.request_value_pu = (self.request_seq_values[0] + self.request_seq_values[1] * cpolar(1, 0) +
-                                 self.request_seq_values[2] * cpolar(1, 0))
-
-        return self
+        return self._component('a')
 
     def b(self):
         """
         Request the value in phase B.
         """
-        self.request_value_pu = (self.request_seq_values[0] + self.request_seq_values[1] * cpolar(1, -120) +
-                                 self.request_seq_values[2] * cpolar(1, 120))
+        return self._component('b')
 
-        return self
-    
     def c(self):
         """
         Request the value in phase C.
         """
-        self.request_value_pu = (self.request_seq_values[0] + self.request_seq_values[1] * cpolar(1, 120) +
-                                 self.request_seq_values[2] * cpolar(1, -120))
+        return self._component('c')
 
-        return self
-    
     def seq0(self):
         """
-        Request the value in phase A and B.
+        Request the value in sequence 0.
         """
-        self.request_value_pu = self.request_seq_values[0]
+        return self._component('seq0')
 
-        return self
-    
     def seq1(self):
         """
-        Request the value in phase B and C.
+        Request the value in sequence 1.
         """
-        self.request_value_pu = self.request_seq_values[1]
+        return self._component('seq1')
 
-        return self
-    
     def seq2(self):
         """
-        Request the value in phase A and C.
+        Request the value in sequence 2.
         """
-        self.request_value_pu = self.request_seq_values[2]
+        return self._component('seq2')
 
-        return self
-    
     def pu(self):
         """
         Request the value in pu.
         """
-        self.request_value = self.request_value_pu
+        return VIValueRequest(self.variable, self.seq_values, self.value_pu, self.value_pu)
 
-        return self
-    
     def si(self):
         """
         Request the value in SI units.
         """
-        self.request_value = self.request_value_pu * self.value_base
+        return VIValueRequest(self.variable, self.seq_values, self.value_pu,
+                              self.value_pu * self.variable.value_base)
 
-        return self
-    
     def rec(self):
         """
-        Request the real part of the value.
+        Request the value in rectangular notation.
         """
-        return self.request_value
-    
+        return self.value
+
     def mag(self):
         """
         Request the magnitude of the value.
         """
-        return abs(self.request_value)
-    
+        return abs(self.value)
+
     def ang(self):
         """
-        Request the angle of the value.
+        Request the angle of the value in degrees.
         """
-        if self.request_value == 0:
+        if self.value == 0:
             return 0
         else:
-            return self.request_value.angle()   
-        
-        
-class VoltageVariable(VIVariable):
-    
-    def __init__(self, pu_base: PuBase):
-        super().__init__(pu_base)
-        
-    def change_base(self, pubase: PuBase):
-        self.update_base_values(self.value_base, pubase.v_base)
-        self.value_base = pubase.v_base
-        
-
-class CurrentVariable(VIVariable):
-    
-    def __init__(self, pu_base: PuBase):
-        super().__init__(pu_base)
-        
-    def change_base(self, pubase: PuBase):
-        self.update_base_values(self.value_base, pubase.i_base)
-        self.value_base = pubase.i_base
+            return degrees(phase(self.value))
 
 
 # * Auxiliary functions
 def cpolar(r, theta):
     theta = theta * pi / 180
     return r * complex(cos(theta), sin(theta))
+
+
+# Coefficients of the seq0, seq1 and seq2 values in each phase and sequence
+# (the phases are the rows of the cached Fortescue matrix)
+_COMPONENT_COEFFICIENTS = {'a': tuple(complex(c) for c in SEQ2PHASE_MATRIX[0]),
+                           'b': tuple(complex(c) for c in SEQ2PHASE_MATRIX[1]),
+                           'c': tuple(complex(c) for c in SEQ2PHASE_MATRIX[2]),
+                           'seq0': (1, 0, 0),
+                           'seq1': (0, 1, 0),
+                           'seq2': (0, 0, 1)}
+
+
+def query_values(variables: list, time: str, component: str, unit: str, notation: str) -> np.ndarray:
+    """
+    Returns a value of many variables at once, without changing their state.
+
+    The values of the variables are gathered from their result stores with one indexing operation per store and the
+    phase/sequence, unit and notation conversions are applied to the whole array.
+
+    Args:
+        variables (list): The variables to read.
+        time (str): 'pre' for the pre-fault values or 'pos' for the post-fault values.
+        component (str): The phase ('a', 'b' or 'c') or the sequence ('seq0', 'seq1' or 'seq2').
+        unit (str): 'pu' or 'si'.
+        notation (str): 'rec' for complex values, 'mag' for magnitudes or 'ang' for angles in degrees.
+
+    Returns:
+        np.ndarray: One value per variable, NaN where the value isn't defined.
+    """
+    values, defined = _query_values(variables, time, component, unit, notation)
+
+    return np.where(defined, values, np.nan)
+
+
+def _query_values(variables: list, time: str, component: str, unit: str, notation: str) -> tuple:
+    # The values of query_values and whether each one is defined, i.e. every value it is calculated from is defined
+    variables = list(variables)
+    rows = np.empty((len(variables), 4), dtype=complex)
+    defined_rows = np.empty((len(variables), 4), dtype=bool)
+
+    positions_by_store = {}
+    for position, variable in enumerate(variables):
+        positions_by_store.setdefault(id(variable.result_store), (variable.result_store, []))[1].append(position)
+
+    for result_store, positions in positions_by_store.values():
+        slots = [variables[position].slot for position in positions]
+        rows[positions] = result_store.values[slots]
+        defined_rows[positions] = result_store.defined[slots]
+
+    if time == 'pre':
+        seq_values = np.zeros((len(variables), 3), dtype=complex)
+        seq_values[:, 1] = rows[:, VIResultStore.PRE_FAULT]
+        seq_defined = np.ones((len(variables), 3), dtype=bool)
+        seq_defined[:, 1] = defined_rows[:, VIResultStore.PRE_FAULT]
+    elif time == 'pos':
+        seq_values = rows[:, VIResultStore.POS_FAULT_SEQ0:]
+        seq_defined = defined_rows[:, VIResultStore.POS_FAULT_SEQ0:]
+    else:
+        raise ValueError(f"Unknown time '{time}', expected 'pre' or 'pos'")
+
+    try:
+        coefficients = np.array(_COMPONENT_COEFFICIENTS[component])
+    except KeyError:
+        raise ValueError(f"Unknown component '{component}', expected one of {tuple(_COMPONENT_COEFFICIENTS)}")
+
+    values = seq_values @ coefficients
+    defined = seq_defined[:, coefficients != 0].all(axis=1)
+
+    if unit == 'si':
+        value_bases = np.array([variable.value_base for variable in variables], dtype=float)
+        values = values * value_bases
+    elif unit != 'pu':
+        raise ValueError(f"Unknown unit '{unit}', expected 'pu' or 'si'")
+
+    if notation == 'rec':
+        return values, defined
+    elif notation == 'mag':
+        return np.abs(values), defined
+    elif notation == 'ang':
+        return np.degrees(np.angle(values)), defined
+    else:
+        raise ValueError(f"Unknown notation '{notation}', expected 'rec', 'mag' or 'ang'")
@@ -0,0 +1,111 @@
+from base_elements import CompositeElement
+from passive_elements.transformer_elements import Transformer2Windings, Transformer3Windings
+from active_elements.vsource_elements import MultiPortEquivalent
+from scipy import sparse
+from scipy.sparse.csgraph import breadth_first_order
+import numpy as np
+
+
+def _terminal_voltages_kv(element) -> tuple:
+    # Nominal voltages of the terminals m, n and p, None where the element doesn't change the voltage level
+    reference_element = element.elements[0] if isinstance(element, CompositeElement) else element
+
+    if isinstance(reference_element, Transformer3Windings):
+        return reference_element.v_nom_pri_kv, reference_element.v_nom_sec_kv, reference_element.v_nom_ter_kv
+    elif isinstance(reference_element, Transformer2Windings):
+        return reference_element.v_nom_pri_kv, reference_element.v_nom_sec_kv, None
+    else:
+        return None, None, None
+
+
+def base_propagation_edges(elements: list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the connections between buses through which voltage bases propagate.
+
+    Every pair of non-ground terminals of an element is an edge. Across transformer windings the ratio of the voltage
+    bases is the ratio of their nominal voltages, across the ports of a MultiPortEquivalent it is the ratio of the bases
+    of the reduction, and across any other element it is 1.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The bus ids of both ends of each edge and the ratios
+            v_base(to) / v_base(from).
+    """
+    id_buses_from, id_buses_to, v_ratios = [], [], []
+    for element in elements:
+        if isinstance(element, MultiPortEquivalent):
+            # The first port is joined to every other one, that is enough to connect all of them
+            id_buses_from.extend([element.id_buses[0]] * (len(element.id_buses) - 1))
+            id_buses_to.extend(element.id_buses[1:])
+            v_ratios.extend(element.v_bases_kv[1:] / element.v_bases_kv[0])
+            continue
+
+        id_buses = (element.id_bus_m, element.id_bus_n, element.id_bus_p)
+        v_nom_kv = _terminal_voltages_kv(element)
+
+        for index_from, index_to in ((0, 1), (1, 2), (0, 2)):
+            id_bus_from, id_bus_to = id_buses[index_from], id_buses[index_to]
+            if id_bus_from == 0 or id_bus_to == 0 or id_bus_from == id_bus_to:
+                continue
+
+            v_nom_from_kv, v_nom_to_kv = v_nom_kv[index_from], v_nom_kv[index_to]
+            if v_nom_from_kv is None or v_nom_to_kv is None:
+                v_ratio = 1
+            else:
+                v_ratio = v_nom_to_kv / v_nom_from_kv
+
+            id_buses_from.append(id_bus_from)
+            id_buses_to.append(id_bus_to)
+            v_ratios.append(v_ratio)
+
+    return (np.array(id_buses_from, dtype=np.int64), np.array(id_buses_to, dtype=np.int64),
+            np.array(v_ratios, dtype=float))
+
+
+def propagate_voltage_bases(v_bases: np.ndarray, id_buses_from: np.ndarray, id_buses_to: np.ndarray,
+                            v_ratios: np.ndarray, id_bus_reference: int, v_base_reference: float) -> np.ndarray:
+    """
+    Propagates the voltage base of the reference bus to every bus connected to it.
+
+    A breadth-first traversal from the reference visits each bus and edge once and gives the tree of predecessors.
+    The product of the ratios from each bus up to the reference is then accumulated with pointer jumping, in
+    O(log(depth)) vectorized steps.
+
+    Args:
+        v_bases (np.ndarray): The current voltage bases indexed by bus id, kept for buses not connected to the reference.
+        id_buses_from (np.ndarray): The first bus of each edge.
+        id_buses_to (np.ndarray): The second bus of each edge.
+        v_ratios (np.ndarray): The ratio v_base(to) / v_base(from) of each edge.
+        id_bus_reference (int): The bus with the known voltage base.
+        v_base_reference (float): The voltage base of the reference bus.
+
+    Returns:
+        np.ndarray: The voltage bases indexed by bus id.
+    """
+    number_nodes = len(v_bases)
+
+    graph = sparse.csr_matrix((np.ones(len(id_buses_from)), (id_buses_from, id_buses_to)),
+                              shape=(number_nodes, number_nodes))
+    order, predecessors = breadth_first_order(graph, id_bus_reference, directed=False, return_predecessors=True)
+
+    # Ratio of each visited bus relative to its predecessor, looked up in the sorted edge keys of both directions
+    edge_keys = np.concatenate((id_buses_from * number_nodes + id_buses_to, id_buses_to * number_nodes + id_buses_from))
+    edge_ratios = np.concatenate((v_ratios, 1 / v_ratios))
+    sorting = np.argsort(edge_keys, kind='stable')
+    edge_keys, edge_ratios = edge_keys[sorting], edge_ratios[sorting]
+
+    children = order[1:]
+    ratio_to_ancestor = np.ones(number_nodes)
+    ratio_to_ancestor[children] = edge_ratios[np.searchsorted(edge_keys,
+                                                              predecessors[children] * number_nodes + children)]
+
+    ancestors = np.arange(number_nodes)
+    ancestors[children] = predecessors[children]
+
+    while (ancestors != ancestors[ancestors]).any():
+        ratio_to_ancestor = ratio_to_ancestor * ratio_to_ancestor[ancestors]
+        ancestors = ancestors[ancestors]
+
+    v_bases = np.array(v_bases, dtype=float)
+    v_bases[order] = v_base_reference * ratio_to_ancestor[order]
+
+    return v_bases
@@ -0,0 +1,482 @@
+from active_elements.base_elements import ActiveElement1Terminal
+from base_elements import BRANCH_TERMINALS
+from network_elements.matrix_assembly import SEQUENCES, branches_admittances, branches_incidences
+from network_elements.short_circuit import calculate_fault_currents, calculate_fault_voltages
+from electrical_values import VIResultStore
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
+import numpy as np
+
+
+def element_terminals(element) -> tuple:
+    """
+    Returns the bus ids of the terminals m, n and p of an element, None for elements without them (e.g. a
+    MultiPortEquivalent).
+    """
+    if not hasattr(element, 'id_bus_m'):
+        return None
+
+    return element.id_bus_m, element.id_bus_n, element.id_bus_p
+
+
+def element_sources(element) -> list:
+    """
+    Returns the sources of an element, the elements of active composites included.
+    """
+    if isinstance(element, ActiveElement1Terminal):
+        return [element]
+
+    return [source for sub_element in getattr(element, 'elements', []) for source in element_sources(sub_element)]
+
+
+class IdealBranchCurrents:
+    """
+    Calculates the currents of the ideal branches (infinite admittance, e.g. bus couplers) from Kirchhoff's current law
+    at their buses.
+
+    The voltages of the buses of an ideal branch are equal, so they don't give its current, but the currents of the
+    other branches do: at each bus the ideal branches carry the current injected at the bus minus the current leaving
+    through the other branches. With the incidence A of the ideal branches (+1 at the bus m, -1 at the bus n) the
+    currents f solve At * f = r, r being those balances. Where the ideal branches make loops (e.g. two couplers in
+    parallel) the balance has many solutions and the one of minimum norm, f = A * p with At * A * p = r, is taken, so
+    the current is shared as by equal resistances.
+
+    Each group of buses joined by ideal branches has a reference bus where p = 0: the ground if the group is merged
+    with it, its first bus otherwise. A balance the group doesn't close (e.g. a fault current injected at one of its
+    buses when the injections aren't given) returns through the reference bus.
+    """
+
+    def __init__(self, id_buses_m: np.ndarray, id_buses_n: np.ndarray):
+        """
+        Args:
+            id_buses_m (np.ndarray): The bus ids of the first terminal of each ideal branch.
+            id_buses_n (np.ndarray): The bus ids of the second terminal of each ideal branch.
+        """
+        self.id_buses = np.unique(np.concatenate((id_buses_m, id_buses_n)))
+        nodes_m = np.searchsorted(self.id_buses, id_buses_m)
+        nodes_n = np.searchsorted(self.id_buses, id_buses_n)
+        number_nodes, number_branches = len(self.id_buses), len(id_buses_m)
+
+        adjacency = sparse.csr_matrix((np.ones(number_branches), (nodes_m, nodes_n)),
+                                      shape=(number_nodes, number_nodes))
+        _, labels = connected_components(adjacency, directed=False)
+        # The buses are sorted, so the first bus of each group is the ground when the group holds it
+        _, references = np.unique(labels, return_index=True)
+        self._free_nodes = np.setdiff1d(np.arange(number_nodes), references)
+
+        branches = np.arange(number_branches)
+        incidence = sparse.csr_matrix((np.concatenate((np.ones(number_branches), -np.ones(number_branches))),
+                                       (np.concatenate((branches, branches)), np.concatenate((nodes_m, nodes_n)))),
+                                      shape=(number_branches, number_nodes))
+        self._incidence = incidence[:, self._free_nodes].tocsr()
+
+        self._lu = None
+        if len(self._free_nodes):
+            self._lu = splu(sparse.csc_matrix(self._incidence.T @ self._incidence, dtype=complex))
+
+    def currents(self, bus_balances: np.ndarray) -> np.ndarray:
+        """
+        Returns the current of each ideal branch, from its bus m to its bus n.
+
+        Args:
+            bus_balances (np.ndarray): The current each bus must send through its ideal branches, indexed by bus id,
+                shape (number_buses + 1,) or (number_buses + 1, cases).
+        """
+        bus_balances = np.asarray(bus_balances, dtype=complex)
+        if self._lu is None:
+            return np.zeros((self._incidence.shape[0],) + bus_balances.shape[1:], dtype=complex)
+
+        potentials = self._lu.solve(bus_balances[self.id_buses[self._free_nodes]])
+
+        return self._incidence @ potentials
+
+
+class ElementCurrentsMap:
+    """
+    Maps the bus voltages of a sequence network to the currents of a list of elements with sparse products, built once
+    per topology.
+
+    The currents of the branches are i = y * (A @ v) - s, where A is the branch-bus incidence (+1 at the terminal m of
+    each branch and -1 at the terminal n) and s the currents y * E impressed by the internal voltages of the sources
+    (seq1 only). The currents of the elements are then gathered from the branch currents by two more sparse matrices:
+
+        - i_mn, i_np and i_mp are the currents of the branches in the positions 0, 1 and 2 of the element, from the
+          first to the second terminal of the pair (the seq1 branch mp is stored from p to m, so it is reversed);
+        - i_bus_m, i_bus_n and i_bus_p are the sums of the currents of the branches of the element leaving each terminal
+          (Ybus_mnp @ v_mnp), the first terminal at the ground (if any) carrying the return current of the others.
+
+    The rows of ElementTables follow the elements, with their maps built from the table columns in vectorized steps.
+
+    The voltages may be a vector indexed by bus id or a matrix with one case per column, so the currents of many fault
+    cases come from the same products. The currents of ideal branches don't follow from the voltages, they are
+    calculated from the currents of the other branches at their buses (see IdealBranchCurrents). The currents of
+    elements without terminals m, n and p are NaN.
+
+    Attributes:
+        elements (list): The elements, in the order of the rows of the results.
+        tables (list): The ElementTables, their rows following the elements in the results.
+        number_rows (int): The number of elements and table rows.
+        seq (str): The sequence network.
+        y_pu (np.ndarray): The admittance of each branch.
+        branch_incidence (sparse.csr_matrix): The branch-bus incidence A, shape (branches, number_buses + 1).
+        position_incidence (sparse.csr_matrix): Selects and orients the branches i_mn, i_np and i_mp of each element,
+            shape (3 * elements, branches).
+        terminal_incidence (sparse.csr_matrix): Sums the branch currents leaving each terminal of each element, shape
+            (3 * elements, branches).
+        has_terminals (np.ndarray): Whether each element has the terminals m, n and p.
+        source_branches (np.ndarray): The branch of each source.
+        source_y_pu (np.ndarray): The admittance of each source.
+        source_slots (np.ndarray): The slot of the internal voltage of each source in the result store.
+    """
+
+    def __init__(self, elements: list, seq: str, number_buses: int, tables: list = (), z_bases: np.ndarray = None):
+        """
+        Args:
+            elements (list): The elements.
+            seq (str): The sequence network.
+            number_buses (int): The number of buses, without the ground.
+            tables (list): The ElementTables.
+            z_bases (np.ndarray): The impedance base of each bus, indexed by bus id, needed by the tables.
+        """
+        self.elements = elements
+        self.tables = list(tables)
+        self.seq = seq
+
+        branches = []
+        position_rows, position_columns, position_signs = [], [], []
+        terminal_rows, terminal_columns, terminal_signs = [], [], []
+        source_branches, source_y_pu, source_slots, source_stores = [], [], [], []
+        self.has_terminals = np.zeros(len(elements), dtype=bool)
+
+        for index, element in enumerate(elements):
+            first_branch = len(branches)
+            element_branches = element.admittance_representation(seq)
+            branches.extend(element_branches)
+
+            terminals = element_terminals(element)
+            if terminals is None:
+                continue
+            self.has_terminals[index] = True
+
+            for position, branch in enumerate(element_branches[:3]):
+                first, second = (terminals[terminal] for terminal in BRANCH_TERMINALS[position])
+                reversed_branch = (branch.id_bus_m, branch.id_bus_n) == (second, first) and first != second
+
+                position_rows.append(3 * index + position)
+                position_columns.append(first_branch + position)
+                position_signs.append(-1 if reversed_branch else 1)
+
+            ground_terminal = next((terminal for terminal, id_bus in enumerate(terminals) if id_bus == 0), None)
+            for terminal, id_bus in enumerate(terminals):
+                if id_bus == 0:
+                    continue
+
+                for offset, branch in enumerate(element_branches):
+                    sign = (branch.id_bus_m == id_bus) - (branch.id_bus_n == id_bus)
+                    if sign == 0:
+                        continue
+
+                    terminal_rows.append(3 * index + terminal)
+                    terminal_columns.append(first_branch + offset)
+                    terminal_signs.append(sign)
+                    # The current leaving a terminal returns through the ground terminal
+                    if ground_terminal is not None:
+                        terminal_rows.append(3 * index + ground_terminal)
+                        terminal_columns.append(first_branch + offset)
+                        terminal_signs.append(-sign)
+
+            if seq == 'seq1':
+                for source in element_sources(element):
+                    source_branches.append(first_branch)
+                    source_y_pu.append(source.branches_seq1[0].y_pu)
+                    source_slots.append(source.v_internal.slot)
+                    source_stores.append(source.v_internal.result_store)
+
+        element_id_buses_m, element_id_buses_n = branches_incidences(branches)
+        y_pu, id_buses_m, id_buses_n = [branches_admittances(branches)], [element_id_buses_m], [element_id_buses_n]
+        position_entries = [np.array(entries, dtype=dtype) for entries, dtype in
+                            ((position_rows, np.int64), (position_columns, np.int64), (position_signs, float))]
+        terminal_entries = [np.array(entries, dtype=dtype) for entries, dtype in
+                            ((terminal_rows, np.int64), (terminal_columns, np.int64), (terminal_signs, float))]
+
+        first_row, first_branch = len(elements), len(branches)
+        table_has_terminals = []
+        for table in self.tables:
+            table_id_buses_m, table_id_buses_n = table.branch_terminals(seq)
+            y_pu.append(table.admittances_pu(seq, z_bases))
+            id_buses_m.append(table_id_buses_m)
+            id_buses_n.append(table_id_buses_n)
+
+            table_positions, table_terminals = self._table_entries(table, table_id_buses_m, table_id_buses_n,
+                                                                   first_row, first_branch)
+            position_entries = [np.concatenate(pair) for pair in zip(position_entries, table_positions)]
+            terminal_entries = [np.concatenate(pair) for pair in zip(terminal_entries, table_terminals)]
+            table_has_terminals.append(np.ones(len(table), dtype=bool))
+
+            first_row += len(table)
+            first_branch += len(table)
+
+        self.number_rows = first_row
+        self.has_terminals = np.concatenate([self.has_terminals] + table_has_terminals)
+
+        number_branches = first_branch
+        number_rows = 3 * self.number_rows
+
+        self.y_pu = np.concatenate(y_pu)
+        id_buses_m, id_buses_n = np.concatenate(id_buses_m), np.concatenate(id_buses_n)
+
+        rows = np.arange(number_branches)
+        signs = np.concatenate((np.ones(number_branches), -np.ones(number_branches)))
+        self.branch_incidence = sparse.csr_matrix((signs, (np.concatenate((rows, rows)),
+                                                           np.concatenate((id_buses_m, id_buses_n)))),
+                                                  shape=(number_branches, number_buses + 1))
+        self._ideal_branches = np.isinf(self.y_pu)
+        self._ideal_branch_currents = None
+        if self._ideal_branches.any():
+            self._ideal_branch_currents = IdealBranchCurrents(id_buses_m[self._ideal_branches],
+                                                              id_buses_n[self._ideal_branches])
+        rows, columns, signs = position_entries
+        self.position_incidence = sparse.csr_matrix((signs, (rows, columns)), shape=(number_rows, number_branches))
+        rows, columns, signs = terminal_entries
+        self.terminal_incidence = sparse.csr_matrix((signs, (rows, columns)), shape=(number_rows, number_branches))
+
+        self.source_branches = np.array(source_branches, dtype=np.int64)
+        self.source_y_pu = np.array(source_y_pu, dtype=complex)
+        self.source_slots = np.array(source_slots, dtype=np.int64)
+        self._source_stores = source_stores
+
+        # The positions an element doesn't have (e.g. the seq0 of a NetworkEquivalent) have no current
+        self._undefined_positions = np.diff(self.position_incidence.indptr) == 0
+
+    @staticmethod
+    def _table_entries(table, id_buses_m: np.ndarray, id_buses_n: np.ndarray, first_row: int,
+                       first_branch: int) -> tuple[list, list]:
+        # The entries of the position and terminal maps of the rows of a table, each row having its branch in the
+        # position mn and the same terminal rules as the elements
+        number_rows = len(table)
+        rows = first_row + np.arange(number_rows)
+        columns = first_branch + np.arange(number_rows)
+        terminals = table.terminals()
+
+        positions = [3 * rows, columns, np.ones(number_rows)]
+
+        terminal_rows, terminal_columns, terminal_signs = [], [], []
+        leaving = np.zeros(number_rows)
+        for terminal in range(3):
+            id_buses = terminals[:, terminal]
+            signs = np.where(id_buses != 0,
+                             (id_buses_m == id_buses).astype(float) - (id_buses_n == id_buses).astype(float), 0)
+            leaving += signs
+
+            has_sign = signs != 0
+            terminal_rows.append(3 * rows[has_sign] + terminal)
+            terminal_columns.append(columns[has_sign])
+            terminal_signs.append(signs[has_sign])
+
+        # The current leaving the other terminals returns through the first terminal at the ground
+        at_ground = terminals == 0
+        has_ground = at_ground.any(axis=1) & (leaving != 0)
+        ground_terminals = np.argmax(at_ground, axis=1)
+        terminal_rows.append(3 * rows[has_ground] + ground_terminals[has_ground])
+        terminal_columns.append(columns[has_ground])
+        terminal_signs.append(-leaving[has_ground])
+
+        return positions, [np.concatenate(terminal_rows), np.concatenate(terminal_columns),
+                           np.concatenate(terminal_signs)]
+
+    def source_currents(self) -> np.ndarray:
+        """
+        Returns the currents y * E impressed by the internal voltages of the sources on each branch, read from the
+        result store so they follow the last load flow.
+        """
+        internal_voltages = np.fromiter((store.values[slot, VIResultStore.PRE_FAULT]
+                                         if store.defined[slot, VIResultStore.PRE_FAULT] else 0
+                                         for store, slot in zip(self._source_stores, self.source_slots)),
+                                        dtype=complex, count=len(self.source_slots))
+
+        source_currents = np.zeros(len(self.y_pu), dtype=complex)
+        np.add.at(source_currents, self.source_branches, self.source_y_pu * internal_voltages)
+
+        return source_currents
+
+    def branch_currents(self, v_buses: np.ndarray, i_injected: np.ndarray = None) -> np.ndarray:
+        """
+        Calculates the current of every branch from the bus voltages.
+
+        Args:
+            v_buses (np.ndarray): The voltages indexed by bus id (the ground 0 included), shape (number_buses + 1,) or
+                (number_buses + 1, cases).
+            i_injected (np.ndarray): The currents injected at the buses from outside the elements (e.g. -I_f at a
+                faulted bus), with the shape of v_buses, only needed by the ideal branches. None for no injection.
+
+        Returns:
+            np.ndarray: The current of each branch, shape (branches,) or (branches, cases).
+        """
+        v_buses = np.asarray(v_buses, dtype=complex)
+        y_pu = self.y_pu.reshape((-1,) + (1,) * (v_buses.ndim - 1))
+
+        with np.errstate(invalid='ignore'):
+            branch_currents = y_pu * (self.branch_incidence @ v_buses)
+        branch_currents[self._ideal_branches] = 0
+
+        if len(self.source_branches):
+            source_currents = self.source_currents()
+            branch_currents -= source_currents.reshape(y_pu.shape)
+
+        if self._ideal_branch_currents is not None:
+            # What each bus doesn't send through the other branches goes through its ideal branches
+            bus_balances = -(self.branch_incidence.T @ branch_currents)
+            if i_injected is not None:
+                bus_balances += i_injected
+            branch_currents[self._ideal_branches] = self._ideal_branch_currents.currents(bus_balances)
+
+        return branch_currents
+
+    def element_currents(self, v_buses: np.ndarray, i_injected: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Calculates the currents of every element from the bus voltages.
+
+        Args:
+            v_buses (np.ndarray): The voltages indexed by bus id, shape (number_buses + 1,) or
+                (number_buses + 1, cases).
+            i_injected (np.ndarray): The currents injected at the buses from outside the elements, see branch_currents.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The currents i_mn, i_np and i_mp and the currents i_bus_m, i_bus_n and
+                i_bus_p of each element and table row, each of shape (number_rows, 3) or (number_rows, 3, cases).
+        """
+        branch_currents = self.branch_currents(v_buses, i_injected)
+        shape = (self.number_rows, 3) + branch_currents.shape[1:]
+
+        position_currents = self.position_incidence @ branch_currents
+        position_currents[self._undefined_positions] = 0
+        terminal_currents = self.terminal_incidence @ branch_currents
+
+        position_currents = position_currents.reshape(shape)
+        terminal_currents = terminal_currents.reshape(shape)
+        position_currents[~self.has_terminals] = np.nan
+        terminal_currents[~self.has_terminals] = np.nan
+
+        return position_currents, terminal_currents
+
+
+class FaultCurrentsResult:
+    """
+    Represents the post-fault bus voltages and element currents of a batch of faults.
+
+    Attributes:
+        fault_type (str): The fault type.
+        id_fault_buses (np.ndarray): The faulted bus of each case.
+        v_buses_pu (np.ndarray): The seq0, seq1 and seq2 voltages of the buses 1 to number_buses, shape
+            (cases, number_buses, 3).
+        i_branches_pu (np.ndarray): The seq0, seq1 and seq2 currents i_mn, i_np and i_mp of each element (and table
+            row), shape (cases, elements, 3, 3), the last axis being the sequence.
+        i_buses_pu (np.ndarray): The seq0, seq1 and seq2 currents i_bus_m, i_bus_n and i_bus_p of each element, shape
+            (cases, elements, 3, 3).
+    """
+
+    def __init__(self, fault_type: str, id_fault_buses: np.ndarray, v_buses_pu: np.ndarray, i_branches_pu: np.ndarray,
+                 i_buses_pu: np.ndarray):
+        self.fault_type = fault_type
+        self.id_fault_buses = id_fault_buses
+        self.v_buses_pu = v_buses_pu
+        self.i_branches_pu = i_branches_pu
+        self.i_buses_pu = i_buses_pu
+
+
+def fault_bus_voltages(factorization, v_pre_fault: np.ndarray, id_fault_buses: np.ndarray,
+                       i_fault: np.ndarray, v_fault: np.ndarray) -> np.ndarray:
+    """
+    Calculates the voltages of every bus of a sequence network for a batch of faults, V = V_pre - Z[:, k] * I_f, with
+    the columns of Zbus of all faulted buses from one solve.
+
+    The buses of an island without a path to the ground carry no current from the fault, so the island of the faulted
+    bus is at the voltage of the faulted bus (given by the boundary conditions of the fault) and the other ones keep
+    their pre-fault voltage.
+
+    Args:
+        factorization (IslandedFactorization): The factorization of the sequence network.
+        v_pre_fault (np.ndarray): The pre-fault voltages indexed by bus id, zeros for seq0 and seq2.
+        id_fault_buses (np.ndarray): The faulted bus of each case.
+        i_fault (np.ndarray): The fault current of this sequence of each case.
+        v_fault (np.ndarray): The voltage of this sequence at the faulted bus of each case.
+
+    Returns:
+        np.ndarray: The voltages indexed by bus id, shape (number_buses + 1, cases).
+    """
+    bus_index = factorization.bus_index
+    number_cases = len(id_fault_buses)
+
+    nodes = bus_index[id_fault_buses]
+    has_node = nodes >= 0
+    currents = np.zeros((factorization.number_nodes, number_cases), dtype=complex)
+    currents[nodes[has_node], np.flatnonzero(has_node)] = 1
+
+    # The buses of other islands without a path to the ground get 0, the fault doesn't reach them, and the island of a
+    # floating faulted bus is infinite and set below
+    impedance_columns = factorization.to_buses(factorization.solve(currents))
+
+    with np.errstate(invalid='ignore'):
+        drops = np.where(i_fault == 0, 0, impedance_columns * i_fault)
+    v_buses = v_pre_fault[:, np.newaxis] - drops
+
+    topology = factorization.topology
+    bus_islands = topology.bus_islands(bus_index)
+    fault_islands = bus_islands[id_fault_buses]
+    floating_fault = (fault_islands >= 0) & ~topology.grounded[fault_islands]
+    same_island = (bus_islands[:, np.newaxis] == fault_islands) & floating_fault
+    v_buses = np.where(same_island, v_fault, v_buses)
+    v_buses[id_fault_buses, np.arange(number_cases)] = v_fault
+    v_buses[0] = 0
+
+    return v_buses
+
+
+def calculate_fault_element_currents(maps: dict, factorizations: dict, z_thevenin: np.ndarray,
+                                     v_pre_fault: np.ndarray, id_fault_buses: np.ndarray, fault_type: str,
+                                     z_fault=0) -> FaultCurrentsResult:
+    """
+    Calculates the post-fault bus voltages and the element currents of a batch of faults, one fault bus per case.
+
+    Args:
+        maps (dict): The ElementCurrentsMap of each sequence.
+        factorizations (dict): The IslandedFactorization of each sequence.
+        z_thevenin (np.ndarray): The Thevenin impedances of the buses 1 to number_buses, shape (number_buses, 3).
+        v_pre_fault (np.ndarray): The pre-fault voltages of the buses 1 to number_buses.
+        id_fault_buses (np.ndarray): The faulted bus of each case.
+        fault_type (str): One of '3ph', 'slg', 'll' or 'llg'.
+        z_fault: The fault impedance in pu.
+
+    Returns:
+        FaultCurrentsResult: The voltages and currents of the batch.
+    """
+    id_fault_buses = np.asarray(id_fault_buses, dtype=np.int64)
+    z_thevenin_faults = z_thevenin[id_fault_buses - 1]
+    v_pre_fault_faults = v_pre_fault[id_fault_buses - 1]
+
+    i_fault = calculate_fault_currents(fault_type, z_thevenin_faults, v_pre_fault_faults, z_fault)
+    v_fault = calculate_fault_voltages(z_thevenin_faults, v_pre_fault_faults, i_fault, fault_type, z_fault)
+
+    number_cases, number_elements = len(id_fault_buses), maps['seq1'].number_rows
+    v_buses_pu = np.empty((number_cases, len(v_pre_fault), 3), dtype=complex)
+    i_branches_pu = np.empty((number_cases, number_elements, 3, 3), dtype=complex)
+    i_buses_pu = np.empty((number_cases, number_elements, 3, 3), dtype=complex)
+
+    for position, seq in enumerate(SEQUENCES):
+        v_pre_fault_seq = np.zeros(len(v_pre_fault) + 1, dtype=complex)
+        if seq == 'seq1':
+            v_pre_fault_seq[1:] = v_pre_fault
+
+        v_buses = fault_bus_voltages(factorizations[seq], v_pre_fault_seq, id_fault_buses, i_fault[:, position],
+                                     v_fault[:, position])
+        # The fault current leaves the network at the faulted bus
+        i_injected = np.zeros_like(v_buses)
+        i_injected[id_fault_buses, np.arange(number_cases)] = -i_fault[:, position]
+        position_currents, terminal_currents = maps[seq].element_currents(v_buses, i_injected)
+
+        v_buses_pu[..., position] = v_buses[1:].T
+        i_branches_pu[..., position] = np.moveaxis(position_currents, -1, 0)
+        i_buses_pu[..., position] = np.moveaxis(terminal_currents, -1, 0)
+
+    return FaultCurrentsResult(fault_type, id_fault_buses, v_buses_pu, i_branches_pu, i_buses_pu)
@@ -0,0 +1,454 @@
+from network_elements.matrix_assembly import (SEQUENCES, branches_admittances, merge_ideal_branches,
+                                              stamp_bus_admittance_matrix)
+from network_elements.factorization import IslandedFactorization
+from network_elements.topology import SequenceTopology
+from network_elements.short_circuit import FAULT_TYPES, FaultSweepResult, sweep_faults
+import numpy as np
+
+
+class ContingencySweepResult(FaultSweepResult):
+    """
+    Represents the results of a short-circuit sweep over a set of buses for every outage of a contingency list.
+
+    Attributes:
+        currents (dict): The seq0, seq1 and seq2 fault currents in pu for each fault type, arrays of shape
+            (outages, buses, 3).
+        voltages (dict): The seq0, seq1 and seq2 post-fault voltages at the faulted bus in pu for each fault type,
+            arrays of shape (outages, buses, 3).
+        z_thevenin (np.ndarray): The seq0, seq1 and seq2 Thevenin impedances of each outage, shape (outages, buses, 3).
+        islanding (np.ndarray): Whether each outage splits the positive sequence network into more islands or leaves
+            buses without a source.
+    """
+
+    def __init__(self, currents: dict, voltages: dict, z_thevenin: np.ndarray, islanding: np.ndarray):
+        super().__init__(currents, voltages)
+        self.z_thevenin = z_thevenin
+        self.islanding = islanding
+
+
+def remaining_admittances(element, outaged_ids: set, seq: str) -> np.ndarray:
+    """
+    Returns the admittances of the branches of an element in the given sequence after the outage of some elements.
+
+    An outaged element has no branches left. A composite element keeps the sum of the branches of its elements that
+    are still in service, so the outage of one of its elements (e.g. one of two parallel cables) weakens the composite
+    branches instead of removing them.
+    """
+    number_branches = len(element.admittance_representation(seq))
+    if id(element) in outaged_ids:
+        return np.zeros(number_branches, dtype=complex)
+
+    sub_elements = getattr(element, 'elements', None)
+    if sub_elements is None:
+        return branches_admittances(element.admittance_representation(seq))
+
+    y_pu = np.zeros(number_branches, dtype=complex)
+    for sub_element in sub_elements:
+        y_sub_pu = remaining_admittances(sub_element, outaged_ids, seq)
+        y_pu[:len(y_sub_pu)] += y_sub_pu
+
+    return y_pu
+
+
+def _number_grounded_buses(topology: SequenceTopology, bus_index: np.ndarray) -> int:
+    # Buses merged with the reference are grounded too
+    has_node = bus_index >= 0
+    return np.count_nonzero(~has_node) + np.count_nonzero(topology.grounded_nodes()[bus_index[has_node]])
+
+
+class SequenceOutageSolver:
+    """
+    Calculates the Thevenin impedances of one sequence network after changes of some of its branches, from the
+    factorization of the base case.
+
+    The changes of k branches give the bus admittance matrix
+
+        Y' = Y + A * D * At
+
+    where the columns of A are the node incidences of the changed branches and D holds their admittance changes. The
+    Sherman-Morrison-Woodbury identity gives the new bus impedances from the base factorization, without building or
+    factorizing Y':
+
+        Z' = Z - Z * A * (D^-1 + At * Z * A)^-1 * At * Z
+
+    Only the k columns Z * A are solved (one forward/back substitution with k right hand sides), so the new Thevenin
+    impedances of every bus cost O(nodes * k). The changes that modify the topology (new islands, islands left without
+    a path to the ground, or ideal branches removed, which splits merged buses) make the update singular or change the
+    nodes, so the sequence network is assembled and factorized again for them (they are expected to be few in a meshed
+    network).
+
+    The solver only holds arrays and the base factorization, so it can be rebuilt from shared memory in other processes
+    (see arrays and from_arrays).
+    """
+
+    def __init__(self, id_buses_m: np.ndarray, id_buses_n: np.ndarray, y_pu: np.ndarray, bus_index: np.ndarray,
+                 number_buses: int, topology: SequenceTopology, factorization: IslandedFactorization,
+                 node_impedance_diagonal: np.ndarray = None):
+        """
+        Args:
+            id_buses_m (np.ndarray): The bus ids of the first terminal of each branch.
+            id_buses_n (np.ndarray): The bus ids of the second terminal of each branch.
+            y_pu (np.ndarray): The admittance of each branch in pu in the base case.
+            bus_index (np.ndarray): Maps a bus id to its node (-1 for the reference).
+            number_buses (int): The number of buses, without the ground.
+            topology (SequenceTopology): The islands of the base case.
+            factorization (IslandedFactorization): The factorization of the base case.
+            node_impedance_diagonal (np.ndarray): The diagonal of Zbus by node, calculated from the factorization when
+                not given.
+        """
+        self.id_buses_m = id_buses_m
+        self.id_buses_n = id_buses_n
+        self.y_pu = y_pu
+        self.bus_index = bus_index
+        self.number_buses = number_buses
+        self.number_nodes = factorization.number_nodes
+        self.topology = topology
+        self.factorization = factorization
+
+        if node_impedance_diagonal is None:
+            node_impedance_diagonal = factorization._node_diagonal()
+        self.node_impedance_diagonal = node_impedance_diagonal
+
+        # The connections whose removal splits an island and the number of branches from each island to the ground,
+        # so most changes are known not to change the topology without building it again
+        self._bridges = topology.bridges()
+
+        rows_m, rows_n = bus_index[id_buses_m], bus_index[id_buses_n]
+        to_ground = (y_pu != 0) & ((rows_m < 0) != (rows_n < 0))
+        self._island_ground_branches = np.bincount(topology.island_labels[np.maximum(rows_m[to_ground],
+                                                                                     rows_n[to_ground])],
+                                                   minlength=topology.number_islands)
+
+    def arrays(self) -> dict:
+        """
+        Returns the branches, the base factorization, its topology and the precomputed bridges as arrays, so the solver
+        can be rebuilt in another process (see from_arrays) from shared memory, without factorizing again. The arrays
+        of the topology and the factorization are under keys prefixed with 'topology_' and 'factorization_'.
+        """
+        bridges = np.array(sorted(self._bridges), dtype=np.int64).reshape(-1, 2)
+        arrays = {'id_buses_m': self.id_buses_m, 'id_buses_n': self.id_buses_n, 'y_pu': self.y_pu,
+                  'bus_index': self.bus_index, 'node_impedance_diagonal': self.node_impedance_diagonal,
+                  'bridges': bridges, 'island_ground_branches': self._island_ground_branches}
+        arrays.update({'topology_' + name: array for name, array in self.topology.arrays().items()})
+        arrays.update({'factorization_' + name: array for name, array in self.factorization.factors().items()})
+
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, number_buses: int):
+        """
+        Rebuilds the solver from the arrays returned by arrays, e.g. views of shared memory.
+        """
+        def prefixed(prefix: str) -> dict:
+            return {name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)}
+
+        topology = SequenceTopology.from_arrays(prefixed('topology_'))
+        factorization = IslandedFactorization.from_factors(prefixed('factorization_'), arrays['bus_index'], topology)
+
+        solver = cls.__new__(cls)
+        solver.id_buses_m = arrays['id_buses_m']
+        solver.id_buses_n = arrays['id_buses_n']
+        solver.y_pu = arrays['y_pu']
+        solver.bus_index = arrays['bus_index']
+        solver.number_buses = number_buses
+        solver.number_nodes = factorization.number_nodes
+        solver.topology = topology
+        solver.factorization = factorization
+        solver.node_impedance_diagonal = arrays['node_impedance_diagonal']
+        solver._bridges = {(int(node_low), int(node_high)) for node_low, node_high in arrays['bridges']}
+        solver._island_ground_branches = arrays['island_ground_branches']
+
+        return solver
+
+    def base_thevenin_impedances(self) -> np.ndarray:
+        """
+        Returns the Thevenin impedances of the buses 1 to number_buses in the base case.
+        """
+        return self.factorization.to_buses(self.node_impedance_diagonal)[1:]
+
+    def _may_change_topology(self, rows_m: np.ndarray, rows_n: np.ndarray) -> bool:
+        # Whether removing the branches between the given nodes can split an island or leave it without a path to the
+        # ground: more than one connection lost, a bridge lost or the last branches to the ground of an island lost
+        topology = self.topology
+
+        between_nodes = (rows_m >= 0) & (rows_n >= 0) & (rows_m != rows_n)
+        pairs_low = np.minimum(rows_m[between_nodes], rows_n[between_nodes])
+        pairs_high = np.maximum(rows_m[between_nodes], rows_n[between_nodes])
+        pairs, removed = np.unique(np.stack((pairs_low, pairs_high)), axis=1, return_counts=True)
+
+        remaining = np.asarray(topology.adjacency[pairs[0], pairs[1]]).ravel() - removed
+        lost_pairs = pairs[:, remaining <= 0]
+        if lost_pairs.shape[1] > 1 or \
+                (lost_pairs.shape[1] == 1 and (int(lost_pairs[0, 0]), int(lost_pairs[1, 0])) in self._bridges):
+            return True
+
+        to_ground = (rows_m < 0) != (rows_n < 0)
+        islands = topology.island_labels[np.maximum(rows_m[to_ground], rows_n[to_ground])]
+        removed_ground = np.bincount(islands, minlength=topology.number_islands)
+
+        return bool((topology.grounded & (self._island_ground_branches <= removed_ground)).any())
+
+    def thevenin_impedances(self, positions: np.ndarray, y_pu: np.ndarray) -> tuple[np.ndarray, bool]:
+        """
+        Calculates the Thevenin impedances of every bus after changing the admittances of some branches.
+
+        Args:
+            positions (np.ndarray): The positions of the changed branches.
+            y_pu (np.ndarray): The admittances of the changed branches in pu.
+
+        Returns:
+            tuple[np.ndarray, bool]: The Thevenin impedances of the buses 1 to number_buses, and whether the changes
+                split an island or leave buses without a path to the ground.
+        """
+        if len(positions) == 0:
+            return self.base_thevenin_impedances(), False
+
+        base_y_pu = self.y_pu
+        rows_m, rows_n = self.bus_index[self.id_buses_m[positions]], self.bus_index[self.id_buses_n[positions]]
+
+        ideal_changed = bool(np.isinf(base_y_pu[positions]).any())
+        removed = y_pu == 0
+        if ideal_changed or (removed.any() and self._may_change_topology(rows_m[removed], rows_n[removed])):
+            outage_y_pu = base_y_pu.copy()
+            outage_y_pu[positions] = y_pu
+
+            outage_bus_index, outage_number_nodes = self.bus_index, self.number_nodes
+            if ideal_changed:
+                outage_bus_index, outage_number_nodes = merge_ideal_branches(self.id_buses_m, self.id_buses_n,
+                                                                             outage_y_pu, self.number_buses)
+            outage_topology = SequenceTopology(self.id_buses_m, self.id_buses_n, outage_y_pu, outage_bus_index,
+                                               outage_number_nodes)
+
+            islanding = outage_topology.number_islands > self.topology.number_islands or \
+                _number_grounded_buses(outage_topology, outage_bus_index) < \
+                _number_grounded_buses(self.topology, self.bus_index)
+
+            if ideal_changed or islanding:
+                bus_admittance_matrix = stamp_bus_admittance_matrix(self.id_buses_m, self.id_buses_n, outage_y_pu,
+                                                                    outage_bus_index, outage_number_nodes)
+                factorization = IslandedFactorization(bus_admittance_matrix, outage_bus_index, outage_topology)
+
+                return factorization.impedance_diagonal()[1:], islanding
+
+        # Branches inside an island without a path to the ground don't change its (infinite) impedances, and branches
+        # merged into one node don't change the matrix
+        grounded_nodes = self.topology.grounded_nodes()
+        updated = (rows_m != rows_n) & ((rows_m < 0) | grounded_nodes[rows_m]) & ((rows_n < 0) | grounded_nodes[rows_n])
+        if not updated.any():
+            return self.base_thevenin_impedances(), False
+
+        rows_m, rows_n = rows_m[updated], rows_n[updated]
+        delta_y_pu = y_pu[updated] - base_y_pu[positions[updated]]
+
+        incidence = np.zeros((self.number_nodes, len(delta_y_pu)), dtype=complex)
+        columns = np.arange(len(delta_y_pu))
+        incidence[rows_m[rows_m >= 0], columns[rows_m >= 0]] += 1
+        incidence[rows_n[rows_n >= 0], columns[rows_n >= 0]] -= 1
+
+        # Z * A, the nodes of ungrounded islands get no injection and stay at 0
+        z_incidence = self.factorization.solve(incidence)
+
+        capacitance = np.diag(1 / delta_y_pu) + incidence.T @ z_incidence
+        update = np.linalg.solve(capacitance, z_incidence.T)
+
+        with np.errstate(invalid='ignore'):
+            node_diagonal = self.node_impedance_diagonal - np.sum(z_incidence * update.T, axis=1)
+        node_diagonal = np.where(np.isinf(self.node_impedance_diagonal), np.inf, node_diagonal)
+
+        return self.factorization.to_buses(node_diagonal)[1:], False
+
+
+class ContingencyAnalysis:
+    """
+    Evaluates the Thevenin impedances and the fault currents of a network under a list of element outages.
+
+    The outage of an element changes a few branches of each sequence network, at most three per element, so the bus
+    impedances after the outage are low-rank updates of the base factorizations (see SequenceOutageSolver) and the bus
+    admittance matrices aren't built or factorized again per outage.
+
+    Attributes:
+        network (Network): The network, with its bus admittance matrices factorized.
+        outages (list[list]): The elements out of service in each contingency.
+        solvers (dict): The SequenceOutageSolver of each sequence network.
+        islanding (np.ndarray): Whether each outage splits the positive sequence network into more islands or leaves
+            buses without a source.
+    """
+
+    def __init__(self, network, outages: list):
+        """
+        Prepares the branch positions of the outaged elements in the base sequence networks.
+
+        Args:
+            network (Network): The network in its base case.
+            outages (list): The contingencies, each one an element or a list of elements out of service at the same time
+                (e.g. the circuits of a double circuit line), an empty list being the base case. The elements can also
+                be elements of a CompositeElement.
+        """
+        network.factorize_bus_admittance_matrices()
+        self.network = network
+        self.outages = [list(outage) if isinstance(outage, (list, tuple)) else [outage] for outage in outages]
+
+        # Offset of the branches of each simplified element in the branch vectors of each sequence, and the simplified
+        # element that holds each element
+        self._branch_offsets = {}
+        for seq in SEQUENCES:
+            number_branches = [len(element.admittance_representation(seq)) for element in network.simplified_elements]
+            self._branch_offsets[seq] = np.concatenate(([0], np.cumsum(number_branches, dtype=np.int64)))
+
+        self._holders = {}
+        for position, element in enumerate(network.simplified_elements):
+            self._register_holder(element, position)
+
+        self._solvers = None
+        self.islanding = np.zeros(len(self.outages), dtype=bool)
+
+    @property
+    def solvers(self) -> dict:
+        # Built on first use, the branch changes alone don't need them (e.g. when the outages are solved elsewhere)
+        if self._solvers is None:
+            network = self.network
+            self._solvers = {}
+            for seq in SEQUENCES:
+                id_buses_m, id_buses_n = network.element_node_incidence_matrix[seq]
+                self._solvers[seq] = SequenceOutageSolver(id_buses_m, id_buses_n,
+                                                          network.primitive_admittance_matrix[seq],
+                                                          network.sequence_bus_index[seq], network.number_buses,
+                                                          network.topology_index[seq],
+                                                          network.bus_impedance_matrix[seq])
+
+        return self._solvers
+
+    def _register_holder(self, element, position: int):
+        self._holders[id(element)] = position
+        for sub_element in getattr(element, 'elements', []):
+            self._register_holder(sub_element, position)
+
+    def branch_changes(self, outage: list, seq: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positions of the branches of the given sequence changed by an outage and their admittances after it.
+        """
+        if len(outage) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=complex)
+
+        outaged_ids = {id(element) for element in outage}
+
+        holders = []
+        for element in outage:
+            if id(element) not in self._holders:
+                raise ValueError(f"The element {element} isn't in the network")
+            holders.append(self._holders[id(element)])
+
+        positions, y_pu = [], []
+        for holder in sorted(set(holders)):
+            element = self.network.simplified_elements[holder]
+            start = self._branch_offsets[seq][holder]
+
+            y_holder_pu = remaining_admittances(element, outaged_ids, seq)
+            positions.append(np.arange(start, start + len(y_holder_pu)))
+            y_pu.append(y_holder_pu)
+
+        positions = np.concatenate(positions)
+        y_pu = np.concatenate(y_pu)
+        changed = y_pu != self.network.primitive_admittance_matrix[seq][positions]
+
+        return positions[changed], y_pu[changed]
+
+    def outage_branch_changes(self, seq: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the branch changes of the given sequence of every outage at once, the changes of the outage i being the
+        entries pointers[i] to pointers[i + 1] - 1 of positions and y_pu (see branch_changes).
+
+        The outages of whole simplified elements (e.g. the usual N-1 and N-2 lists) remove every branch of their
+        elements, so their changes are gathered with array operations. Only the outages of elements inside composite
+        elements go through branch_changes.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The pointers, the positions of the changed branches and their
+                admittances after the outages.
+        """
+        simplified_elements = self.network.simplified_elements
+        base_y_pu = self.network.primitive_admittance_matrix[seq]
+        offsets = self._branch_offsets[seq]
+
+        outage_indices, holders, partial_outages = [], [], []
+        for index, outage in enumerate(self.outages):
+            outage_holders = [self._holders.get(id(element), -1) for element in outage]
+            if all(holder >= 0 and simplified_elements[holder] is element
+                   for holder, element in zip(outage_holders, outage)):
+                outage_indices.extend([index] * len(outage_holders))
+                holders.extend(outage_holders)
+            else:
+                partial_outages.append(index)
+
+        # The branches of the holders of each outage, ordered by outage and holder as branch_changes orders them
+        pairs = np.unique(np.array([outage_indices, holders], dtype=np.int64).reshape(2, -1), axis=1)
+        outage_indices, holders = pairs
+        number_branches = offsets[holders + 1] - offsets[holders]
+        starts = np.cumsum(number_branches) - number_branches
+        positions = np.repeat(offsets[holders], number_branches) + \
+            np.arange(number_branches.sum()) - np.repeat(starts, number_branches)
+        outage_indices = np.repeat(outage_indices, number_branches)
+
+        changed = base_y_pu[positions] != 0
+        positions, outage_indices = positions[changed], outage_indices[changed]
+        y_pu = np.zeros(len(positions), dtype=complex)
+
+        if partial_outages:
+            changes = [self.branch_changes(self.outages[index], seq) for index in partial_outages]
+            positions = np.concatenate([positions] + [partial_positions for partial_positions, _ in changes])
+            y_pu = np.concatenate([y_pu] + [partial_y_pu for _, partial_y_pu in changes])
+            outage_indices = np.concatenate([outage_indices] + [np.full(len(partial_positions), index)
+                                                                for index, (partial_positions, _)
+                                                                in zip(partial_outages, changes)])
+
+            order = np.argsort(outage_indices, kind='stable')
+            positions, y_pu, outage_indices = positions[order], y_pu[order], outage_indices[order]
+
+        pointers = np.concatenate(([0], np.cumsum(np.bincount(outage_indices, minlength=len(self.outages)))))
+
+        return pointers, positions, y_pu
+
+    def thevenin_impedances(self, index: int) -> np.ndarray:
+        """
+        Calculates the seq0, seq1 and seq2 Thevenin impedances of every bus under the given outage.
+
+        Args:
+            index (int): The position of the outage in the contingency list.
+
+        Returns:
+            np.ndarray: A complex array of shape (number_buses, 3), the row i holds the impedances of the bus i + 1.
+        """
+        outage = self.outages[index]
+
+        z_thevenin = []
+        for seq in SEQUENCES:
+            z_seq, islanding = self.solvers[seq].thevenin_impedances(*self.branch_changes(outage, seq))
+            z_thevenin.append(z_seq)
+
+            # The positive sequence network holds every connection and source, so it defines the physical islands
+            if seq == 'seq1':
+                self.islanding[index] = islanding
+
+        return np.column_stack(z_thevenin)
+
+    def calculate_short_circuit_sweep(self, z_fault_pu: complex = 0, fault_types=FAULT_TYPES):
+        """
+        Calculates the faults at every bus for every outage, from the base case pre-fault voltages.
+
+        Args:
+            z_fault_pu (complex): The fault impedance in pu.
+            fault_types: The fault types to calculate.
+
+        Returns:
+            ContingencySweepResult: The currents, voltages and Thevenin impedances of each outage, arrays of shape
+                (outages, number_buses, 3), and the outages that island the network.
+        """
+        z_thevenin = np.empty((len(self.outages), self.network.number_buses, 3), dtype=complex)
+        for index in range(len(self.outages)):
+            z_thevenin[index] = self.thevenin_impedances(index)
+
+        # ! The pre-fault voltages of the base case are kept, a load flow of each outage isn't done
+        v_pre_fault = self.network.pre_fault_voltages()
+        sweep = sweep_faults(z_thevenin, v_pre_fault, z_fault_pu, fault_types)
+
+        return ContingencySweepResult(sweep.currents, sweep.voltages, z_thevenin, self.islanding.copy())
@@ -0,0 +1,85 @@
+from active_elements.vsource_elements import NetworkEquivalent
+import numpy as np
+
+
+def short_circuit_capacities(z_thevenin: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the three-phase and single-phase short-circuit capacities in pu from the Thevenin impedances, the inverse
+    of NetworkEquivalent.defined_by_sc_capacity (pre-fault voltage of 1 pu):
+
+        s_sc3 = conj(1 / z1)
+        s_sc1 = conj(3 / (z0 + z1 + z2))
+
+    Args:
+        z_thevenin (np.ndarray): The seq0, seq1 and seq2 Thevenin impedances in pu, shape (..., 3).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The three-phase and single-phase short-circuit capacities in pu, 0 where the
+            sequence networks are open (infinite impedance).
+    """
+    z_seq0, z_seq1, z_seq2 = z_thevenin[..., 0], z_thevenin[..., 1], z_thevenin[..., 2]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s_sc3_pu = np.conj(1 / z_seq1)
+        s_sc1_pu = np.conj(3 / (z_seq0 + z_seq1 + z_seq2))
+
+    s_sc3_pu = np.where(np.isinf(z_seq1), 0, s_sc3_pu)
+    s_sc1_pu = np.where(np.isinf(z_seq0) | np.isinf(z_seq1) | np.isinf(z_seq2), 0, s_sc1_pu)
+
+    return s_sc3_pu, s_sc1_pu
+
+
+class NetworkEquivalentsTable:
+    """
+    Represents the network equivalents of a set of buses, one row per bus.
+
+    Attributes:
+        id_buses (np.ndarray): The bus id of each row.
+        v_nom_kv (np.ndarray): The voltage base of each bus in kV.
+        s_base_mva (float): The power base of the impedances in MVA.
+        z_thevenin_pu (np.ndarray): The seq0, seq1 and seq2 Thevenin impedances in pu, shape (buses, 3).
+        s_sc3_mva (np.ndarray): The three-phase short-circuit capacity of each bus in MVA.
+        s_sc1_mva (np.ndarray): The single-phase short-circuit capacity of each bus in MVA.
+    """
+
+    CSV_HEADER = 'id_bus,v_nom_kv,s_sc3_mva,s_sc1_mva,r0_pu,x0_pu,r1_pu,x1_pu,r2_pu,x2_pu'
+
+    def __init__(self, id_buses: np.ndarray, v_nom_kv: np.ndarray, s_base_mva: float, z_thevenin_pu: np.ndarray):
+        self.id_buses = np.asarray(id_buses, dtype=np.int64)
+        self.v_nom_kv = np.asarray(v_nom_kv, dtype=float)
+        self.s_base_mva = s_base_mva
+        self.z_thevenin_pu = np.asarray(z_thevenin_pu, dtype=complex)
+
+        s_sc3_pu, s_sc1_pu = short_circuit_capacities(self.z_thevenin_pu)
+        self.s_sc3_mva = s_sc3_pu * s_base_mva
+        self.s_sc1_mva = s_sc1_pu * s_base_mva
+
+    def __len__(self):
+        return len(self.id_buses)
+
+    def to_csv(self, file):
+        """
+        Writes the table as CSV, with the magnitudes of the short-circuit capacities and the resistances and reactances
+        of the Thevenin impedances (inf for open sequence networks).
+        """
+        columns = np.column_stack((self.id_buses, self.v_nom_kv, np.abs(self.s_sc3_mva), np.abs(self.s_sc1_mva),
+                                   self.z_thevenin_pu.real[:, 0], self.z_thevenin_pu.imag[:, 0],
+                                   self.z_thevenin_pu.real[:, 1], self.z_thevenin_pu.imag[:, 1],
+                                   self.z_thevenin_pu.real[:, 2], self.z_thevenin_pu.imag[:, 2]))
+
+        np.savetxt(file, columns, fmt=['%d'] + ['%.6g'] * 9, delimiter=',', header=self.CSV_HEADER, comments='')
+
+    def network_equivalent(self, id_bus: int) -> NetworkEquivalent:
+        """
+        Returns a NetworkEquivalent element with the Thevenin impedances of the given bus.
+        """
+        row = np.flatnonzero(self.id_buses == id_bus)[0]
+        z_seq0, z_seq1, z_seq2 = self.z_thevenin_pu[row]
+
+        return NetworkEquivalent(z_seq0, z_seq1, z_seq2, int(id_bus), float(self.v_nom_kv[row]), self.s_base_mva)
+
+    def network_equivalents(self) -> list[NetworkEquivalent]:
+        """
+        Returns a NetworkEquivalent element for every bus of the table.
+        """
+        return [self.network_equivalent(id_bus) for id_bus in self.id_buses]
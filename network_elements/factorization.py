@@ -0,0 +1,454 @@
+from scipy import sparse
+from scipy.sparse.linalg import splu, spsolve_triangular
+import numpy as np
+
+
+class BusAdmittanceFactorization:
+    """
+    Sparse LU factorization of a bus admittance matrix, used as an implicit bus impedance matrix.
+
+    The factorization is computed once and every bus impedance value is obtained by forward/back substitution on
+    demand, so Zbus is never stored. A column k of Zbus is the solution of Ybus * z = e_k.
+
+    Attributes:
+        bus_index (np.ndarray): Maps a bus id to its row in the bus admittance matrix (-1 for the reference).
+        number_nodes (int): The dimension of the bus admittance matrix.
+    """
+
+    def __init__(self, bus_admittance_matrix: sparse.spmatrix, bus_index: np.ndarray):
+        """
+        Factorizes the bus admittance matrix.
+
+        Args:
+            bus_admittance_matrix (sparse.spmatrix): The bus admittance matrix of one sequence network.
+            bus_index (np.ndarray): Maps a bus id to its row in the bus admittance matrix (-1 for the reference).
+        """
+        self.bus_index = bus_index
+        self.number_nodes = bus_admittance_matrix.shape[0]
+
+        # Ybus is symmetric, so the diagonal is kept as pivot and the same ordering is applied to rows and columns.
+        # That gives Pt * Ybus * P = L * D * Lt, which is what the sparse inverse subset needs
+        self._lu = splu(sparse.csc_matrix(bus_admittance_matrix), permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0,
+                        options=dict(SymmetricMode=True))
+
+        self._impedance_diagonal = None
+
+    def solve(self, currents: np.ndarray) -> np.ndarray:
+        """
+        Solves Ybus * v = i for node currents given as a vector or as a matrix with one case per column.
+        """
+        return self._lu.solve(np.asarray(currents, dtype=complex))
+
+    def factors(self) -> dict:
+        """
+        Returns the factors as arrays, Pr * Ybus * Pc = L * D * U with L (CSC) and U (CSR) unit triangular and D
+        diagonal, so another process can solve with them (see TriangularFactorization) without factorizing Ybus again.
+        """
+        lower = sparse.csc_matrix(self._lu.L)
+        upper = sparse.csc_matrix(self._lu.U)
+        diagonal = upper.diagonal()
+        upper = sparse.csr_matrix(sparse.diags(1 / diagonal) @ upper)
+        lower.sum_duplicates()
+        upper.sum_duplicates()
+
+        return {'perm_r': self._lu.perm_r, 'perm_c': self._lu.perm_c, 'diagonal': diagonal,
+                'lower_data': lower.data, 'lower_indices': lower.indices, 'lower_indptr': lower.indptr,
+                'upper_data': upper.data, 'upper_indices': upper.indices, 'upper_indptr': upper.indptr}
+
+    def _node_column(self, node: int) -> np.ndarray:
+        unit_current = np.zeros(self.number_nodes, dtype=complex)
+        unit_current[node] = 1
+
+        return self.solve(unit_current)
+
+    def _node_diagonal(self) -> np.ndarray:
+        if self._impedance_diagonal is None:
+            diagonal = None
+            if np.array_equal(self._lu.perm_r, self._lu.perm_c):
+                lower = self._lu.L
+                diagonal_u = self._lu.U.diagonal()
+                diagonal = sparse_inverse_diagonal(lower, diagonal_u)
+
+            if diagonal is None:
+                diagonal = self._node_diagonal_by_columns()
+            else:
+                # The row i of Ybus is the row perm_c[i] of the factorized matrix
+                diagonal = diagonal[self._lu.perm_c]
+
+            self._impedance_diagonal = diagonal
+
+        return self._impedance_diagonal
+
+    def _node_diagonal_by_columns(self, block_size: int = 256) -> np.ndarray:
+        # Fallback when the factors can't be used by the sparse inverse subset: solves blocks of unit columns and
+        # keeps only their diagonal entries, so at most block_size columns of Zbus exist at a time
+        diagonal = np.empty(self.number_nodes, dtype=complex)
+        for start in range(0, self.number_nodes, block_size):
+            nodes = np.arange(start, min(start + block_size, self.number_nodes))
+            unit_currents = np.zeros((self.number_nodes, len(nodes)), dtype=complex)
+            unit_currents[nodes, np.arange(len(nodes))] = 1
+
+            diagonal[nodes] = self.solve(unit_currents)[nodes, np.arange(len(nodes))]
+
+        return diagonal
+
+    def to_buses(self, node_values: np.ndarray) -> np.ndarray:
+        """
+        Expands values indexed by node into values indexed by bus id (the reference gets 0).
+        """
+        node_values = np.asarray(node_values)
+        bus_values = np.zeros((len(self.bus_index),) + node_values.shape[1:], dtype=node_values.dtype)
+
+        has_node = self.bus_index >= 0
+        bus_values[has_node] = node_values[self.bus_index[has_node]]
+
+        return bus_values
+
+    def impedance_column(self, id_bus: int) -> np.ndarray:
+        """
+        Returns the column of Zbus of the given bus, indexed by bus id.
+        """
+        node = self.bus_index[id_bus]
+        if node < 0:
+            return np.zeros(len(self.bus_index), dtype=complex)
+
+        return self.to_buses(self._node_column(node))
+
+    def impedance_entry(self, id_bus_i: int, id_bus_k: int) -> complex:
+        """
+        Returns the entry (i, k) of Zbus, i.e. the voltage at bus i for an unit current injected at bus k.
+        """
+        node_i, node_k = self.bus_index[id_bus_i], self.bus_index[id_bus_k]
+        if node_i < 0 or node_k < 0:
+            return 0j
+
+        return complex(self._node_column(node_k)[node_i])
+
+    def thevenin_impedance(self, id_bus: int) -> complex:
+        """
+        Returns the Thevenin (driving-point) impedance of the given bus, the diagonal entry of Zbus.
+        """
+        node = self.bus_index[id_bus]
+        if node < 0:
+            return 0j
+
+        if self._impedance_diagonal is not None:
+            return complex(self._impedance_diagonal[node])
+
+        return self.impedance_entry(id_bus, id_bus)
+
+    def impedance_diagonal(self) -> np.ndarray:
+        """
+        Returns the diagonal of Zbus (the Thevenin impedances of all buses), indexed by bus id.
+
+        The diagonal is computed once by the sparse inverse subset of the factors, without forming Zbus.
+        """
+        return self.to_buses(self._node_diagonal())
+
+
+class TriangularFactorization(BusAdmittanceFactorization):
+    """
+    Bus admittance factorization rebuilt from the arrays of BusAdmittanceFactorization.factors, e.g. views of shared
+    memory, and solved by forward/back substitution on them.
+
+    The arrays aren't copied and are only read, so they may be mapped read-only: the triangular solves work on a copy
+    of each factor (spsolve_triangular sets the unit diagonal of the factor it is given). U is given in CSR, i.e. as
+    the lower factor Ut in CSC, so the diagonal is the unit diagonal in both factors.
+    """
+
+    def __init__(self, factors: dict, bus_index: np.ndarray):
+        """
+        Args:
+            factors (dict): The arrays returned by BusAdmittanceFactorization.factors.
+            bus_index (np.ndarray): Maps a bus id to its row in the bus admittance matrix (-1 for the reference).
+        """
+        self.bus_index = bus_index
+        self.number_nodes = len(factors['diagonal'])
+
+        self._lu = None
+        self._impedance_diagonal = None
+
+        shape = (self.number_nodes, self.number_nodes)
+        self._perm_r, self._perm_c, self._diagonal = factors['perm_r'], factors['perm_c'], factors['diagonal']
+        self._lower = sparse.csc_matrix((factors['lower_data'], factors['lower_indices'], factors['lower_indptr']),
+                                        shape=shape, copy=False)
+        self._upper = sparse.csr_matrix((factors['upper_data'], factors['upper_indices'], factors['upper_indptr']),
+                                        shape=shape, copy=False)
+
+    def solve(self, currents: np.ndarray) -> np.ndarray:
+        """
+        Solves Ybus * v = i for node currents given as a vector or as a matrix with one case per column.
+        """
+        currents = np.asarray(currents, dtype=complex)
+        permuted = np.empty_like(currents)
+        permuted[self._perm_r] = currents
+
+        lower_solution = spsolve_triangular(self._lower, permuted, lower=True, overwrite_A=False, overwrite_b=True,
+                                            unit_diagonal=True)
+        lower_solution /= self._diagonal.reshape((-1,) + (1,) * (currents.ndim - 1))
+        solution = spsolve_triangular(self._upper, lower_solution, lower=False, overwrite_A=False, overwrite_b=True,
+                                      unit_diagonal=True)
+
+        return solution[self._perm_c]
+
+    def _node_diagonal(self) -> np.ndarray:
+        if self._impedance_diagonal is None:
+            diagonal = None
+            if np.array_equal(self._perm_r, self._perm_c):
+                diagonal = sparse_inverse_diagonal(self._lower, self._diagonal)
+
+            if diagonal is None:
+                diagonal = self._node_diagonal_by_columns()
+            else:
+                diagonal = diagonal[self._perm_c]
+
+            self._impedance_diagonal = diagonal
+
+        return self._impedance_diagonal
+
+
+class IslandedFactorization(BusAdmittanceFactorization):
+    """
+    Factorization of a bus admittance matrix split into its islands, each island factorized and solved on its own.
+
+    The bus admittance matrix of a network with islands is block diagonal, so its inverse is block diagonal too. The
+    islands of a single node are inverted all at once and the other grounded islands are factorized in groups of about
+    group_size nodes: a group is a block diagonal matrix, so there is no fill and no work across its islands, while
+    thousands of small islands (e.g. between delta windings in seq0) don't pay the setup of a factorization each.
+    The blocks of ungrounded islands are singular and aren't factorized: their bus impedances are infinite, since no
+    current flows from them to the reference. The same sentinel is used by every method: the voltages of an ungrounded
+    island are infinite when a net current is injected into it and 0 when its injections cancel out (no current flows
+    through it to the reference).
+
+    Attributes:
+        bus_index (np.ndarray): Maps a bus id to its row in the bus admittance matrix (-1 for the reference).
+        number_nodes (int): The dimension of the bus admittance matrix.
+        topology (SequenceTopology): The islands of the sequence network.
+    """
+
+    def __init__(self, bus_admittance_matrix: sparse.spmatrix, bus_index: np.ndarray, topology,
+                 group_size: int = 4096):
+        """
+        Factorizes every grounded island of the bus admittance matrix.
+
+        Args:
+            bus_admittance_matrix (sparse.spmatrix): The bus admittance matrix of one sequence network.
+            bus_index (np.ndarray): Maps a bus id to its row in the bus admittance matrix (-1 for the reference).
+            topology (SequenceTopology): The islands of the same sequence network.
+            group_size (int): The number of nodes from which a group of islands is factorized, islands larger than it
+                are factorized alone.
+        """
+        self.bus_index = bus_index
+        self.number_nodes = bus_admittance_matrix.shape[0]
+        self.topology = topology
+
+        self._lu = None
+        self._impedance_diagonal = None
+
+        bus_admittance_matrix = sparse.csr_matrix(bus_admittance_matrix)
+        self._island_nodes = topology.island_nodes()
+        island_sizes = np.bincount(topology.island_labels, minlength=topology.number_islands)
+
+        grounded_nodes = topology.grounded_nodes()
+        self._floating_nodes = np.flatnonzero(~grounded_nodes)
+        self._single_nodes = np.flatnonzero(grounded_nodes & (island_sizes[topology.island_labels] == 1))
+        self._single_impedances = 1 / bus_admittance_matrix.diagonal()[self._single_nodes]
+
+        # Group of each node and its position in the group, -1 for nodes outside the factorized groups
+        self._node_groups = np.full(self.number_nodes, -1, dtype=np.int64)
+        self._node_positions = np.full(self.number_nodes, -1, dtype=np.int64)
+        self._groups = []
+
+        group_islands, group_number_nodes = [], 0
+        factorized_islands = np.flatnonzero(topology.grounded & (island_sizes > 1))
+        for position, island in enumerate(factorized_islands):
+            group_islands.append(self._island_nodes[island])
+            group_number_nodes += island_sizes[island]
+
+            if group_number_nodes >= group_size or position == len(factorized_islands) - 1:
+                self._add_group(bus_admittance_matrix, np.concatenate(group_islands))
+                group_islands, group_number_nodes = [], 0
+
+    def _add_group(self, bus_admittance_matrix: sparse.csr_matrix, nodes: np.ndarray):
+        # The islands of a group are concatenated, so its nodes are only in the order of the matrix when the group
+        # holds every node in order
+        if np.array_equal(nodes, np.arange(self.number_nodes)):
+            group_matrix = bus_admittance_matrix
+        else:
+            group_matrix = bus_admittance_matrix[nodes][:, nodes]
+
+        self._node_groups[nodes] = len(self._groups)
+        self._node_positions[nodes] = np.arange(len(nodes))
+        self._groups.append((nodes, BusAdmittanceFactorization(group_matrix, np.arange(-1, len(nodes)))))
+
+    def factors(self) -> dict:
+        """
+        Returns the node sets of the islands and the factors of each group as arrays (see from_factors), the factors of
+        the group g under the keys prefixed with 'group<g>_'.
+        """
+        group_nodes = [nodes for nodes, _ in self._groups]
+        factors = {'floating_nodes': self._floating_nodes, 'single_nodes': self._single_nodes,
+                   'single_impedances': self._single_impedances, 'node_groups': self._node_groups,
+                   'node_positions': self._node_positions,
+                   'group_nodes': np.concatenate(group_nodes + [np.zeros(0, dtype=np.int64)]),
+                   'group_pointers': np.concatenate(([0], np.cumsum([len(nodes) for nodes in group_nodes],
+                                                                    dtype=np.int64)))}
+        for group, (_, factorization) in enumerate(self._groups):
+            factors.update({f'group{group}_{name}': array for name, array in factorization.factors().items()})
+
+        return factors
+
+    @classmethod
+    def from_factors(cls, factors: dict, bus_index: np.ndarray, topology):
+        """
+        Rebuilds the factorization from the arrays returned by factors, without factorizing again.
+
+        Args:
+            factors (dict): The arrays returned by IslandedFactorization.factors, e.g. views of shared memory.
+            bus_index (np.ndarray): Maps a bus id to its row in the bus admittance matrix (-1 for the reference).
+            topology (SequenceTopology): The islands of the sequence network.
+        """
+        factorization = cls.__new__(cls)
+        factorization.bus_index = bus_index
+        factorization.number_nodes = len(factors['node_groups'])
+        factorization.topology = topology
+
+        factorization._lu = None
+        factorization._impedance_diagonal = None
+
+        factorization._island_nodes = topology.island_nodes()
+        factorization._floating_nodes = factors['floating_nodes']
+        factorization._single_nodes = factors['single_nodes']
+        factorization._single_impedances = factors['single_impedances']
+        factorization._node_groups = factors['node_groups']
+        factorization._node_positions = factors['node_positions']
+
+        group_nodes, group_pointers = factors['group_nodes'], factors['group_pointers']
+        factorization._groups = []
+        for group in range(len(group_pointers) - 1):
+            nodes = group_nodes[group_pointers[group]:group_pointers[group + 1]]
+            prefix = f'group{group}_'
+            group_factors = {name[len(prefix):]: array for name, array in factors.items() if name.startswith(prefix)}
+            factorization._groups.append((nodes, TriangularFactorization(group_factors, np.arange(-1, len(nodes)))))
+
+        return factorization
+
+    def solve(self, currents: np.ndarray) -> np.ndarray:
+        """
+        Solves Ybus * v = i island by island, for node currents given as a vector or as a matrix with one case per
+        column.
+        """
+        currents = np.asarray(currents, dtype=complex)
+        voltages = np.empty_like(currents)
+
+        voltages[self._floating_nodes] = self._floating_voltages(currents)
+        voltages[self._single_nodes] = currents[self._single_nodes] * \
+            self._single_impedances.reshape((-1,) + (1,) * (currents.ndim - 1))
+
+        for nodes, factorization in self._groups:
+            voltages[nodes] = factorization.solve(currents[nodes])
+
+        return voltages
+
+    def _floating_voltages(self, currents: np.ndarray) -> np.ndarray:
+        # Infinite in the ungrounded islands with a net injection, 0 in the ones whose injections cancel out
+        island_labels = self.topology.island_labels[self._floating_nodes]
+        net_currents = np.zeros((self.topology.number_islands,) + currents.shape[1:], dtype=complex)
+        np.add.at(net_currents, island_labels, currents[self._floating_nodes])
+
+        return np.where(net_currents[island_labels] == 0, 0, np.inf)
+
+    def _node_column(self, node: int) -> np.ndarray:
+        column = np.zeros(self.number_nodes, dtype=complex)
+
+        island = self.topology.island_labels[node]
+        group = self._node_groups[node]
+        if not self.topology.grounded[island]:
+            column[self._island_nodes[island]] = np.inf
+        elif group >= 0:
+            nodes, factorization = self._groups[group]
+            column[nodes] = factorization._node_column(self._node_positions[node])
+        else:
+            column[node] = self._single_impedances[np.searchsorted(self._single_nodes, node)]
+
+        return column
+
+    def _node_diagonal(self) -> np.ndarray:
+        if self._impedance_diagonal is None:
+            diagonal = np.empty(self.number_nodes, dtype=complex)
+
+            diagonal[self._floating_nodes] = np.inf
+            diagonal[self._single_nodes] = self._single_impedances
+            for nodes, factorization in self._groups:
+                diagonal[nodes] = factorization._node_diagonal()
+
+            self._impedance_diagonal = diagonal
+
+        return self._impedance_diagonal
+
+
+def sparse_inverse_diagonal(lower: sparse.spmatrix, diagonal_u: np.ndarray):
+    """
+    Computes the diagonal of the inverse of a symmetric matrix from its factors L * D * Lt (Takahashi equations).
+
+    Only the entries of the inverse on the sparsity pattern of L are computed, going from the last column to the first:
+
+        Z[R, j] = -Z[R, R] * L[R, j]
+        Z[j, j] = 1 / D[j] - L[R, j]t * Z[R, j]
+
+    where R are the rows below the diagonal of the column j of L. Since the pattern of L is closed under elimination,
+    all entries of Z[R, R] were computed in previous columns.
+
+    Args:
+        lower (sparse.spmatrix): The unit lower triangular factor L.
+        diagonal_u (np.ndarray): The diagonal of the upper factor, D.
+
+    Returns:
+        np.ndarray: The diagonal of the inverse, or None if the pattern of L isn't closed (e.g. numerical cancellation
+            removed entries), in which case the caller must fall back to column solves.
+    """
+    lower = sparse.csc_matrix(lower)
+    lower.sort_indices()
+
+    number_nodes = lower.shape[0]
+    inverse_diagonal = np.empty(number_nodes, dtype=complex)
+
+    # Entries of the inverse below the diagonal, stored with the same layout as the columns of L
+    inverse_rows = [None] * number_nodes
+    inverse_values = [None] * number_nodes
+
+    for j in range(number_nodes - 1, -1, -1):
+        start, end = lower.indptr[j], lower.indptr[j + 1]
+        rows = lower.indices[start:end]
+        values = lower.data[start:end]
+
+        below = rows > j
+        rows, values = rows[below], values[below]
+
+        if len(rows) == 0:
+            inverse_rows[j], inverse_values[j] = rows, np.zeros(0, dtype=complex)
+            inverse_diagonal[j] = 1 / diagonal_u[j]
+            continue
+
+        inverse_block = np.empty((len(rows), len(rows)), dtype=complex)
+        for a, column in enumerate(rows):
+            inverse_block[a, a] = inverse_diagonal[column]
+
+            lower_rows = rows[a + 1:]
+            if len(lower_rows) == 0:
+                continue
+
+            positions = np.searchsorted(inverse_rows[column], lower_rows)
+            if (positions >= len(inverse_rows[column])).any() or \
+                    (inverse_rows[column][positions] != lower_rows).any():
+                return None
+
+            inverse_block[a + 1:, a] = inverse_values[column][positions]
+            inverse_block[a, a + 1:] = inverse_values[column][positions]
+
+        inverse_column = -inverse_block @ values
+
+        inverse_rows[j], inverse_values[j] = rows, inverse_column
+        inverse_diagonal[j] = 1 / diagonal_u[j] - values @ inverse_column
+
+    return inverse_diagonal
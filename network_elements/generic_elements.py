@@ -1,18 +1,47 @@
-from electrical_values import VoltageVariable, CurrentVariable, PuBase, PuBaseManager, ImmittanceConstant
+from electrical_values import (VoltageVariable, CurrentVariable, PuBase, PuBaseManager, ImmittanceConstant, VIVariable,
+                               VIResultStore)
 from abc import ABC, abstractmethod
 from electrical_relations import calculate_central_v_star, calculate_current, delta2star
-from passive_elements.base_elements import PassiveElement3Terminals
+from passive_elements.base_elements import PassiveElement3Terminals, calculate_passive_elements_currents_pu
+from passive_elements.generic_elements import BusCoupler
+from passive_elements.line_elements import TransmissionLinePiModel
+from passive_elements.transformer_elements import (Transformer3Windings,
+                                                   calculate_transformers_3windings_currents_pos_fault_pu)
+from network_elements.matrix_assembly import (SEQUENCES, collect_branches, branches_admittances, branches_incidences,
+                                              merge_ideal_branches, stamp_bus_admittance_matrix)
+from network_elements.factorization import IslandedFactorization
+from network_elements.topology import SequenceTopology
+from network_elements.simplification import merge_parallel_elements
+from network_elements.reduction import kron_reduce
+from network_elements.equivalents import NetworkEquivalentsTable
+from network_elements.contingency import ContingencyAnalysis
+from network_elements.study_executor import StudyExecutor
+from network_elements.load_flow import (LoadFlowResult, LoadFlowModel, FastDecoupledSolver, passive_branches,
+                                        newton_raphson)
+from active_elements.base_elements import ActiveElement1Terminal, ActiveCompositeElement
+from base_elements import CompositeElement
+from active_elements.vsource_elements import MultiPortEquivalent
+from network_elements.short_circuit import FAULT_TYPES, sweep_faults, sweep_fault_impedances
+from network_elements.branch_currents import ElementCurrentsMap, calculate_fault_element_currents
+from network_elements.base_assignment import base_propagation_edges, propagate_voltage_bases
+from math import sqrt
+import numpy as np
 
 
 class Bus:
 
-    def __init__(self, id_bus: int):
+    # A network has one bus per bus id, the slots keep them small
+    __slots__ = ('id_bus', 'base_bus', 'v_bus')
+
+    def __init__(self, id_bus: int, result_store: VIResultStore = None, pu_base_manager: PuBaseManager = None):
         self.id_bus = id_bus
 
-        default_base: PuBase = PuBase.default()
-        self.base_bus = PuBaseManager.create_pu_base(default_base.v_base, default_base.s_base, id_bus)
+        if pu_base_manager is None:
+            pu_base_manager = PuBaseManager.active()
+
+        self.base_bus = pu_base_manager.get_pu_base(PuBase.DEFAULT_V_BASE, PuBase.DEFAULT_S_BASE, id_bus)
 
-        self.v_bus = VoltageVariable(self.base_bus)
+        self.v_bus = VoltageVariable(self.base_bus, result_store)
 
     def define_voltages_pre_fault_pu(self, voltage_bus_pu: complex):
         self.v_bus.define_value_pre_fault_pu(voltage_bus_pu)
@@ -24,10 +53,34 @@ class Bus:
 
 class Network:
 
-    def __init__(self, number_buses: int, s_base: complex, id_bus_reference: int, v_base_bus_reference: complex):
-        ground_bus = Bus(0)
+    def __init__(self, number_buses: int, s_base: float, id_bus_reference: int, v_base_bus_reference: float):
+        self.s_base = s_base
+        self.id_bus_reference = id_bus_reference
+        self.v_base_bus_reference = v_base_bus_reference
+
+        # The values of every voltage and current of the network are held by one store, sized for the bus voltages
+        # and grown by the elements
+        self.result_store = VIResultStore(capacity=number_buses + 1)
+
+        # The bases of the study belong to the network, the elements created inside 'with network:' get their bases
+        # from it and their variables are allocated in its store
+        self.pu_base_manager = PuBaseManager(self.result_store)
+
+        ground_bus = Bus(0, self.result_store, self.pu_base_manager)
 
-        self.buses = [ground_bus] + [Bus(i) for i in range(1, number_buses + 1)]
+        self.buses = [ground_bus] + [Bus(i, self.result_store, self.pu_base_manager)
+                                     for i in range(1, number_buses + 1)]
+        self.number_buses = number_buses
+
+        # Slots of the bus voltages in the result store, the row i is the bus i + 1
+        self.bus_voltage_slots = np.array([bus.v_bus.slot for bus in self.buses[1:]], dtype=np.int64)
+
+        # Maps a bus id to its row/column in the bus matrices, the ground bus is the reference and has no row
+        self.bus_index = np.arange(-1, number_buses)
+        # The same map for each sequence network after merging the buses joined by ideal branches, and the dimension of
+        # its bus matrices
+        self.sequence_bus_index = None
+        self.sequence_number_nodes = None
 
         self.element_node_incidence_matrix = None
         self.bus_incidence_matrix = None
@@ -38,26 +91,786 @@ class Network:
         self.bus_admittance_matrix = None
         self.bus_impedance_matrix = None
 
+        # Connectivity and islands of each sequence network, defined with the bus admittance matrices
+        self.topology_index = None
+
+        # The network of the load flow and the pre-fault variables it writes, built once per topology
+        self._load_flow_model = None
+        self._fast_decoupled_solver = None
+        self._terminal_voltage_slots = None
+        self._terminal_voltage_buses = None
+        self._sources_list = None
+        self._active_composites_list = None
+
+        # The maps from the bus voltages to the currents of the elements and the slots of those currents, built once
+        # per topology
+        self._element_currents_maps = None
+        self._element_current_slots = None
+
         self.vector_impressed_bus_currents = None
         self.vector_bus_voltages = None
 
         self.elements = []
         self.simplified_elements = []
+        # Columnar tables of elements (see ElementTable), their branches follow the ones of the elements
+        self.element_tables = []
+
+        # Per-unit bases of each bus, indexed by bus id, defined by assign_bases
+        self.v_bases = None
+        self.z_bases = None
+        self.i_bases = None
+
+    def __enter__(self):
+        self.pu_base_manager.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.pu_base_manager.__exit__(exc_type, exc_value, traceback)
 
     def add_elements(self, elements: list):
-        self.elements.append(elements)
+        self.elements.extend(elements)
+        self._element_currents_maps = None
+
+        for element in elements:
+            self._bind_element(element)
+
+    def add_element_tables(self, tables: list):
+        """
+        Adds columnar tables of elements (LineTable, TransformerTable, ShuntTable), which feed their branches to the bus
+        matrices and their rows to the element currents as arrays, without one object per element.
+        """
+        self.element_tables.extend(tables)
+        self._element_currents_maps = None
+
+    def element_table_rows(self, table) -> slice:
+        """
+        Returns the rows of the given table in the element currents (see calculate_element_currents_pos_fault_pu), which
+        follow the rows of self.elements.
+        """
+        first_row = len(self.elements)
+        for element_table in self.element_tables:
+            if element_table is table:
+                return slice(first_row, first_row + len(table))
+            first_row += len(element_table)
+
+        raise ValueError('The table is not in the network')
+
+    def _network_base(self, pu_base: PuBase) -> PuBase:
+        return self.pu_base_manager.get_pu_base(pu_base.v_base, pu_base.s_base, pu_base.id_bus)
+
+    def _bind_element(self, element):
+        # Moves the voltages and currents of the element (and of the elements of a composite) into the network store.
+        # An element created outside 'with network:' has the bases of another manager, its bases, branches and
+        # variables are moved to the bases of the network of the same buses
+        for name, attribute in vars(element).items():
+            if isinstance(attribute, VIVariable):
+                self.result_store.adopt(attribute)
+                network_base = self._network_base(attribute.pu_base)
+                if attribute.pu_base is not network_base:
+                    attribute.change_base(network_base)
+            elif isinstance(attribute, PuBase):
+                setattr(element, name, self._network_base(attribute))
+            else:
+                immittances = attribute if isinstance(attribute, list) else [attribute]
+                for immittance in immittances:
+                    if isinstance(immittance, ImmittanceConstant):
+                        network_base = self._network_base(immittance.base_m)
+                        if immittance.base_m is not network_base:
+                            immittance.change_base(network_base)
+
+        for sub_element in getattr(element, 'elements', []):
+            self._bind_element(sub_element)
+
+    def release_pu_bases(self):
+        """
+        Releases all per-unit bases of the study, so long-lived processes don't accumulate bases between studies.
+        """
+        self.pu_base_manager.release()
 
     def simplify_elements(self, elements: list):
-        pass
+        """
+        Merges the elements in parallel (e.g. parallel cables and transformer banks) into composite elements, so each
+        group adds one set of branches to the bus admittance matrices.
+
+        The composites pass the voltages of their buses to the original elements and sum the currents the original
+        elements calculate, so the currents are still available element by element.
+
+        Returns:
+            list: The simplified elements.
+        """
+        with self.pu_base_manager:
+            simplified_elements = merge_parallel_elements(elements)
+
+        for element in simplified_elements:
+            self._bind_element(element)
+
+        return simplified_elements
 
     def find_primitives_matrices(self, simplified_elements: list):
-        pass
+        """
+        Finds the primitive admittances of every sequence network.
+
+        The primitive admittance matrix is diagonal, so only its diagonal is kept: one complex vector per sequence with
+        the admittance of each branch returned by the elements' admittance_representation, followed by the admittances
+        of the element tables in the bases of their buses.
+        """
+        if self.element_tables and self.z_bases is None:
+            self.assign_bases(simplified_elements)
+
+        self.primitive_admittance_matrix = {}
+        for seq in SEQUENCES:
+            branches = collect_branches(simplified_elements, seq)
+            self.primitive_admittance_matrix[seq] = np.concatenate(
+                [branches_admittances(branches)] + [table.admittances_pu(seq, self.z_bases)
+                                                    for table in self.element_tables])
+
+        return self.primitive_admittance_matrix
 
     def find_incidences_matrices(self, simplified_elements: list):
-        pass
+        """
+        Finds the element-node incidences of every sequence network.
+
+        The incidence is kept as the pair of vectors (id_buses_m, id_buses_n) with the terminals of each branch, in the
+        same order as the primitive admittances. The dense element-node incidence matrix is never formed.
+        """
+        self.element_node_incidence_matrix = {}
+        for seq in SEQUENCES:
+            branches = collect_branches(simplified_elements, seq)
+            incidences = [branches_incidences(branches)] + [table.branch_terminals(seq) for table in self.element_tables]
+            self.element_node_incidence_matrix[seq] = (np.concatenate([id_buses_m for id_buses_m, _ in incidences]),
+                                                       np.concatenate([id_buses_n for _, id_buses_n in incidences]))
+
+        return self.element_node_incidence_matrix
+
+    def calculate_buses_matrices(self, element_node_incidence_matrix: dict, primitive_admittance_matrix: dict):
+        """
+        Calculates the sparse (CSR) bus admittance matrix of every sequence network by stamping the branches, and the
+        topology index with the islands of each sequence network.
+
+        The buses joined by ideal branches are merged into one node first (see merge_ideal_branches), so the matrices
+        of a sequence have one row per node of sequence_bus_index. The results are mapped back to every bus.
+
+        Args:
+            element_node_incidence_matrix (dict): The branch terminals of each sequence, see find_incidences_matrices.
+            primitive_admittance_matrix (dict): The branch admittances of each sequence, see find_primitives_matrices.
+        """
+        self.bus_admittance_matrix = {}
+        self.topology_index = {}
+        self.sequence_bus_index = {}
+        self.sequence_number_nodes = {}
+        # The factorizations and load flow model of the previous matrices are no longer valid
+        self.bus_impedance_matrix = None
+        self._load_flow_model = None
+        self._fast_decoupled_solver = None
+        self._element_currents_maps = None
+
+        for seq in SEQUENCES:
+            id_buses_m, id_buses_n = element_node_incidence_matrix[seq]
+            y_pu = primitive_admittance_matrix[seq]
+
+            bus_index, number_nodes = merge_ideal_branches(id_buses_m, id_buses_n, y_pu, self.number_buses)
+            self.sequence_bus_index[seq] = bus_index
+            self.sequence_number_nodes[seq] = number_nodes
+
+            self.bus_admittance_matrix[seq] = stamp_bus_admittance_matrix(id_buses_m, id_buses_n, y_pu, bus_index,
+                                                                          number_nodes)
+            self.topology_index[seq] = SequenceTopology(id_buses_m, id_buses_n, y_pu, bus_index, number_nodes)
+
+        return self.bus_admittance_matrix
+
+    def build_bus_admittance_matrices(self):
+        """
+        Runs the assembly pipeline over the elements of the network and returns the bus admittance matrices.
+        """
+        self.simplified_elements = self.simplify_elements(self.elements)
+        # Every variable of the study exists by now, so the store drops the capacity it won't use
+        self.result_store.trim()
+        self.assign_bases(self.simplified_elements)
+
+        primitive_admittance_matrix = self.find_primitives_matrices(self.simplified_elements)
+        element_node_incidence_matrix = self.find_incidences_matrices(self.simplified_elements)
+
+        return self.calculate_buses_matrices(element_node_incidence_matrix, primitive_admittance_matrix)
+
+    def factorize_bus_admittance_matrices(self):
+        """
+        Factorizes the bus admittance matrix of every sequence network, building the matrices when needed.
+
+        The bus impedance matrix of each sequence is kept as its factorization, which is computed once and serves
+        Zbus columns, entries and Thevenin impedances on demand. Each island of a sequence network is factorized on its
+        own, the buses of islands without a path to the ground (e.g. behind delta windings in seq0) get infinite
+        Thevenin impedances.
+        """
+        if self.bus_admittance_matrix is None:
+            self.build_bus_admittance_matrices()
+
+        if self.bus_impedance_matrix is None:
+            self.bus_impedance_matrix = {seq: IslandedFactorization(self.bus_admittance_matrix[seq],
+                                                                    self.sequence_bus_index[seq],
+                                                                    self.topology_index[seq])
+                                         for seq in SEQUENCES}
+
+        return self.bus_impedance_matrix
+
+    def bus_islands(self, seq: str):
+        """
+        Returns the island of every bus in the given sequence network, indexed by bus id (-1 for the ground).
+        """
+        if self.topology_index is None:
+            self.build_bus_admittance_matrices()
+
+        return self.topology_index[seq].bus_islands(self.sequence_bus_index[seq])
+
+    def bus_impedance_column(self, seq: str, id_bus: int):
+        """
+        Returns the column of the bus impedance matrix of the given sequence and bus, indexed by bus id.
+        """
+        return self.factorize_bus_admittance_matrices()[seq].impedance_column(id_bus)
+
+    def thevenin_impedances(self, id_bus: int):
+        """
+        Returns the seq0, seq1 and seq2 Thevenin impedances of the given bus.
+        """
+        bus_impedance_matrix = self.factorize_bus_admittance_matrices()
+
+        return tuple(bus_impedance_matrix[seq].thevenin_impedance(id_bus) for seq in SEQUENCES)
+
+    def calculate_thevenin_impedances(self):
+        """
+        Calculates the seq0, seq1 and seq2 Thevenin impedances of every bus from the diagonal of each Zbus.
+
+        Returns:
+            np.ndarray: A complex array of shape (number_buses, 3), the row i holds the impedances of the bus i + 1.
+        """
+        bus_impedance_matrix = self.factorize_bus_admittance_matrices()
+
+        return np.column_stack([bus_impedance_matrix[seq].impedance_diagonal()[1:] for seq in SEQUENCES])
+
+    def pre_fault_voltages(self):
+        """
+        Returns the pre-fault voltages in pu of the buses 1 to number_buses, buses without a defined pre-fault voltage
+        are taken at 1 pu (flat start).
+        """
+        v_pre_fault = self.result_store.values[self.bus_voltage_slots, VIResultStore.PRE_FAULT]
+        defined = self.result_store.defined[self.bus_voltage_slots, VIResultStore.PRE_FAULT]
+
+        return np.where(defined, v_pre_fault, 1)
+
+    def define_bus_voltages_pre_fault_pu(self, voltages_pu):
+        """
+        Defines the pre-fault voltages of the buses 1 to number_buses in one operation.
+        """
+        self.result_store.write(self.bus_voltage_slots, VIResultStore.PRE_FAULT, voltages_pu)
+
+    def define_bus_voltages_pos_fault_pu(self, voltages_seq_pu):
+        """
+        Defines the seq0, seq1 and seq2 post-fault voltages of the buses 1 to number_buses in one operation.
+
+        Args:
+            voltages_seq_pu: An array of shape (number_buses, 3), the row i holds the voltages of the bus i + 1.
+        """
+        self.result_store.write(self.bus_voltage_slots, slice(VIResultStore.POS_FAULT_SEQ0, None), voltages_seq_pu)
+
+    def bus_voltages_pos_fault_pu(self):
+        """
+        Returns the seq0, seq1 and seq2 post-fault voltages of the buses 1 to number_buses, shape (number_buses, 3), NaN
+        where they aren't defined.
+        """
+        v_pos_fault = self.result_store.values[self.bus_voltage_slots, VIResultStore.POS_FAULT_SEQ0:]
+        defined = self.result_store.defined[self.bus_voltage_slots, VIResultStore.POS_FAULT_SEQ0:]
+
+        return np.where(defined, v_pos_fault, np.nan)
+
+    def _terminal_voltages(self, elements: list):
+        # The pre-fault voltage variables of the terminals of the elements (and of the elements of composites)
+        for element in elements:
+            for v_bus, id_bus in (('v_bus_m', 'id_bus_m'), ('v_bus_n', 'id_bus_n'), ('v_bus_p', 'id_bus_p')):
+                if hasattr(element, v_bus):
+                    yield getattr(element, v_bus), getattr(element, id_bus)
+
+            yield from self._terminal_voltages(getattr(element, 'elements', []))
+
+    def _sources(self, elements: list):
+        # The sources of the network, the elements of active composites included
+        for element in elements:
+            if isinstance(element, ActiveElement1Terminal):
+                yield element
+            else:
+                yield from self._sources(getattr(element, 'elements', []))
+
+    def _active_composites(self, elements: list):
+        # The active composites of the network, the inner ones before the composites holding them
+        for element in elements:
+            if isinstance(element, ActiveCompositeElement):
+                yield from self._active_composites(element.elements)
+                yield element
+
+    def _leaf_elements(self, elements: list):
+        # The elements of the network that aren't composites, the elements of composites included
+        for element in elements:
+            if isinstance(element, CompositeElement):
+                yield from self._leaf_elements(element.elements)
+            else:
+                yield element
+
+    def _composites(self, elements: list):
+        # The composites of the network, the inner ones before the composites holding them
+        for element in elements:
+            if isinstance(element, CompositeElement):
+                yield from self._composites(element.elements)
+                yield element
+
+    def load_flow_model(self):
+        """
+        Returns the LoadFlowModel of the network, built once per topology with the pre-fault variables the load flow
+        writes into.
+        """
+        if self.bus_admittance_matrix is None:
+            self.build_bus_admittance_matrices()
+
+        if self._load_flow_model is None:
+            branches = passive_branches(self.simplified_elements, 'seq1')
+            id_buses_m, id_buses_n = branches_incidences(branches)
+            y_pu = branches_admittances(branches)
+            for table in self.element_tables:
+                table_id_buses_m, table_id_buses_n = table.branch_terminals('seq1')
+                id_buses_m = np.concatenate((id_buses_m, table_id_buses_m))
+                id_buses_n = np.concatenate((id_buses_n, table_id_buses_n))
+                y_pu = np.concatenate((y_pu, table.admittances_pu('seq1', self.z_bases)))
+
+            self._load_flow_model = LoadFlowModel(id_buses_m, id_buses_n, y_pu, self.number_buses,
+                                                  self.id_bus_reference)
+            self._fast_decoupled_solver = None
+
+            terminal_voltages = list(self._terminal_voltages(self.simplified_elements))
+            self._terminal_voltage_slots = np.array([v_bus.slot for v_bus, _ in terminal_voltages], dtype=np.int64)
+            self._terminal_voltage_buses = np.array([id_bus for _, id_bus in terminal_voltages], dtype=np.int64)
+            self._sources_list = list(self._sources(self.simplified_elements))
+            self._active_composites_list = list(self._active_composites(self.simplified_elements))
+
+        return self._load_flow_model
+
+    def calculate_load_flow(self, s_load_pu=None, s_generation_pu=None, pv_buses=(), v_set_pu=None,
+                            v_slack_pu: complex = 1, tolerance: float = 1e-8, max_iterations: int = None,
+                            method: str = 'newton'):
+        """
+        Calculates the pre-fault state of the network with a sparse load flow.
+
+        The load flow runs on the positive sequence bus admittance matrix without the sources: the reference bus is the
+        slack bus, the pv_buses have specified active power and voltage magnitude and every other bus has specified
+        active and reactive power. When the load flow converges, the voltages of the buses and of the terminals of
+        every element are written into the result store in bulk, and the internal voltage of each source follows from
+        the power it supplies (calculate_internal_voltage), the sources of a bus sharing its generation in proportion to
+        their admittances (the active composites then take the Norton equivalent of their sources). Only the island of
+        the slack bus is solved: the buses of the other islands get NaN in the result and undefined pre-fault voltages,
+        and their sources keep their internal voltages.
+
+        The 'newton' method is the Newton-Raphson method with a sparse Jacobian. The 'fast_decoupled' method factorizes
+        its constant matrices B' and B'' once per topology and reuses them in every iteration and every later call, so
+        many operating points of the same network (e.g. the hours of a year) cost two triangular solves per iteration.
+
+        Args:
+            s_load_pu: The complex power of the loads of the buses 1 to number_buses in pu.
+            s_generation_pu: The complex power generated at the buses 1 to number_buses in pu, only the active power is
+                used at the PV buses and nothing at the slack bus.
+            pv_buses: The ids of the PV buses.
+            v_set_pu: The voltage magnitudes of the PV buses in pu, 1 pu when not given.
+            v_slack_pu (complex): The voltage of the slack bus in pu.
+            tolerance (float): The largest power mismatch in pu accepted.
+            max_iterations (int): The number of iterations after which the load flow stops, 20 for 'newton' and 100 for
+                'fast_decoupled' when not given.
+            method (str): 'newton' or 'fast_decoupled'.
 
-    def calculate_buses_matrices(self, bus_incidence_matrix, primitive_admittance_matrix):
-        pass
+        Returns:
+            LoadFlowResult: The voltages and power injections of the buses, indexed by bus id. The network isn't changed
+                when the load flow doesn't converge.
+        """
+        model = self.load_flow_model()
+
+        number_ids = self.number_buses + 1
+        s_load_buses = np.zeros(number_ids, dtype=complex)
+        s_specified_buses = np.zeros(number_ids, dtype=complex)
+        if s_load_pu is not None:
+            s_load_buses[1:] = s_load_pu
+        if s_generation_pu is not None:
+            s_specified_buses[1:] = s_generation_pu
+        s_specified_buses -= s_load_buses
+
+        pv_buses = np.asarray(pv_buses, dtype=np.int64)
+        v_set_pu = np.ones(len(pv_buses)) if v_set_pu is None else v_set_pu
+        pv_nodes, pq_nodes = model.node_types(pv_buses)
+        v_initial = model.initial_voltages(pv_buses, v_set_pu, v_slack_pu)
+        s_specified = model.node_values(s_specified_buses)
+
+        if method == 'newton':
+            v_nodes, iterations, converged, mismatch = newton_raphson(model.bus_admittance_matrix, s_specified,
+                                                                      v_initial, pv_nodes, pq_nodes, tolerance,
+                                                                      max_iterations or 20)
+        elif method == 'fast_decoupled':
+            if self._fast_decoupled_solver is None:
+                self._fast_decoupled_solver = FastDecoupledSolver(model)
+
+            v_nodes, iterations, converged, mismatch = self._fast_decoupled_solver.solve(s_specified, v_initial,
+                                                                                         pv_nodes, pq_nodes, tolerance,
+                                                                                         max_iterations or 100)
+        else:
+            raise ValueError(f"Unknown load flow method '{method}', expected 'newton' or 'fast_decoupled'")
+
+        v_nodes = np.where(model.in_slack_island, v_nodes, np.nan)
+        s_nodes = v_nodes * np.conj(model.bus_admittance_matrix @ np.where(model.in_slack_island, v_nodes, 0))
+
+        v_buses = model.bus_values(v_nodes)
+        result = LoadFlowResult(v_buses, model.bus_values(s_nodes), iterations, converged, mismatch)
+        if not converged:
+            return result
+
+        # The buses of the other islands have no solution, their pre-fault voltages are left undefined rather than NaN
+        solved_buses = model.solved_buses()
+        self.result_store.write(self.bus_voltage_slots, VIResultStore.PRE_FAULT, v_buses[1:], solved_buses[1:])
+        self.result_store.write(self._terminal_voltage_slots, VIResultStore.PRE_FAULT,
+                                v_buses[self._terminal_voltage_buses], solved_buses[self._terminal_voltage_buses])
+
+        # The generation of each node is its injection plus its loads, and its current is shared by the sources of the
+        # node in proportion to their admittances, which gives them all the same internal voltage. The sources merged
+        # with the ground (node -1) or outside the island of the slack bus keep their internal voltages
+        source_nodes = model.bus_index[np.array([source.id_bus_m for source in self._sources_list], dtype=np.int64)]
+        solved_sources = source_nodes >= 0
+        solved_sources[solved_sources] = model.in_slack_island[source_nodes[solved_sources]]
+
+        sources = [source for source, solved in zip(self._sources_list, solved_sources) if solved]
+        source_nodes = source_nodes[solved_sources]
+        source_admittances = np.array([source.branches_seq1[0].y_pu for source in sources], dtype=complex)
+
+        y_sources_nodes = np.zeros(model.number_nodes, dtype=complex)
+        np.add.at(y_sources_nodes, source_nodes, source_admittances)
+
+        # NaN at the nodes outside the island of the slack bus, which no source uses
+        with np.errstate(invalid='ignore', divide='ignore'):
+            i_generation_nodes = np.conj((s_nodes + model.node_values(s_load_buses)) / v_nodes)
+        for source, node, y_source_pu in zip(sources, source_nodes, source_admittances):
+            source.calculate_internal_voltage(i_generation_nodes[node] * y_source_pu / y_sources_nodes[node])
+        # The active composites take the Norton equivalent of their sources
+        for composite in self._active_composites_list:
+            composite.calculate_internal_voltage()
+
+        return result
+
+    def calculate_short_circuit_sweep(self, z_fault_pu: complex = 0, fault_types=FAULT_TYPES):
+        """
+        Calculates the 3ph, SLG, LL and LLG faults at every bus in one vectorized pass.
+
+        The Thevenin impedances come from the diagonal of each Zbus and the pre-fault voltages from the buses, so no
+        element or bus object is visited per fault.
+
+        Args:
+            z_fault_pu (complex): The fault impedance in pu.
+            fault_types: The fault types to calculate.
+
+        Returns:
+            FaultSweepResult: For each fault type, the sequence fault currents and the post-fault sequence voltages at
+                the faulted bus, complex arrays of shape (number_buses, 3) where the row i is the fault at bus i + 1.
+        """
+        z_thevenin = self.calculate_thevenin_impedances()
+        v_pre_fault = self.pre_fault_voltages()
+
+        return sweep_faults(z_thevenin, v_pre_fault, z_fault_pu, fault_types)
+
+    def fault_impedances_pu(self, z_fault_ohm):
+        """
+        Converts fault impedances in ohm into pu of the impedance base of every bus.
+
+        Args:
+            z_fault_ohm: The fault impedances in ohm, shape (n_zf,).
+
+        Returns:
+            np.ndarray: The fault impedances in pu, shape (number_buses, n_zf), the row i is the bus i + 1.
+        """
+        if self.z_bases is None:
+            self.build_bus_admittance_matrices()
+
+        return np.asarray(z_fault_ohm, dtype=complex)[np.newaxis, :] / self.z_bases[1:, np.newaxis]
+
+    def calculate_fault_impedance_sweep(self, z_fault_pu, fault_types=FAULT_TYPES):
+        """
+        Calculates the 3ph, SLG, LL and LLG faults at every bus for a range of fault impedances in one vectorized pass,
+        e.g. the fault resistances from 0 to 100 ohm of the SLG faults of a relay setting study (see
+        fault_impedances_pu).
+
+        The Thevenin impedances and pre-fault voltages are found once and broadcast over the fault impedances, so
+        nothing is solved again per fault impedance.
+
+        Args:
+            z_fault_pu: The fault impedances in pu, shape (n_zf,) for the same impedances at every bus or
+                (number_buses, n_zf) for impedances per bus.
+            fault_types: The fault types to calculate.
+
+        Returns:
+            FaultSweepResult: For each fault type, the sequence fault currents and the post-fault sequence voltages at
+                the faulted bus, complex arrays of shape (number_buses, n_zf, 3) where [i, k] is the fault at bus i + 1
+                through the fault impedance k.
+        """
+        z_thevenin = self.calculate_thevenin_impedances()
+        v_pre_fault = self.pre_fault_voltages()
+
+        return sweep_fault_impedances(z_thevenin, v_pre_fault, z_fault_pu, fault_types)
+
+    def calculate_contingency_sweep(self, outages: list, z_fault_pu: complex = 0, fault_types=FAULT_TYPES,
+                                    max_workers: int = None):
+        """
+        Calculates the 3ph, SLG, LL and LLG faults at every bus for every outage of a contingency list (e.g. N-1).
+
+        The bus impedances of each outage come from low-rank updates of the factorizations of the base case, see
+        ContingencyAnalysis, so the bus admittance matrices aren't built or factorized again per outage.
+
+        Args:
+            outages (list): The contingencies, each one an element or a list of elements out of service together.
+            z_fault_pu (complex): The fault impedance in pu.
+            fault_types: The fault types to calculate.
+            max_workers (int): When given, the outages are solved by a StudyExecutor with that many processes.
+
+        Returns:
+            ContingencySweepResult: For each fault type, the sequence fault currents and post-fault sequence voltages,
+                complex arrays of shape (outages, number_buses, 3), and the outages that island the network.
+        """
+        if max_workers is not None:
+            return StudyExecutor(self, max_workers).calculate_contingency_sweep(outages, z_fault_pu, fault_types)
+
+        return ContingencyAnalysis(self, outages).calculate_short_circuit_sweep(z_fault_pu, fault_types)
+
+    def element_currents_maps(self):
+        """
+        Returns the ElementCurrentsMap of each sequence network over the elements of the network, built once per
+        topology.
+        """
+        if self.bus_admittance_matrix is None:
+            self.build_bus_admittance_matrices()
+
+        if self._element_currents_maps is None:
+            self._element_currents_maps = {seq: ElementCurrentsMap(self.elements, seq, self.number_buses,
+                                                                   self.element_tables, self.z_bases)
+                                           for seq in SEQUENCES}
+            self._element_current_slots = np.array([[getattr(element, name).slot if hasattr(element, name) else -1
+                                                     for name in ('i_mn', 'i_np', 'i_mp',
+                                                                  'i_bus_m', 'i_bus_n', 'i_bus_p')]
+                                                    for element in self.elements], dtype=np.int64).reshape(-1, 6)
+
+        return self._element_currents_maps
+
+    def calculate_element_currents_pos_fault_pu(self, i_injected_seq_pu=None):
+        """
+        Calculates the seq0, seq1 and seq2 post-fault currents of every element from the post-fault bus voltages with a
+        few sparse products per sequence (see ElementCurrentsMap), and writes them into the result store in bulk.
+
+        It gives the currents calculate_internal_currents_pos_fault_pu gives element by element, without visiting the
+        elements.
+
+        The rows of the element tables have no VIVariables, their currents are only returned (see element_table_rows).
+
+        Args:
+            i_injected_seq_pu: The seq0, seq1 and seq2 currents injected into the buses 1 to number_buses, shape
+                (number_buses, 3), e.g. minus the fault current at the faulted bus. The bus couplers carry them (see
+                ElementCurrentsMap.branch_currents); when they aren't given, a fault current at a bus joined by couplers
+                returns through the first bus of the group.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The currents i_mn, i_np and i_mp and the currents i_bus_m, i_bus_n and
+                i_bus_p of each element of self.elements and each row of the element tables, shape (rows, 3, 3), the
+                last axis being the sequence.
+        """
+        maps = self.element_currents_maps()
+        v_buses_pos_fault = self.bus_voltages_pos_fault_pu()
+
+        number_rows = maps['seq1'].number_rows
+        i_branches_pu = np.empty((number_rows, 3, 3), dtype=complex)
+        i_buses_pu = np.empty((number_rows, 3, 3), dtype=complex)
+        for position, seq in enumerate(SEQUENCES):
+            v_buses = np.concatenate(([0], v_buses_pos_fault[:, position]))
+            i_injected = None
+            if i_injected_seq_pu is not None:
+                i_injected = np.concatenate(([0], np.asarray(i_injected_seq_pu)[:, position]))
+            i_branches_pu[..., position], i_buses_pu[..., position] = maps[seq].element_currents(v_buses, i_injected)
+
+        currents = np.concatenate((i_branches_pu, i_buses_pu), axis=1)[:len(self.elements)]
+        defined = self._element_current_slots >= 0
+        self.result_store.write(self._element_current_slots[defined], slice(VIResultStore.POS_FAULT_SEQ0, None),
+                                currents[defined])
+
+        return i_branches_pu, i_buses_pu
+
+    def calculate_internal_currents_pos_fault_pu(self, i_injected_seq_pu=None):
+        """
+        Calculates the post-fault currents of every element of self.elements, and of the elements of composites, from
+        the post-fault bus voltages, as calculate_internal_currents_pos_fault_pu of each element does.
+
+        The post-fault voltages of the terminals of the elements are first defined from those of the buses in one
+        operation. All the TransmissionLinePiModel are then calculated at once, with the star equivalents of
+        calculate_passive_elements_currents_pu, and all the Transformer3Windings at once, with the stacked admittance
+        matrices of calculate_transformers_3windings_currents_pos_fault_pu, while the other elements are calculated
+        one by one. The bus couplers come last, by Kirchhoff's current law at their bus m, and the composites sum the
+        currents of their elements.
+
+        Unlike calculate_element_currents_pos_fault_pu, the currents come from the relations of each type of element
+        (e.g. the star point of a pi model), which suits networks with many pi sections or three winding transformers.
+
+        Args:
+            i_injected_seq_pu: The seq0, seq1 and seq2 currents injected into the buses 1 to number_buses, shape
+                (number_buses, 3), e.g. minus the fault current at the faulted bus, taken by the bus couplers.
+        """
+        # The voltages of the ground (id 0) are null and defined
+        v_buses = np.zeros((self.number_buses + 1, 3), dtype=complex)
+        v_buses_defined = np.ones((self.number_buses + 1, 3), dtype=bool)
+        v_buses[1:] = self.result_store.values[self.bus_voltage_slots, VIResultStore.POS_FAULT_SEQ0:]
+        v_buses_defined[1:] = self.result_store.defined[self.bus_voltage_slots, VIResultStore.POS_FAULT_SEQ0:]
+
+        terminal_voltages = list(self._terminal_voltages(self.elements))
+        terminal_slots = np.array([v_bus.slot for v_bus, _ in terminal_voltages], dtype=np.int64)
+        terminal_buses = np.array([id_bus for _, id_bus in terminal_voltages], dtype=np.int64)
+        self.result_store.write(terminal_slots, slice(VIResultStore.POS_FAULT_SEQ0, None), v_buses[terminal_buses],
+                                v_buses_defined[terminal_buses])
+
+        # The multi-port equivalents have no currents of their own
+        elements = [element for element in self._leaf_elements(self.elements)
+                    if hasattr(element, 'calculate_internal_currents_pos_fault_pu')]
+        pi_models = [element for element in elements if isinstance(element, TransmissionLinePiModel)]
+        transformers = [element for element in elements if isinstance(element, Transformer3Windings)]
+        bus_couplers = [element for element in elements if isinstance(element, BusCoupler)]
+
+        if pi_models:
+            for seq, column in zip(SEQUENCES, (VIResultStore.POS_FAULT_SEQ0, VIResultStore.POS_FAULT_SEQ1,
+                                               VIResultStore.POS_FAULT_SEQ2)):
+                calculate_passive_elements_currents_pu(pi_models, seq, column)
+        if transformers:
+            calculate_transformers_3windings_currents_pos_fault_pu(transformers)
+
+        for element in elements:
+            if not isinstance(element, (TransmissionLinePiModel, Transformer3Windings, BusCoupler)):
+                element.calculate_internal_currents_pos_fault_pu()
+
+        for bus_coupler in bus_couplers:
+            i_injected_pu = (0, 0, 0)
+            if i_injected_seq_pu is not None and bus_coupler.id_bus_m != 0:
+                i_injected_pu = np.asarray(i_injected_seq_pu)[bus_coupler.id_bus_m - 1]
+            bus_coupler.calculate_internal_currents_pos_fault_pu(elements, i_injected_pu)
+
+        for composite in self._composites(self.elements):
+            composite.sum_element_currents_pos_fault_pu()
+
+    def iterate_fault_element_currents(self, fault_type: str, id_fault_buses=None, z_fault_pu: complex = 0,
+                                       batch_size: int = 64):
+        """
+        Calculates the post-fault bus voltages and element currents of a fault at each given bus, e.g. the branch flows
+        of every case of a short-circuit sweep, in batches.
+
+        The voltages of a batch come from the Zbus columns of its faulted buses, found with one solve of the
+        factorizations (V = V_pre - Z[:, k] * I_f), and the currents from the sparse products of ElementCurrentsMap
+        applied to all cases of the batch at once.
+
+        Args:
+            fault_type (str): One of '3ph', 'slg', 'll' or 'llg'.
+            id_fault_buses: The faulted buses, every bus when not given.
+            z_fault_pu (complex): The fault impedance in pu.
+            batch_size (int): The number of faults of each batch, which bounds the memory of the results
+                (batch_size * elements * 18 complex values).
+
+        Yields:
+            FaultCurrentsResult: The voltages and currents of each batch of faults.
+        """
+        if id_fault_buses is None:
+            id_fault_buses = np.arange(1, self.number_buses + 1)
+        id_fault_buses = np.asarray(id_fault_buses, dtype=np.int64)
+
+        maps = self.element_currents_maps()
+        factorizations = self.factorize_bus_admittance_matrices()
+        z_thevenin = self.calculate_thevenin_impedances()
+        v_pre_fault = self.pre_fault_voltages()
+
+        for start in range(0, len(id_fault_buses), batch_size):
+            yield calculate_fault_element_currents(maps, factorizations, z_thevenin, v_pre_fault,
+                                                   id_fault_buses[start:start + batch_size], fault_type, z_fault_pu)
+
+    def calculate_network_equivalents(self):
+        """
+        Calculates the network equivalent of every bus in one vectorized pass: the seq0, seq1 and seq2 Thevenin
+        impedances and the three-phase and single-phase short-circuit capacities.
+
+        Returns:
+            NetworkEquivalentsTable: One row per bus, in pu of the network power base and of the voltage base of each
+                bus, exportable as CSV or as NetworkEquivalent elements.
+        """
+        z_thevenin = self.calculate_thevenin_impedances()
+        id_buses = np.arange(1, self.number_buses + 1)
+
+        return NetworkEquivalentsTable(id_buses, self.v_bases[id_buses] / 1000, self.s_base / 10**6, z_thevenin)
+
+    def kron_reduction(self, boundary_buses):
+        """
+        Reduces the network to an equivalent seen from the boundary buses, eliminating every other bus of each sequence
+        network with a sparse Schur complement.
+
+        The equivalent is in pu of the bases of the boundary buses in this network. It has bases of its own, not the
+        ones of this study: it is saved and then loaded into another study (e.g. a distribution feeder fed from the
+        boundary) inside the scope of that study's Network, so the eliminated grid is never solved again.
+
+        Args:
+            boundary_buses: The ids of the buses kept, they become the ports of the equivalent in the same order.
+
+        Returns:
+            MultiPortEquivalent: The reduced equivalent of the network.
+        """
+        if self.bus_admittance_matrix is None:
+            self.build_bus_admittance_matrices()
+
+        boundary_buses = np.asarray(boundary_buses, dtype=np.int64)
+
+        admittance_matrices = {}
+        for seq in SEQUENCES:
+            boundary_nodes = self.sequence_bus_index[seq][boundary_buses]
+            admittance_matrices[seq] = kron_reduce(self.bus_admittance_matrix[seq], boundary_nodes,
+                                                   self.topology_index[seq].island_labels)
+
+        with PuBaseManager():
+            return MultiPortEquivalent(admittance_matrices, boundary_buses, self.v_bases[boundary_buses] / 1000,
+                                       self.s_base / 10**6)
 
     def assign_bases(self, simplified_elements):
-        pass
+        """
+        Assigns the per-unit bases of every bus by propagating the base of the reference bus through the network.
+
+        The voltage base changes across Transformer2Windings and Transformer3Windings by the ratio of their nominal
+        voltages and the power base is the network's. Buses not connected to the reference keep their voltage base.
+        The bases are written into the per-bus arrays v_bases, z_bases and i_bases; the branch admittances are moved to
+        the new bases through their PuBase (see ImmittanceConstant.admittances_pu) and the values of every result store
+        that holds values in the bases (the network store, but also e.g. the default store of variables created outside
+        'with network:') are rescaled in a single vectorized operation per store.
+        """
+        number_nodes = self.number_buses + 1
+        pu_bases = [self.pu_base_manager.pu_bases.get(id_bus) for id_bus in range(number_nodes)]
+
+        old_v_bases = np.array([self.buses[id_bus].base_bus.v_base if pu_base is None else pu_base.v_base
+                                for id_bus, pu_base in enumerate(pu_bases)], dtype=float)
+        old_i_bases = np.array([self.buses[id_bus].base_bus.i_base if pu_base is None else pu_base.i_base
+                                for id_bus, pu_base in enumerate(pu_bases)], dtype=float)
+
+        edges = [base_propagation_edges(simplified_elements)] + [table.base_propagation_edges()
+                                                                  for table in self.element_tables]
+        id_buses_from, id_buses_to, v_ratios = (np.concatenate(columns) for columns in zip(*edges))
+        v_bases = propagate_voltage_bases(old_v_bases, id_buses_from, id_buses_to, v_ratios, self.id_bus_reference,
+                                          self.v_base_bus_reference)
+        # The ground is the reference of every voltage, its base is the reference one
+        v_bases[0] = self.v_base_bus_reference
+
+        self.v_bases = v_bases
+        self.z_bases = v_bases ** 2 / self.s_base
+        self.i_bases = v_bases / (sqrt(3) * self.z_bases)
+
+        id_buses = np.array([id_bus for id_bus, pu_base in enumerate(pu_bases) if pu_base is not None], dtype=np.int64)
+        pu_bases = [pu_bases[id_bus] for id_bus in id_buses]
+
+        v_base_ratios = old_v_bases[id_buses] / self.v_bases[id_buses]
+        i_base_ratios = old_i_bases[id_buses] / self.i_bases[id_buses]
+        for result_store in list(VIResultStore.instances):
+            result_store.rescale_bases(pu_bases, v_base_ratios, i_base_ratios)
+
+        # The immittances derive their pu values from the bases, so only the bases themselves are updated
+        for id_bus, pu_base in zip(id_buses, pu_bases):
+            pu_base.set_base_values(self.v_bases[id_bus], self.s_base)
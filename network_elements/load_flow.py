@@ -0,0 +1,311 @@
+from active_elements.base_elements import ActiveElement1Terminal, ActiveCompositeElement
+from network_elements.matrix_assembly import collect_branches, merge_ideal_branches, stamp_bus_admittance_matrix
+from network_elements.topology import SequenceTopology
+from scipy import sparse
+from scipy.sparse.linalg import splu
+import numpy as np
+
+
+class LoadFlowResult:
+    """
+    Represents the solution of a load flow.
+
+    Attributes:
+        v_buses_pu (np.ndarray): The voltage of each bus id in pu (0 for the ground and the buses merged with it, NaN
+            for the buses of islands without the slack bus).
+        s_buses_pu (np.ndarray): The power injected into each bus id by the network in pu, i.e. generation minus load.
+        iterations (int): The number of iterations done.
+        converged (bool): Whether the largest power mismatch is below the tolerance.
+        mismatch_pu (float): The largest power mismatch of the last iteration in pu.
+    """
+
+    def __init__(self, v_buses_pu: np.ndarray, s_buses_pu: np.ndarray, iterations: int, converged: bool,
+                 mismatch_pu: float):
+        self.v_buses_pu = v_buses_pu
+        self.s_buses_pu = s_buses_pu
+        self.iterations = iterations
+        self.converged = converged
+        self.mismatch_pu = mismatch_pu
+
+
+def is_source(element) -> bool:
+    """
+    Returns whether the element is a voltage source behind an impedance (generator, motor or network equivalent).
+    """
+    return isinstance(element, (ActiveElement1Terminal, ActiveCompositeElement))
+
+
+def passive_branches(elements: list, seq: str) -> list:
+    """
+    Gathers the branches of the given sequence network of every element that isn't a source. The load flow represents
+    the sources by their bus specifications instead of their internal impedances.
+    """
+    return collect_branches([element for element in elements if not is_source(element)], seq)
+
+
+class LoadFlowModel:
+    """
+    Represents the positive sequence network without the sources on which the load flow runs, with the buses joined by
+    ideal branches merged into nodes as in the short-circuit matrices.
+
+    The model depends only on the topology and the branch admittances, so it is built once and serves any number of
+    operating points.
+
+    Attributes:
+        bus_index (np.ndarray): Maps a bus id to its node (-1 for the ground).
+        number_nodes (int): The number of nodes.
+        bus_admittance_matrix (sparse.csr_matrix): The bus admittance matrix of the nodes.
+        topology (SequenceTopology): The islands of the network.
+        slack_node (int): The node of the slack bus.
+        in_slack_island (np.ndarray): Whether each node is in the island of the slack bus, the only one solved.
+    """
+
+    def __init__(self, id_buses_m: np.ndarray, id_buses_n: np.ndarray, y_pu: np.ndarray, number_buses: int,
+                 id_bus_slack: int):
+        """
+        Args:
+            id_buses_m (np.ndarray): The bus ids of the first terminal of each branch.
+            id_buses_n (np.ndarray): The bus ids of the second terminal of each branch.
+            y_pu (np.ndarray): The admittance of each branch in pu.
+            number_buses (int): The number of buses, without the ground.
+            id_bus_slack (int): The slack bus.
+        """
+        self.id_buses_m = id_buses_m
+        self.id_buses_n = id_buses_n
+        self.y_pu = y_pu
+
+        self.bus_index, self.number_nodes = merge_ideal_branches(id_buses_m, id_buses_n, y_pu, number_buses)
+        self.bus_admittance_matrix = stamp_bus_admittance_matrix(id_buses_m, id_buses_n, y_pu, self.bus_index,
+                                                                 self.number_nodes)
+        self.topology = SequenceTopology(id_buses_m, id_buses_n, y_pu, self.bus_index, self.number_nodes)
+
+        self.slack_node = self.bus_index[id_bus_slack]
+        if self.slack_node < 0:
+            raise ValueError("The slack bus can't be merged with the ground")
+
+        self.in_slack_island = self.topology.island_labels == self.topology.island_labels[self.slack_node]
+
+    def node_values(self, bus_values: np.ndarray) -> np.ndarray:
+        """
+        Sums values indexed by bus id (e.g. power injections) into values indexed by node.
+        """
+        has_node = self.bus_index >= 0
+        node_values = np.zeros(self.number_nodes, dtype=complex)
+        np.add.at(node_values, self.bus_index[has_node], bus_values[has_node])
+
+        return node_values
+
+    def bus_values(self, node_values: np.ndarray) -> np.ndarray:
+        """
+        Expands values indexed by node into values indexed by bus id, the buses merged into one node sharing its value
+        and the ground getting 0.
+        """
+        has_node = self.bus_index >= 0
+        bus_values = np.zeros(len(self.bus_index), dtype=complex)
+        bus_values[has_node] = node_values[self.bus_index[has_node]]
+
+        return bus_values
+
+    def solved_buses(self) -> np.ndarray:
+        """
+        Returns whether the voltage of each bus id is given by the load flow: the buses of the island of the slack bus
+        and the ones merged with the ground (0 V), not the buses of the other islands.
+        """
+        has_node = self.bus_index >= 0
+        solved = np.ones(len(self.bus_index), dtype=bool)
+        solved[has_node] = self.in_slack_island[self.bus_index[has_node]]
+
+        return solved
+
+    def node_types(self, pv_buses: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the PV nodes and the PQ nodes solved, every node of the island of the slack bus but the slack one.
+        """
+        pv_nodes = self.bus_index[np.asarray(pv_buses, dtype=np.int64)]
+
+        is_pv = np.zeros(self.number_nodes, dtype=bool)
+        is_pv[pv_nodes[pv_nodes >= 0]] = True
+
+        solved = self.in_slack_island.copy()
+        solved[self.slack_node] = False
+
+        return np.flatnonzero(is_pv & solved), np.flatnonzero(~is_pv & solved)
+
+    def initial_voltages(self, pv_buses: np.ndarray, v_set_pu: np.ndarray, v_slack_pu: complex) -> np.ndarray:
+        """
+        Returns the flat start voltages of the nodes, with the magnitudes of the PV nodes and the slack voltage.
+        """
+        v_initial = np.ones(self.number_nodes, dtype=complex)
+
+        pv_nodes = self.bus_index[np.asarray(pv_buses, dtype=np.int64)]
+        v_initial[pv_nodes[pv_nodes >= 0]] = np.asarray(v_set_pu, dtype=float)[pv_nodes >= 0]
+        v_initial[self.slack_node] = v_slack_pu
+
+        return v_initial
+
+
+def power_flow_jacobian(bus_admittance_matrix: sparse.csr_matrix, v_pu: np.ndarray, pvpq_nodes: np.ndarray,
+                        pq_nodes: np.ndarray) -> sparse.csc_matrix:
+    """
+    Builds the sparse Jacobian of the power injections in polar coordinates:
+
+        dS/dVa = j * diag(V) * conj(diag(I) - Y * diag(V))
+        dS/dVm = diag(V) * conj(Y * diag(V / |V|)) + conj(diag(I)) * diag(V / |V|)
+
+    with the rows of the active powers of the PV and PQ nodes and of the reactive powers of the PQ nodes, and the
+    columns of the angles of the PV and PQ nodes and of the magnitudes of the PQ nodes. The products keep the sparsity
+    of Y, so the Jacobian has the pattern of the bus admittance matrix.
+
+    Returns:
+        sparse.csc_matrix: The real Jacobian, ready for a sparse LU factorization.
+    """
+    i_pu = bus_admittance_matrix @ v_pu
+    diagonal_v = sparse.diags(v_pu)
+    diagonal_i = sparse.diags(i_pu)
+    diagonal_v_normalized = sparse.diags(v_pu / np.abs(v_pu))
+
+    ds_dva = 1j * diagonal_v @ np.conj(diagonal_i - bus_admittance_matrix @ diagonal_v)
+    ds_dvm = diagonal_v @ np.conj(bus_admittance_matrix @ diagonal_v_normalized) + \
+        np.conj(diagonal_i) @ diagonal_v_normalized
+
+    ds_dva = sparse.csr_matrix(ds_dva)
+    ds_dvm = sparse.csr_matrix(ds_dvm)
+
+    j11 = ds_dva[pvpq_nodes][:, pvpq_nodes].real
+    j12 = ds_dvm[pvpq_nodes][:, pq_nodes].real
+    j21 = ds_dva[pq_nodes][:, pvpq_nodes].imag
+    j22 = ds_dvm[pq_nodes][:, pq_nodes].imag
+
+    return sparse.bmat([[j11, j12], [j21, j22]], format='csc')
+
+
+def newton_raphson(bus_admittance_matrix: sparse.spmatrix, s_specified_pu: np.ndarray, v_initial_pu: np.ndarray,
+                   pv_nodes: np.ndarray, pq_nodes: np.ndarray, tolerance: float = 1e-8,
+                   max_iterations: int = 20) -> tuple[np.ndarray, int, bool, float]:
+    """
+    Solves the load flow equations S = V * conj(Y * V) with the Newton-Raphson method in polar coordinates.
+
+    Each iteration builds the sparse Jacobian and solves it with a sparse LU factorization. The nodes that are neither
+    PV nor PQ (the slack node and the nodes left out of the solution) keep their initial voltages, the PV nodes keep
+    their initial magnitudes.
+
+    Args:
+        bus_admittance_matrix (sparse.spmatrix): The positive sequence bus admittance matrix without the sources.
+        s_specified_pu (np.ndarray): The specified power injection of each node in pu.
+        v_initial_pu (np.ndarray): The initial voltage of each node in pu, with the slack voltage and the magnitudes of
+            the PV nodes.
+        pv_nodes (np.ndarray): The nodes with specified active power and voltage magnitude.
+        pq_nodes (np.ndarray): The nodes with specified active and reactive power.
+        tolerance (float): The largest power mismatch in pu accepted.
+        max_iterations (int): The number of iterations after which the method stops.
+
+    Returns:
+        tuple[np.ndarray, int, bool, float]: The voltages of the nodes, the number of iterations, whether the method
+            converged and the largest power mismatch.
+    """
+    bus_admittance_matrix = sparse.csr_matrix(bus_admittance_matrix)
+    pvpq_nodes = np.concatenate((pv_nodes, pq_nodes))
+    number_pvpq = len(pvpq_nodes)
+
+    v_pu = np.asarray(v_initial_pu, dtype=complex).copy()
+    v_angle, v_magnitude = np.angle(v_pu), np.abs(v_pu)
+
+    iterations = 0
+    while True:
+        mismatch = v_pu * np.conj(bus_admittance_matrix @ v_pu) - s_specified_pu
+        residual = np.concatenate((mismatch[pvpq_nodes].real, mismatch[pq_nodes].imag))
+        largest_mismatch = np.linalg.norm(residual, np.inf) if len(residual) else 0.0
+
+        if largest_mismatch < tolerance or iterations == max_iterations:
+            return v_pu, iterations, bool(largest_mismatch < tolerance), float(largest_mismatch)
+
+        jacobian = power_flow_jacobian(bus_admittance_matrix, v_pu, pvpq_nodes, pq_nodes)
+        correction = splu(jacobian).solve(-residual)
+
+        v_angle[pvpq_nodes] += correction[:number_pvpq]
+        v_magnitude[pq_nodes] += correction[number_pvpq:]
+        v_pu = v_magnitude * np.exp(1j * v_angle)
+
+        iterations += 1
+
+
+class FastDecoupledSolver:
+    """
+    Solves load flows of a LoadFlowModel with the fast decoupled method (XB version).
+
+    The active power is solved for the angles with the constant matrix B', built from the series reactances of the
+    branches between nodes only (no resistances and no shunts), and the reactive power for the magnitudes with the
+    constant matrix B'' = -Im(Ybus). Both matrices depend only on the topology, so B' is factorized once and B'' once
+    for each set of PQ nodes, and every half iteration of every operating point costs a pair of triangular solves. The
+    solves take the power mismatch divided by the voltage magnitudes, while the convergence is tested on the power
+    mismatch itself, as in newton_raphson.
+
+    Attributes:
+        model (LoadFlowModel): The network the solver runs on.
+    """
+
+    def __init__(self, model: LoadFlowModel):
+        self.model = model
+
+        rows_m, rows_n = model.bus_index[model.id_buses_m], model.bus_index[model.id_buses_n]
+        between_nodes = (rows_m >= 0) & (rows_n >= 0) & (rows_m != rows_n) & (model.y_pu != 0)
+
+        # A branch with no reactance doesn't couple the angles in the XB approximation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_pu = np.where(between_nodes, (1 / model.y_pu).imag, 0)
+        y_prime_pu = np.where(x_pu != 0, 1 / (1j * np.where(x_pu != 0, x_pu, 1)), 0)
+
+        b_prime = -stamp_bus_admittance_matrix(model.id_buses_m, model.id_buses_n, y_prime_pu, model.bus_index,
+                                               model.number_nodes).imag
+        self.b_double_prime = sparse.csr_matrix(-model.bus_admittance_matrix.imag)
+
+        pv_nodes, pq_nodes = model.node_types(())
+        self._pvpq_nodes = np.sort(np.concatenate((pv_nodes, pq_nodes)))
+        self._b_prime_lu = splu(sparse.csc_matrix(b_prime[self._pvpq_nodes][:, self._pvpq_nodes]))
+        self._b_double_prime_lu = {}
+
+    def _b_double_prime_factorization(self, pq_nodes: np.ndarray):
+        key = pq_nodes.tobytes()
+        if key not in self._b_double_prime_lu:
+            self._b_double_prime_lu[key] = splu(sparse.csc_matrix(self.b_double_prime[pq_nodes][:, pq_nodes]))
+
+        return self._b_double_prime_lu[key]
+
+    def solve(self, s_specified_pu: np.ndarray, v_initial_pu: np.ndarray, pv_nodes: np.ndarray, pq_nodes: np.ndarray,
+              tolerance: float = 1e-8, max_iterations: int = 100) -> tuple[np.ndarray, int, bool, float]:
+        """
+        Solves the load flow of one operating point, with the same arguments and results as newton_raphson.
+        """
+        bus_admittance_matrix = self.model.bus_admittance_matrix
+        pvpq_nodes = self._pvpq_nodes
+        b_double_prime_lu = self._b_double_prime_factorization(pq_nodes) if len(pq_nodes) else None
+
+        v_pu = np.asarray(v_initial_pu, dtype=complex).copy()
+        v_angle, v_magnitude = np.angle(v_pu), np.abs(v_pu)
+
+        # The power mismatch is tested for convergence and returned as newton_raphson does, the mismatch divided by |V|
+        # is only the right hand side of the solves
+        def mismatch():
+            return v_pu * np.conj(bus_admittance_matrix @ v_pu) - s_specified_pu
+
+        def largest(node_mismatch):
+            residual = np.concatenate((node_mismatch[pvpq_nodes].real, node_mismatch[pq_nodes].imag))
+            return np.linalg.norm(residual, np.inf) if len(residual) else 0.0
+
+        iterations = 0
+        node_mismatch = mismatch()
+        largest_mismatch = largest(node_mismatch)
+        while largest_mismatch >= tolerance and iterations < max_iterations:
+            v_angle[pvpq_nodes] -= self._b_prime_lu.solve((node_mismatch / v_magnitude)[pvpq_nodes].real)
+            v_pu = v_magnitude * np.exp(1j * v_angle)
+
+            node_mismatch = mismatch()
+            if b_double_prime_lu is not None:
+                v_magnitude[pq_nodes] -= b_double_prime_lu.solve((node_mismatch / v_magnitude)[pq_nodes].imag)
+                v_pu = v_magnitude * np.exp(1j * v_angle)
+                node_mismatch = mismatch()
+
+            largest_mismatch = largest(node_mismatch)
+            iterations += 1
+
+        return v_pu, iterations, bool(largest_mismatch < tolerance), float(largest_mismatch)
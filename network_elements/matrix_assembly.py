@@ -0,0 +1,110 @@
+from electrical_values import ImmittanceConstant
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+import numpy as np
+
+SEQUENCES = ('seq0', 'seq1', 'seq2')
+
+
+def collect_branches(elements: list, seq: str) -> list[ImmittanceConstant]:
+    """
+    Gathers the branches that every element exposes for the given sequence network.
+
+    Args:
+        elements (list): The elements of the network.
+        seq (str): The sequence network ('seq0', 'seq1' or 'seq2').
+
+    Returns:
+        list[ImmittanceConstant]: The branches of all elements, in element order.
+    """
+    branches = []
+    for element in elements:
+        branches.extend(element.admittance_representation(seq))
+
+    return branches
+
+
+def branches_admittances(branches: list[ImmittanceConstant]) -> np.ndarray:
+    """
+    Returns the primitive admittances of the branches as a complex vector (the diagonal of the primitive matrix), in
+    the current bases of the branches.
+    """
+    return ImmittanceConstant.admittances_pu(branches)
+
+
+def branches_incidences(branches: list[ImmittanceConstant]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the element-node incidence of the branches as two vectors with the bus ids of their terminals.
+    """
+    id_buses_m = np.fromiter((branch.id_bus_m for branch in branches), dtype=np.int64, count=len(branches))
+    id_buses_n = np.fromiter((branch.id_bus_n for branch in branches), dtype=np.int64, count=len(branches))
+
+    return id_buses_m, id_buses_n
+
+
+def merge_ideal_branches(id_buses_m: np.ndarray, id_buses_n: np.ndarray, y_pu: np.ndarray,
+                         number_buses: int) -> tuple[np.ndarray, int]:
+    """
+    Maps the buses joined by ideal branches (infinite admittance, e.g. bus couplers or solidly grounded windings) to a
+    single node, so those branches never reach the bus admittance matrix as huge penalty admittances.
+
+    The groups of buses are the connected components of the graph of ideal branches, i.e. the sets a union-find over
+    those branches would give, found in O(buses + branches). Buses joined to the ground by ideal branches are merged
+    with the reference. The ideal branches end up with both terminals at the same node, which the stamping skips.
+
+    Args:
+        id_buses_m (np.ndarray): The bus ids of the first terminal of each branch.
+        id_buses_n (np.ndarray): The bus ids of the second terminal of each branch.
+        y_pu (np.ndarray): The admittance of each branch in pu.
+        number_buses (int): The number of buses, without the ground.
+
+    Returns:
+        tuple[np.ndarray, int]: The node of each bus id (-1 for the reference), and the number of nodes. Without ideal
+            branches every bus is its own node, the bus i being the node i - 1.
+    """
+    ideal = np.isinf(y_pu)
+    number_ids = number_buses + 1
+
+    graph = sparse.csr_matrix((np.ones(np.count_nonzero(ideal), dtype=np.int32),
+                               (id_buses_m[ideal], id_buses_n[ideal])), shape=(number_ids, number_ids))
+    # The components are labelled in the order of their lowest bus id, so the ground is always the component 0
+    number_components, labels = connected_components(graph, directed=False)
+
+    return labels - 1, number_components - 1
+
+
+def stamp_bus_admittance_matrix(id_buses_m: np.ndarray, id_buses_n: np.ndarray, y_pu: np.ndarray,
+                                bus_index: np.ndarray, number_nodes: int) -> sparse.csr_matrix:
+    """
+    Builds the bus admittance matrix by stamping every branch as COO triplets.
+
+    Each branch between the nodes m and n adds y to (m, m) and (n, n) and -y to (m, n) and (n, m). Terminals mapped
+    to the reference (index -1) only contribute to the diagonal of the other terminal. Duplicated triplets are summed
+    when converting to CSR, so the matrix is built in O(number of branches) without forming A^T * Yprim * A.
+
+    Args:
+        id_buses_m (np.ndarray): The bus ids of the first terminal of each branch.
+        id_buses_n (np.ndarray): The bus ids of the second terminal of each branch.
+        y_pu (np.ndarray): The admittance of each branch in pu.
+        bus_index (np.ndarray): Maps a bus id to its row in the matrix (-1 for the reference).
+        number_nodes (int): The dimension of the matrix.
+
+    Returns:
+        sparse.csr_matrix: The bus admittance matrix.
+    """
+    rows_m = bus_index[id_buses_m]
+    rows_n = bus_index[id_buses_n]
+
+    # Open branches and branches with both terminals at the same node don't change the matrix
+    stamped = (y_pu != 0) & (rows_m != rows_n)
+    rows_m, rows_n, y_pu = rows_m[stamped], rows_n[stamped], y_pu[stamped]
+
+    has_m = rows_m >= 0
+    has_n = rows_n >= 0
+    has_mn = has_m & has_n
+
+    rows = np.concatenate((rows_m[has_m], rows_n[has_n], rows_m[has_mn], rows_n[has_mn]))
+    columns = np.concatenate((rows_m[has_m], rows_n[has_n], rows_n[has_mn], rows_m[has_mn]))
+    data = np.concatenate((y_pu[has_m], y_pu[has_n], -y_pu[has_mn], -y_pu[has_mn]))
+
+    return sparse.coo_matrix((data, (rows, columns)), shape=(number_nodes, number_nodes), dtype=complex).tocsr()
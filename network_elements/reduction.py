@@ -0,0 +1,46 @@
+from scipy import sparse
+from scipy.sparse.linalg import splu
+import numpy as np
+
+
+def kron_reduce(bus_admittance_matrix: sparse.spmatrix, boundary_nodes: np.ndarray,
+                island_labels: np.ndarray) -> np.ndarray:
+    """
+    Eliminates every node except the boundary ones with the Schur complement of the internal nodes:
+
+        Yred = Ybb - Ybi * Yii^-1 * Yib
+
+    Yii is factorized once (sparse LU) and solved for the columns of Yib, so no inverse is formed. Only the islands that
+    contain a boundary node are eliminated, the others don't change the boundary and could make Yii singular.
+
+    Args:
+        bus_admittance_matrix (sparse.spmatrix): The bus admittance matrix of one sequence network.
+        boundary_nodes (np.ndarray): The nodes kept, in the order of the reduced matrix.
+        island_labels (np.ndarray): The island of each node.
+
+    Returns:
+        np.ndarray: The reduced (dense) admittance matrix of the boundary nodes.
+    """
+    boundary_nodes = np.asarray(boundary_nodes, dtype=np.int64)
+    if (boundary_nodes < 0).any() or len(np.unique(boundary_nodes)) != len(boundary_nodes):
+        raise ValueError("The boundary buses must be distinct nodes, not merged with the ground or with each other")
+
+    bus_admittance_matrix = sparse.csr_matrix(bus_admittance_matrix)
+
+    internal = np.isin(island_labels, island_labels[boundary_nodes])
+    internal[boundary_nodes] = False
+    internal_nodes = np.flatnonzero(internal)
+
+    boundary_rows = bus_admittance_matrix[boundary_nodes]
+    reduced_matrix = boundary_rows[:, boundary_nodes].toarray()
+    if len(internal_nodes) == 0:
+        return reduced_matrix
+
+    internal_rows = bus_admittance_matrix[internal_nodes]
+    internal_lu = splu(sparse.csc_matrix(internal_rows[:, internal_nodes]), permc_spec='MMD_AT_PLUS_A',
+                       diag_pivot_thresh=0, options=dict(SymmetricMode=True))
+
+    internal_boundary = internal_rows[:, boundary_nodes].toarray()
+    reduced_matrix -= boundary_rows[:, internal_nodes] @ internal_lu.solve(internal_boundary)
+
+    return reduced_matrix
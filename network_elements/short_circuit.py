@@ -0,0 +1,175 @@
+from symmetrical_components import sequence_to_phase
+import numpy as np
+
+FAULT_TYPES = ('3ph', 'slg', 'll', 'llg')
+
+
+class FaultSweepResult:
+    """
+    Represents the results of a short-circuit sweep over a set of buses.
+
+    Attributes:
+        currents (dict): The seq0, seq1 and seq2 fault currents in pu for each fault type, arrays of shape (..., 3).
+        voltages (dict): The seq0, seq1 and seq2 post-fault voltages at the faulted bus in pu for each fault type,
+            arrays of shape (..., 3).
+    """
+
+    def __init__(self, currents: dict, voltages: dict):
+        self.currents = currents
+        self.voltages = voltages
+
+    def phase_currents(self, fault_type: str) -> np.ndarray:
+        """
+        Returns the phase a, b and c fault currents in pu of the given fault type, one matmul for all buses.
+        """
+        return sequence_to_phase(self.currents[fault_type])
+
+    def phase_voltages(self, fault_type: str) -> np.ndarray:
+        """
+        Returns the phase a, b and c post-fault voltages in pu of the given fault type, one matmul for all buses.
+        """
+        return sequence_to_phase(self.voltages[fault_type])
+
+
+def _parallel_impedance(z_a: np.ndarray, z_b: np.ndarray):
+    # An infinite (open) impedance in parallel doesn't change the other one
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_parallel = (z_a * z_b) / (z_a + z_b)
+
+    z_parallel = np.where(np.isinf(z_a), z_b, z_parallel)
+    z_parallel = np.where(np.isinf(z_b), z_a, z_parallel)
+
+    return z_parallel
+
+
+def calculate_fault_currents(fault_type: str, z_thevenin: np.ndarray, v_pre_fault: np.ndarray, z_fault=0):
+    """
+    Calculates the sequence fault currents for every faulted bus at once.
+
+    The phase A is the reference: the SLG fault is A-g, the LL fault is B-C and the LLG fault is B-C-g.
+
+    Args:
+        fault_type (str): One of '3ph', 'slg', 'll' or 'llg'.
+        z_thevenin (np.ndarray): The seq0, seq1 and seq2 Thevenin impedances in pu, shape (..., 3).
+        v_pre_fault (np.ndarray): The pre-fault voltages in pu, broadcastable to z_thevenin[..., 0].
+        z_fault: The fault impedance in pu, broadcastable to z_thevenin[..., 0].
+
+    Returns:
+        np.ndarray: The seq0, seq1 and seq2 fault currents in pu, shape (..., 3).
+    """
+    z_seq0, z_seq1, z_seq2 = z_thevenin[..., 0], z_thevenin[..., 1], z_thevenin[..., 2]
+    v_pre_fault = np.asarray(v_pre_fault, dtype=complex)
+    z_fault = np.asarray(z_fault, dtype=complex)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if fault_type == '3ph':
+            i_seq1 = v_pre_fault / (z_seq1 + z_fault)
+            i_seq0 = np.zeros_like(i_seq1)
+            i_seq2 = np.zeros_like(i_seq1)
+
+        elif fault_type == 'slg':
+            i_seq1 = v_pre_fault / (z_seq0 + z_seq1 + z_seq2 + 3 * z_fault)
+            i_seq0 = i_seq1
+            i_seq2 = i_seq1
+
+        elif fault_type == 'll':
+            i_seq1 = v_pre_fault / (z_seq1 + z_seq2 + z_fault)
+            i_seq0 = np.zeros_like(i_seq1)
+            i_seq2 = -i_seq1
+
+        elif fault_type == 'llg':
+            i_seq1 = v_pre_fault / (z_seq1 + _parallel_impedance(z_seq2, z_seq0 + 3 * z_fault))
+            # The seq1 and seq2 voltages at the fault are equal, which also holds when seq0 is open
+            i_seq2 = -(v_pre_fault - z_seq1 * i_seq1) / z_seq2
+            i_seq0 = -(i_seq1 + i_seq2)
+
+        else:
+            raise ValueError(f"Unknown fault type '{fault_type}', expected one of {FAULT_TYPES}")
+
+    return np.stack(np.broadcast_arrays(i_seq0, i_seq1, i_seq2), axis=-1)
+
+
+def _voltage_drop(z_thevenin: np.ndarray, i_fault: np.ndarray):
+    # No current through an infinite (open) impedance means no drop, instead of inf * 0
+    with np.errstate(invalid='ignore'):
+        return np.where(i_fault == 0, 0, z_thevenin * i_fault)
+
+
+def calculate_fault_voltages(z_thevenin: np.ndarray, v_pre_fault: np.ndarray, i_fault: np.ndarray,
+                             fault_type: str = None, z_fault=0):
+    """
+    Calculates the seq0, seq1 and seq2 post-fault voltages at the faulted buses from the fault currents.
+
+    Where the seq0 network is open at the faulted bus (infinite Thevenin impedance) its voltage doesn't follow from the
+    current, so it is taken from the boundary conditions of the fault type: Va = 3 * Zf * Ia for SLG faults and
+    V0 - V1 = 3 * Zf * I0 for LLG faults.
+
+    Args:
+        z_thevenin (np.ndarray): The seq0, seq1 and seq2 Thevenin impedances in pu, shape (..., 3).
+        v_pre_fault (np.ndarray): The pre-fault voltages in pu.
+        i_fault (np.ndarray): The seq0, seq1 and seq2 fault currents in pu, shape (..., 3).
+        fault_type (str): The fault type of the currents, needed for buses with an open seq0 network.
+        z_fault: The fault impedance in pu.
+
+    Returns:
+        np.ndarray: The post-fault sequence voltages in pu, shape (..., 3).
+    """
+    v_pre_fault = np.asarray(v_pre_fault, dtype=complex)
+    z_fault = np.asarray(z_fault, dtype=complex)
+
+    v_seq0 = -_voltage_drop(z_thevenin[..., 0], i_fault[..., 0])
+    v_seq1 = v_pre_fault - _voltage_drop(z_thevenin[..., 1], i_fault[..., 1])
+    v_seq2 = -_voltage_drop(z_thevenin[..., 2], i_fault[..., 2])
+
+    open_seq0 = np.isinf(z_thevenin[..., 0])
+    with np.errstate(invalid='ignore'):
+        if fault_type == 'slg':
+            v_seq0 = np.where(open_seq0, 3 * z_fault * i_fault[..., 1] - v_seq1 - v_seq2, v_seq0)
+        elif fault_type == 'llg':
+            v_seq0 = np.where(open_seq0, v_seq1 + 3 * z_fault * i_fault[..., 0], v_seq0)
+
+    return np.stack(np.broadcast_arrays(v_seq0, v_seq1, v_seq2), axis=-1)
+
+
+def sweep_faults(z_thevenin: np.ndarray, v_pre_fault: np.ndarray, z_fault=0, fault_types=FAULT_TYPES):
+    """
+    Calculates the fault currents and post-fault voltages of every fault type for every faulted bus.
+
+    Args:
+        z_thevenin (np.ndarray): The seq0, seq1 and seq2 Thevenin impedances in pu, shape (..., 3).
+        v_pre_fault (np.ndarray): The pre-fault voltages in pu.
+        z_fault: The fault impedance in pu.
+        fault_types: The fault types to calculate.
+
+    Returns:
+        FaultSweepResult: The currents and voltages of each fault type.
+    """
+    currents, voltages = {}, {}
+    for fault_type in fault_types:
+        currents[fault_type] = calculate_fault_currents(fault_type, z_thevenin, v_pre_fault, z_fault)
+        voltages[fault_type] = calculate_fault_voltages(z_thevenin, v_pre_fault, currents[fault_type], fault_type,
+                                                        z_fault)
+
+    return FaultSweepResult(currents, voltages)
+
+
+def sweep_fault_impedances(z_thevenin: np.ndarray, v_pre_fault: np.ndarray, z_fault, fault_types=FAULT_TYPES):
+    """
+    Calculates the faults of every fault type for every faulted bus and every fault impedance of a range (e.g. the
+    fault resistances of a relay setting study), broadcasting the same Thevenin impedances and pre-fault voltages over
+    the fault impedances.
+
+    Args:
+        z_thevenin (np.ndarray): The seq0, seq1 and seq2 Thevenin impedances in pu, shape (..., 3).
+        v_pre_fault (np.ndarray): The pre-fault voltages in pu, broadcastable to z_thevenin[..., 0].
+        z_fault: The fault impedances in pu, shape (n_zf,) for the same impedances at every bus or (..., n_zf) for
+            impedances per bus.
+        fault_types: The fault types to calculate.
+
+    Returns:
+        FaultSweepResult: The currents and voltages of each fault type, arrays of shape (..., n_zf, 3).
+    """
+    z_thevenin = np.asarray(z_thevenin)[..., np.newaxis, :]
+    v_pre_fault = np.asarray(v_pre_fault, dtype=complex)[..., np.newaxis]
+
+    return sweep_faults(z_thevenin, v_pre_fault, np.asarray(z_fault, dtype=complex), fault_types)
@@ -0,0 +1,61 @@
+from base_elements import Element3Terminals, CompositeElement
+from active_elements.base_elements import ActiveElement1Terminal, ActiveCompositeElement
+from passive_elements.base_elements import PassiveCompositeElement
+from network_elements.matrix_assembly import SEQUENCES
+
+
+def parallel_key(element) -> tuple:
+    """
+    Returns the key of the elements the given element can be merged with.
+
+    Elements are in parallel when they join the same buses m, n and p. They can only be merged when they also have the
+    same type and the same branches in every sequence network, since CompositeElement sums the branches by position.
+    """
+    branch_terminals = tuple(tuple((branch.id_bus_m, branch.id_bus_n)
+                                   for branch in element.admittance_representation(seq))
+                             for seq in SEQUENCES)
+
+    return type(element), element.id_bus_m, element.id_bus_n, element.id_bus_p, branch_terminals
+
+
+def group_parallel_elements(elements: list) -> list[list]:
+    """
+    Groups the elements in parallel with a hash index on their parallel_key, in O(number of elements).
+
+    Elements outside the Element3Terminals and CompositeElement families (e.g. a MultiPortEquivalent) are never merged.
+
+    Returns:
+        list[list]: The groups of parallel elements, in the order of their first element.
+    """
+    groups = {}
+    for element in elements:
+        if isinstance(element, (Element3Terminals, CompositeElement)):
+            key = parallel_key(element)
+        else:
+            key = id(element)
+
+        groups.setdefault(key, []).append(element)
+
+    return list(groups.values())
+
+
+def merge_parallel_elements(elements: list) -> list:
+    """
+    Collapses every group of parallel elements into an ActiveCompositeElement or a PassiveCompositeElement.
+
+    The composites keep their elements, so the voltages given to a composite are passed to its elements and the
+    currents of the composite are the sums of the currents its elements calculate.
+
+    Returns:
+        list: The elements without parallels, a composite in the place of the first element of each group.
+    """
+    simplified_elements = []
+    for group in group_parallel_elements(elements):
+        if len(group) == 1:
+            simplified_elements.append(group[0])
+        elif isinstance(group[0], (ActiveElement1Terminal, ActiveCompositeElement)):
+            simplified_elements.append(ActiveCompositeElement(group))
+        else:
+            simplified_elements.append(PassiveCompositeElement(group))
+
+    return simplified_elements
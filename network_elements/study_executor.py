@@ -0,0 +1,221 @@
+from network_elements.matrix_assembly import SEQUENCES
+from network_elements.contingency import ContingencyAnalysis, ContingencySweepResult, SequenceOutageSolver
+from network_elements.short_circuit import FAULT_TYPES, sweep_faults
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory, util
+import numpy as np
+import os
+
+
+class SharedArrays:
+    """
+    Represents a set of named arrays packed in one block of shared memory.
+
+    The block is described by its name and a layout (offset, shape and dtype of each array), which are all a process
+    needs to attach to it and view the arrays without copying them.
+
+    Attributes:
+        shared_memory (shared_memory.SharedMemory): The block of shared memory.
+        layout (dict): The offset, shape and dtype of each array in the block.
+        arrays (dict): The views of the arrays on the block.
+    """
+
+    ALIGNMENT = 64
+
+    def __init__(self, layout: dict, name: str = None):
+        """
+        Creates a block for the given layout, or attaches to an existing block when its name is given.
+        """
+        size = max([offset + int(np.prod(shape)) * np.dtype(dtype).itemsize
+                    for offset, shape, dtype in layout.values()] + [1])
+
+        self.shared_memory = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.layout = layout
+        self.arrays = {array_name: np.ndarray(shape, dtype=dtype, buffer=self.shared_memory.buf, offset=offset)
+                       for array_name, (offset, shape, dtype) in layout.items()}
+
+    @classmethod
+    def allocate(cls, specifications: dict):
+        """
+        Creates a block with an array of each given (shape, dtype).
+        """
+        layout, offset = {}, 0
+        for array_name, (shape, dtype) in specifications.items():
+            offset = -(-offset // cls.ALIGNMENT) * cls.ALIGNMENT
+            layout[array_name] = (offset, tuple(shape), np.dtype(dtype).str)
+            offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+        return cls(layout)
+
+    @classmethod
+    def from_arrays(cls, arrays: dict):
+        """
+        Creates a block with a copy of the given arrays.
+        """
+        arrays = {array_name: np.asarray(array) for array_name, array in arrays.items()}
+        shared_arrays = cls.allocate({array_name: (array.shape, array.dtype) for array_name, array in arrays.items()})
+        for array_name, array in arrays.items():
+            shared_arrays.arrays[array_name][...] = array
+
+        return shared_arrays
+
+    @property
+    def name(self) -> str:
+        return self.shared_memory.name
+
+    def close(self):
+        # The views must go before the block is closed, the buffer can't be released while they use it
+        self.arrays = {}
+        self.shared_memory.close()
+
+    def unlink(self):
+        self.close()
+        self.shared_memory.unlink()
+
+
+# State of each worker process, set by _initialize_worker
+_worker = {}
+
+
+def _initialize_worker(input_name: str, input_layout: dict, result_name: str, result_layout: dict, number_buses: int):
+    # Attaches to the shared arrays and rebuilds the solvers on the factors of the parent, nothing is factorized again
+    inputs = SharedArrays(input_layout, input_name)
+    results = SharedArrays(result_layout, result_name)
+    # The inputs are shared by all the workers, none of them may write into them
+    for array in inputs.arrays.values():
+        array.flags.writeable = False
+
+    solvers = {}
+    for seq in SEQUENCES:
+        prefix = seq + '_'
+        solver_arrays = {name[len(prefix):]: array for name, array in inputs.arrays.items() if name.startswith(prefix)}
+        solvers[seq] = SequenceOutageSolver.from_arrays(solver_arrays, number_buses)
+
+    _worker.update(inputs=inputs, results=results, solvers=solvers)
+    util.Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker():
+    # The solvers view the shared blocks, they must go before the blocks are closed
+    _worker.pop('solvers', None)
+    for name in ('inputs', 'results'):
+        shared_arrays = _worker.pop(name, None)
+        if shared_arrays is not None:
+            shared_arrays.close()
+
+
+def _solve_outages(start: int, stop: int, z_fault_pu: complex, fault_types: tuple):
+    # Solves the outages start to stop - 1 and writes their results into the shared result arrays
+    arrays, results = _worker['inputs'].arrays, _worker['results'].arrays
+
+    for index in range(start, stop):
+        for position, seq in enumerate(SEQUENCES):
+            pointers = arrays['outage_pointers_' + seq]
+            changes = slice(pointers[index], pointers[index + 1])
+
+            z_seq, islanding = _worker['solvers'][seq].thevenin_impedances(arrays['outage_positions_' + seq][changes],
+                                                                            arrays['outage_y_pu_' + seq][changes])
+            results['z_thevenin'][index, :, position] = z_seq
+            if seq == 'seq1':
+                results['islanding'][index] = islanding
+
+    sweep = sweep_faults(results['z_thevenin'][start:stop], arrays['v_pre_fault'], z_fault_pu, fault_types)
+    for position, fault_type in enumerate(fault_types):
+        results['currents'][position, start:stop] = sweep.currents[fault_type]
+        results['voltages'][position, start:stop] = sweep.voltages[fault_type]
+
+    return stop - start
+
+
+class StudyExecutor:
+    """
+    Runs fault and contingency studies of a network on a pool of processes.
+
+    The factorized case is shared with the workers through shared memory: the parent writes the factors of the bus
+    admittance matrices (see TriangularFactorization), their islands and bridges, the branch arrays, the bus maps, the
+    Thevenin impedances of the base case and the branch changes of every outage once, and each worker attaches to them
+    without copying, so nothing is factorized or labelled again in the workers. The workers map the inputs read-only. The
+    tasks only carry a range of outages, and the workers write their results straight into result arrays preallocated
+    in shared memory. The workers close their handles of the shared blocks when they exit.
+
+    The work is sharded by chunks of contingencies only: a task solves a chunk of outages for every bus and fault type
+    (vectorized over the buses). The low-rank update of an outage gives the impedances of all buses at once, so
+    splitting the buses among tasks would repeat the update in each of them.
+
+    With the spawn or forkserver start methods the workers import this package again, so the study must run under an
+    `if __name__ == '__main__':` guard.
+
+    Attributes:
+        network (Network): The network studied.
+        max_workers (int): The number of worker processes.
+        chunk_size (int): The number of outages of each task, chosen from the number of outages when not given.
+    """
+
+    def __init__(self, network, max_workers: int = None, chunk_size: int = None):
+        self.network = network
+        self.max_workers = max_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+
+    def _input_arrays(self, analysis: ContingencyAnalysis) -> dict:
+        arrays = {'v_pre_fault': self.network.pre_fault_voltages()}
+        for seq in SEQUENCES:
+            arrays.update({seq + '_' + name: array for name, array in analysis.solvers[seq].arrays().items()})
+
+            # The branch changes of all outages, outage i being the entries pointers[i] to pointers[i + 1] - 1
+            pointers, positions, y_pu = analysis.outage_branch_changes(seq)
+            arrays['outage_pointers_' + seq] = pointers
+            arrays['outage_positions_' + seq] = positions
+            arrays['outage_y_pu_' + seq] = y_pu
+
+        return arrays
+
+    def calculate_contingency_sweep(self, outages: list, z_fault_pu: complex = 0, fault_types=FAULT_TYPES):
+        """
+        Calculates the faults at every bus for every outage of a contingency list on the process pool.
+
+        Args:
+            outages (list): The contingencies, each one an element or a list of elements out of service together, an
+                empty list being the base case.
+            z_fault_pu (complex): The fault impedance in pu.
+            fault_types: The fault types to calculate.
+
+        Returns:
+            ContingencySweepResult: The same results as ContingencyAnalysis.calculate_short_circuit_sweep.
+        """
+        fault_types = tuple(fault_types)
+        analysis = ContingencyAnalysis(self.network, outages)
+        number_outages, number_buses = len(analysis.outages), self.network.number_buses
+
+        inputs = SharedArrays.from_arrays(self._input_arrays(analysis))
+        results = SharedArrays.allocate({'z_thevenin': ((number_outages, number_buses, 3), complex),
+                                         'islanding': ((number_outages,), bool),
+                                         'currents': ((len(fault_types), number_outages, number_buses, 3), complex),
+                                         'voltages': ((len(fault_types), number_outages, number_buses, 3), complex)})
+
+        # A few tasks per worker balance the load without many round trips
+        chunk_size = self.chunk_size or max(1, -(-number_outages // (4 * self.max_workers)))
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_initialize_worker,
+                                     initargs=(inputs.name, inputs.layout, results.name, results.layout,
+                                               number_buses)) as executor:
+                futures = [executor.submit(_solve_outages, start, min(start + chunk_size, number_outages), z_fault_pu,
+                                           fault_types)
+                           for start in range(0, number_outages, chunk_size)]
+                wait(futures)
+                for future in futures:
+                    future.result()
+
+            arrays = results.arrays
+            currents = {fault_type: arrays['currents'][position].copy()
+                        for position, fault_type in enumerate(fault_types)}
+            voltages = {fault_type: arrays['voltages'][position].copy()
+                        for position, fault_type in enumerate(fault_types)}
+            sweep = ContingencySweepResult(currents, voltages, arrays['z_thevenin'].copy(),
+                                           arrays['islanding'].copy())
+            del arrays
+        finally:
+            inputs.unlink()
+            results.unlink()
+
+        return sweep
@@ -0,0 +1,140 @@
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+import numpy as np
+
+
+class SequenceTopology:
+    """
+    Represents the connectivity of the nodes of one sequence network.
+
+    The nodes are the rows of the bus admittance matrix. Two nodes are adjacent when a branch with non-zero admittance
+    joins them, so the islands (connected components) are the diagonal blocks of the bus admittance matrix. An island
+    is grounded when at least one of its branches goes to the reference, otherwise its block is singular.
+
+    Attributes:
+        adjacency (sparse.csr_matrix): The symmetric node adjacency, without the reference.
+        number_islands (int): The number of islands.
+        island_labels (np.ndarray): The island of each node.
+        grounded (np.ndarray): Whether each island has a path to the reference.
+    """
+
+    def __init__(self, id_buses_m: np.ndarray, id_buses_n: np.ndarray, y_pu: np.ndarray, bus_index: np.ndarray,
+                 number_nodes: int):
+        """
+        Builds the adjacency of the branches and labels the islands in O(nodes + branches).
+
+        Args:
+            id_buses_m (np.ndarray): The bus ids of the first terminal of each branch.
+            id_buses_n (np.ndarray): The bus ids of the second terminal of each branch.
+            y_pu (np.ndarray): The admittance of each branch in pu.
+            bus_index (np.ndarray): Maps a bus id to its node (-1 for the reference).
+            number_nodes (int): The number of nodes.
+        """
+        rows_m = bus_index[id_buses_m]
+        rows_n = bus_index[id_buses_n]
+        connected = y_pu != 0
+
+        between_nodes = connected & (rows_m >= 0) & (rows_n >= 0) & (rows_m != rows_n)
+        rows = np.concatenate((rows_m[between_nodes], rows_n[between_nodes]))
+        columns = np.concatenate((rows_n[between_nodes], rows_m[between_nodes]))
+        self.adjacency = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, columns)),
+                                           shape=(number_nodes, number_nodes))
+
+        self.number_islands, self.island_labels = connected_components(self.adjacency, directed=False)
+
+        to_reference = connected & ((rows_m < 0) != (rows_n < 0))
+        grounded_nodes = np.where(rows_m[to_reference] >= 0, rows_m[to_reference], rows_n[to_reference])
+        self.grounded = np.zeros(self.number_islands, dtype=bool)
+        self.grounded[self.island_labels[grounded_nodes]] = True
+
+    def arrays(self) -> dict:
+        """
+        Returns the adjacency and the islands as arrays, to rebuild the topology in another process (see from_arrays).
+        """
+        return {'adjacency_data': self.adjacency.data, 'adjacency_indices': self.adjacency.indices,
+                'adjacency_indptr': self.adjacency.indptr, 'island_labels': self.island_labels,
+                'grounded': self.grounded}
+
+    @classmethod
+    def from_arrays(cls, arrays: dict):
+        """
+        Rebuilds the topology from the arrays returned by arrays, without labelling the islands again.
+        """
+        topology = cls.__new__(cls)
+        number_nodes = len(arrays['island_labels'])
+        topology.adjacency = sparse.csr_matrix((arrays['adjacency_data'], arrays['adjacency_indices'],
+                                                arrays['adjacency_indptr']), shape=(number_nodes, number_nodes),
+                                               copy=False)
+        topology.island_labels = arrays['island_labels']
+        topology.grounded = arrays['grounded']
+        topology.number_islands = len(topology.grounded)
+
+        return topology
+
+    def island_nodes(self) -> list[np.ndarray]:
+        """
+        Returns the nodes of each island, in ascending order.
+        """
+        order = np.argsort(self.island_labels, kind='stable')
+        sizes = np.bincount(self.island_labels, minlength=self.number_islands)
+
+        return np.split(order, np.cumsum(sizes)[:-1])
+
+    def grounded_nodes(self) -> np.ndarray:
+        """
+        Returns whether each node belongs to a grounded island.
+        """
+        return self.grounded[self.island_labels]
+
+    def bus_islands(self, bus_index: np.ndarray) -> np.ndarray:
+        """
+        Returns the island of each bus id, -1 for the reference.
+        """
+        return np.where(bus_index >= 0, self.island_labels[bus_index], -1)
+
+    def bridges(self) -> set:
+        """
+        Returns the connections whose removal splits an island, as pairs of nodes (lower node first).
+
+        A connection is a bridge when no cycle goes through it, found with the low-link values of a depth-first search
+        (Tarjan) in O(nodes + connections). Nodes joined by parallel branches are never a bridge, since removing one of
+        the branches keeps them connected.
+        """
+        indptr, indices, multiplicity = self.adjacency.indptr, self.adjacency.indices, self.adjacency.data
+        number_nodes = self.adjacency.shape[0]
+
+        discovery = np.full(number_nodes, -1, dtype=np.int64)
+        low = np.zeros(number_nodes, dtype=np.int64)
+        bridges = set()
+        time = 0
+
+        for root in range(number_nodes):
+            if discovery[root] >= 0:
+                continue
+
+            discovery[root] = low[root] = time
+            time += 1
+            # Each entry is a node, its parent, the position of the next neighbour to visit and the position of the
+            # connection to the parent
+            stack = [(root, -1, indptr[root], -1)]
+            while stack:
+                node, parent, position, parent_position = stack[-1]
+                if position < indptr[node + 1]:
+                    stack[-1] = (node, parent, position + 1, parent_position)
+                    neighbour = indices[position]
+
+                    if discovery[neighbour] < 0:
+                        discovery[neighbour] = low[neighbour] = time
+                        time += 1
+                        stack.append((neighbour, node, indptr[neighbour], position))
+                    elif neighbour != parent:
+                        low[node] = min(low[node], discovery[neighbour])
+                    continue
+
+                stack.pop()
+                if parent >= 0:
+                    low[parent] = min(low[parent], low[node])
+                    if low[node] > discovery[parent] and multiplicity[parent_position] == 1:
+                        bridges.add((int(min(node, parent)), int(max(node, parent))))
+
+        return bridges
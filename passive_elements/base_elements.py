@@ -1,7 +1,9 @@
 from base_elements import Element3Terminals, CompositeElement
-from electrical_values import VoltageVariable, CurrentVariable, PuBase, PuBaseManager, ImmittanceConstant
+from electrical_values import VoltageVariable, CurrentVariable, PuBase, PuBaseManager, ImmittanceConstant, VIResultStore
 from abc import ABC, abstractmethod
-from electrical_relations import calculate_central_v_star, calculate_current, delta2star
+from electrical_relations import (calculate_central_v_star, calculate_current, delta2star,
+                                  calculate_central_v_star_array, calculate_current_array, delta2star_array)
+import numpy as np
 
 
 class PassiveElement3Terminals(Element3Terminals):
@@ -55,6 +57,53 @@ class PassiveElement3Terminals(Element3Terminals):
         pass
 
 
+def calculate_passive_elements_currents_pu(elements: list[PassiveElement3Terminals], seq: str,
+                                           column: int) -> np.ndarray:
+    """
+    Calculates the currents i_mn, i_np, i_mp, i_bus_m, i_bus_n and i_bus_p of many passive elements at once (e.g.
+    thousands of pi sections) in a sequence network, from the voltages of their terminals in a column of the result
+    store.
+
+    The currents of the terminals flow from each terminal to the central point of the star equivalent of the delta mn,
+    np, mp of the element, for all the elements with delta2star_array and calculate_central_v_star_array.
+
+    Args:
+        elements (list[PassiveElement3Terminals]): The elements.
+        seq (str): The sequence network of the branches, 'seq0', 'seq1' or 'seq2'.
+        column (int): The column of the voltages and the currents in the result store (e.g. VIResultStore.PRE_FAULT
+            with the branches of 'seq1').
+
+    Returns:
+        np.ndarray: The currents i_mn, i_np, i_mp, i_bus_m, i_bus_n and i_bus_p of each element, shape (N, 6). They are
+            also defined in the current variables of the elements, where the voltages of their three terminals are.
+    """
+    terminals = [(element.v_bus_m, element.v_bus_n, element.v_bus_p) for element in elements]
+    v_bus_m, v_bus_n, v_bus_p = np.array([[variable.result_store.values[variable.slot, column]
+                                           for variable in variables] for variables in terminals],
+                                         dtype=complex).reshape(-1, 3).T
+    v_defined = np.array([[variable.result_store.defined[variable.slot, column] for variable in variables]
+                          for variables in terminals], dtype=bool).reshape(-1, 3).all(axis=1)
+    y_mn_pu, y_np_pu, y_mp_pu = np.array([[branch.y_pu for branch in element.admittance_representation(seq)[:3]]
+                                          for element in elements], dtype=complex).reshape(-1, 3).T
+
+    y_m, y_n, y_p = delta2star_array(y_mn_pu, y_np_pu, y_mp_pu)
+    v_central_star = calculate_central_v_star_array(v_bus_m, v_bus_n, v_bus_p, y_m, y_n, y_p)
+
+    i_elements_pu = np.column_stack((calculate_current_array(y_mn_pu, v_bus_m, v_bus_n),
+                                     calculate_current_array(y_np_pu, v_bus_n, v_bus_p),
+                                     calculate_current_array(y_mp_pu, v_bus_m, v_bus_p),
+                                     calculate_current_array(y_m, v_bus_m, v_central_star),
+                                     calculate_current_array(y_n, v_bus_n, v_central_star),
+                                     calculate_current_array(y_p, v_bus_p, v_central_star)))
+
+    for element, i_element_pu, i_defined in zip(elements, i_elements_pu, v_defined):
+        for variable, i_pu in zip((element.i_mn, element.i_np, element.i_mp,
+                                   element.i_bus_m, element.i_bus_n, element.i_bus_p), i_element_pu):
+            variable.result_store.write(variable.slot, column, i_pu, i_defined)
+
+    return i_elements_pu
+
+
 class PassiveElement2Terminals(PassiveElement3Terminals):
     
     def __init__(self, y_series_seq0_pu: complex, y_series_seq1_pu: complex, y_series_seq2_pu: complex, id_bus_m: int,
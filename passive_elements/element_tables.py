@@ -0,0 +1,252 @@
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.transformer_elements import Transformer2Windings
+from passive_elements.generic_elements import ShuntElement
+from electrical_relations import equivalent_y_series_array
+from abc import ABC, abstractmethod
+import numpy as np
+
+GROUNDED_CONNECTIONS = ('Yg', 'Yzn')
+
+
+def _seq0_grounding_admittances(connections: np.ndarray, zn_grounded_pu: np.ndarray) -> np.ndarray:
+    # The seq0 admittance 3 * y_grounded of the neutral grounding of each winding, as Transformer2Windings defines it
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_grounded = np.where(connections == 'Yg', np.inf, 3 / zn_grounded_pu)
+
+    return np.where(np.isin(connections, GROUNDED_CONNECTIONS), y_grounded, 0).astype(complex)
+
+
+class ElementTable(ABC):
+    """
+    Represents many elements of the same type as columns of NumPy arrays, one row per element.
+
+    A table feeds its branches to the bus matrices and the currents of its rows to the results as arrays, without
+    creating the per-unit bases, VIVariables and ImmittanceConstants of one object per element. Each row has one branch
+    per sequence network, the branch mn of the equivalent element (the other two are always open). A row can still be
+    looked at as an object of the equivalent element class, a copy created on demand from its parameters (see row).
+
+    Attributes:
+        id_buses_m (np.ndarray): The bus id of the terminal m of each row.
+        id_buses_n (np.ndarray): The bus id of the terminal n of each row, 0 for elements with one terminal.
+    """
+
+    element_class = None
+
+    def __init__(self, id_buses_m, id_buses_n):
+        self.id_buses_m = np.asarray(id_buses_m, dtype=np.int64)
+        self.id_buses_n = np.broadcast_to(np.asarray(id_buses_n, dtype=np.int64), self.id_buses_m.shape).copy()
+
+    def __len__(self):
+        return len(self.id_buses_m)
+
+    def _column(self, values, dtype=complex) -> np.ndarray:
+        # A parameter given for every row or once for all rows
+        return np.broadcast_to(np.asarray(values, dtype=dtype), self.id_buses_m.shape).copy()
+
+    def terminals(self) -> np.ndarray:
+        """
+        Returns the bus ids of the terminals m, n and p of each row, shape (rows, 3).
+        """
+        return np.column_stack((self.id_buses_m, self.id_buses_n, np.zeros(len(self), dtype=np.int64)))
+
+    def branch_terminals(self, seq: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the bus ids of both terminals of the branch of each row in the given sequence network.
+        """
+        return self.id_buses_m, self.id_buses_n
+
+    @abstractmethod
+    def admittances_pu(self, seq: str, z_bases: np.ndarray) -> np.ndarray:
+        """
+        Returns the admittance of the branch of each row in the given sequence network, in pu of the base of its bus m.
+
+        Args:
+            seq (str): The sequence network ('seq0', 'seq1' or 'seq2').
+            z_bases (np.ndarray): The impedance base of each bus, indexed by bus id.
+        """
+        pass
+
+    def base_propagation_edges(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the bus ids of both ends of each edge the voltage bases propagate through, and the ratios
+        v_base(to) / v_base(from), see base_propagation_edges.
+        """
+        joins_buses = (self.id_buses_m != 0) & (self.id_buses_n != 0) & (self.id_buses_m != self.id_buses_n)
+
+        return (self.id_buses_m[joins_buses], self.id_buses_n[joins_buses],
+                np.ones(np.count_nonzero(joins_buses), dtype=float))
+
+    @abstractmethod
+    def row_arguments(self, index: int) -> tuple:
+        """
+        Returns the arguments of element_class equivalent to the given row.
+        """
+        pass
+
+    def row(self, index: int):
+        """
+        Returns a new element_class object with the parameters of the given row, e.g. to use the methods of the element
+        classes on it.
+
+        The object is a copy, not a view of the row: changing its parameters doesn't change the table, and each call
+        creates another object (with its own per-unit bases and VIVariables). The network keeps using the table, so
+        adding the object to a network as well would duplicate the element.
+        """
+        return self.element_class(*self.row_arguments(index))
+
+    def __getitem__(self, index: int):
+        return self.row(index)
+
+
+class LineTable(ElementTable):
+    """
+    Represents transmission lines as columns, the rows being equivalent to TransmissionLine objects.
+
+    Attributes:
+        z_series_seq0_ohm_per_km_si (np.ndarray): The seq0 series impedance of each line in ohm/km.
+        z_series_seq1_ohm_per_km_si (np.ndarray): The seq1 series impedance of each line in ohm/km.
+        z_series_seq2_ohm_per_km_si (np.ndarray): The seq2 series impedance of each line in ohm/km.
+        line_length_km (np.ndarray): The length of each line in km.
+    """
+
+    element_class = TransmissionLine
+
+    def __init__(self, z_series_seq0_ohm_per_km_si, z_series_seq1_ohm_per_km_si, z_series_seq2_ohm_per_km_si,
+                 line_length_km, id_buses_m, id_buses_n):
+        super().__init__(id_buses_m, id_buses_n)
+
+        self.z_series_seq0_ohm_per_km_si = self._column(z_series_seq0_ohm_per_km_si)
+        self.z_series_seq1_ohm_per_km_si = self._column(z_series_seq1_ohm_per_km_si)
+        self.z_series_seq2_ohm_per_km_si = self._column(z_series_seq2_ohm_per_km_si)
+        self.line_length_km = self._column(line_length_km, float)
+
+    def admittances_pu(self, seq: str, z_bases: np.ndarray) -> np.ndarray:
+        z_series_ohm_per_km_si = getattr(self, 'z_series_' + seq + '_ohm_per_km_si')
+
+        # A null impedance is an ideal branch, as in ImmittanceConstant.defined_by_impedance
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(z_series_ohm_per_km_si == 0, np.inf,
+                            z_bases[self.id_buses_m] / (z_series_ohm_per_km_si * self.line_length_km))
+
+    def row_arguments(self, index: int) -> tuple:
+        return (complex(self.z_series_seq0_ohm_per_km_si[index]), complex(self.z_series_seq1_ohm_per_km_si[index]),
+                complex(self.z_series_seq2_ohm_per_km_si[index]), float(self.line_length_km[index]),
+                int(self.id_buses_m[index]), int(self.id_buses_n[index]))
+
+
+class ShuntTable(ElementTable):
+    """
+    Represents shunt elements as columns, the rows being equivalent to ShuntElement objects.
+
+    Attributes:
+        y_series_seq0_ohm_si (np.ndarray): The seq0 admittance of each shunt in S.
+        y_series_seq1_ohm_si (np.ndarray): The seq1 admittance of each shunt in S.
+        y_series_seq2_ohm_si (np.ndarray): The seq2 admittance of each shunt in S.
+    """
+
+    element_class = ShuntElement
+
+    def __init__(self, y_series_seq0_ohm_si, y_series_seq1_ohm_si, y_series_seq2_ohm_si, id_buses_m):
+        super().__init__(id_buses_m, 0)
+
+        self.y_series_seq0_ohm_si = self._column(y_series_seq0_ohm_si)
+        self.y_series_seq1_ohm_si = self._column(y_series_seq1_ohm_si)
+        self.y_series_seq2_ohm_si = self._column(y_series_seq2_ohm_si)
+
+    def admittances_pu(self, seq: str, z_bases: np.ndarray) -> np.ndarray:
+        return z_bases[self.id_buses_m] * getattr(self, 'y_series_' + seq + '_ohm_si')
+
+    def row_arguments(self, index: int) -> tuple:
+        return (complex(self.y_series_seq0_ohm_si[index]), complex(self.y_series_seq1_ohm_si[index]),
+                complex(self.y_series_seq2_ohm_si[index]), int(self.id_buses_m[index]))
+
+
+class TransformerTable(ElementTable):
+    """
+    Represents two-winding transformers as columns, the rows being equivalent to Transformer2Windings objects.
+
+    The seq0 branch of each row depends on its connections as in Transformer2Windings: between the buses m and n when
+    both windings are grounded stars, from the grounded star to the ground when the other winding is a delta, and open
+    otherwise.
+
+    Attributes:
+        z_series_pu (np.ndarray): The series impedance of each transformer in pu of its nominal values.
+        v_nom_pri_kv (np.ndarray): The nominal voltage of the primary of each transformer in kV.
+        v_nom_sec_kv (np.ndarray): The nominal voltage of the secondary of each transformer in kV.
+        s_nom_mva (np.ndarray): The nominal power of each transformer in MVA.
+        primary_connections (np.ndarray): The connection of the primary of each transformer ('Yg', 'Yzn', 'Y', 'Yn'
+            or 'D').
+        secondary_connections (np.ndarray): The connection of the secondary of each transformer.
+        delays_pri2sec (np.ndarray): The phase shift from the primary to the secondary of each transformer.
+        taps_primary (np.ndarray): The tap of the primary of each transformer.
+        taps_secondary (np.ndarray): The tap of the secondary of each transformer.
+        zn_grounded_primary_pu (np.ndarray): The neutral grounding impedance of the primary ('Yzn') in pu.
+        zn_grounded_secondary_pu (np.ndarray): The neutral grounding impedance of the secondary ('Yzn') in pu.
+    """
+
+    element_class = Transformer2Windings
+
+    def __init__(self, z_series_pu, id_buses_m, id_buses_n, v_nom_pri_kv, v_nom_sec_kv, s_nom_mva,
+                 primary_connections, secondary_connections, delays_pri2sec, taps_primary=1, taps_secondary=1,
+                 zn_grounded_primary_pu=0 + 0j, zn_grounded_secondary_pu=0 + 0j):
+        super().__init__(id_buses_m, id_buses_n)
+
+        self.z_series_pu = self._column(z_series_pu)
+        self.v_nom_pri_kv = self._column(v_nom_pri_kv, float)
+        self.v_nom_sec_kv = self._column(v_nom_sec_kv, float)
+        self.s_nom_mva = self._column(s_nom_mva, float)
+        self.primary_connections = self._column(primary_connections, str)
+        self.secondary_connections = self._column(secondary_connections, str)
+        self.delays_pri2sec = self._column(delays_pri2sec, float)
+        self.taps_primary = self._column(taps_primary, float)
+        self.taps_secondary = self._column(taps_secondary, float)
+        self.zn_grounded_primary_pu = self._column(zn_grounded_primary_pu)
+        self.zn_grounded_secondary_pu = self._column(zn_grounded_secondary_pu)
+
+        primary_grounded = np.isin(self.primary_connections, GROUNDED_CONNECTIONS)
+        secondary_grounded = np.isin(self.secondary_connections, GROUNDED_CONNECTIONS)
+        # The seq0 branch goes to the ground from a grounded star facing a delta
+        self._seq0_to_ground_m = primary_grounded & (self.secondary_connections == 'D')
+        self._seq0_to_ground_n = secondary_grounded & (self.primary_connections == 'D')
+        self._seq0_closed = (primary_grounded & secondary_grounded) | self._seq0_to_ground_m | self._seq0_to_ground_n
+
+    def branch_terminals(self, seq: str) -> tuple[np.ndarray, np.ndarray]:
+        if seq != 'seq0':
+            return self.id_buses_m, self.id_buses_n
+
+        return (np.where(self._seq0_to_ground_n, 0, self.id_buses_m),
+                np.where(self._seq0_to_ground_m, 0, self.id_buses_n))
+
+    def _admittances_nominal_pu(self, seq: str) -> np.ndarray:
+        # The admittances in pu of the nominal values of each transformer
+        y_series_pu = 1 / self.z_series_pu
+        if seq != 'seq0':
+            return y_series_pu
+
+        y_grounded_primary = _seq0_grounding_admittances(self.primary_connections, self.zn_grounded_primary_pu)
+        y_grounded_secondary = _seq0_grounding_admittances(self.secondary_connections, self.zn_grounded_secondary_pu)
+
+        y_series_seq0_pu = np.where(self._seq0_to_ground_n, y_series_pu,
+                                    equivalent_y_series_array(y_series_pu, y_grounded_primary))
+        y_series_seq0_pu = np.where(self._seq0_to_ground_m, y_series_seq0_pu,
+                                    equivalent_y_series_array(y_series_seq0_pu, y_grounded_secondary))
+
+        return np.where(self._seq0_closed, y_series_seq0_pu, 0)
+
+    def admittances_pu(self, seq: str, z_bases: np.ndarray) -> np.ndarray:
+        z_bases_nominal = (self.v_nom_pri_kv * self.taps_primary * 1000) ** 2 / (self.s_nom_mva * 10 ** 6)
+
+        return self._admittances_nominal_pu(seq) * z_bases[self.id_buses_m] / z_bases_nominal
+
+    def base_propagation_edges(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        joins_buses = (self.id_buses_m != 0) & (self.id_buses_n != 0) & (self.id_buses_m != self.id_buses_n)
+
+        return (self.id_buses_m[joins_buses], self.id_buses_n[joins_buses],
+                self.v_nom_sec_kv[joins_buses] / self.v_nom_pri_kv[joins_buses])
+
+    def row_arguments(self, index: int) -> tuple:
+        return (complex(self.z_series_pu[index]), int(self.id_buses_m[index]), int(self.id_buses_n[index]),
+                float(self.v_nom_pri_kv[index]), float(self.v_nom_sec_kv[index]), float(self.s_nom_mva[index]),
+                str(self.primary_connections[index]), str(self.secondary_connections[index]),
+                float(self.delays_pri2sec[index]), float(self.taps_primary[index]), float(self.taps_secondary[index]),
+                complex(self.zn_grounded_primary_pu[index]), complex(self.zn_grounded_secondary_pu[index]))
@@ -1,6 +1,7 @@
 from passive_elements.base_elements import PassiveElement2Terminals, PassiveElement1Terminal
-from electrical_values import PuBase, ImmittanceConstant
+from electrical_values import PuBase, ImmittanceConstant, query_values
 from electrical_relations import calculate_current
+import numpy as np
 
 
 class SeriesElement(PassiveElement2Terminals):
@@ -87,3 +88,72 @@ class ShuntElement(PassiveElement1Terminal):
         i_seq2_pu = calculate_current(y_pu, v_bus_m, 0)
 
         self.i_bus_m.define_values_pos_fault_pu(i_seq0_pu, i_seq1_pu, i_seq2_pu)
+
+
+class BusCoupler(PassiveElement2Terminals):
+    """
+    An ideal connection between two buses, such as a bus coupler, a jumper or a closed breaker.
+
+    Its branches have infinite admittance, so the two buses become a single node when the bus matrices are built,
+    instead of being joined by a penalty admittance. The voltages of its buses are equal, so its current is calculated
+    from Kirchhoff's current law at the bus m: the current it takes from the bus is the current injected at the bus
+    minus the currents the other elements take from it. Network.calculate_element_currents_pos_fault_pu does the same
+    for every ideal branch at once (see IdealBranchCurrents).
+    """
+
+    def __init__(self, id_bus_m: int, id_bus_n: int):
+        pu_base: PuBase = PuBase.default()
+
+        super().__init__(float('inf'), float('inf'), float('inf'), id_bus_m, id_bus_n, pu_base.v_base, pu_base.v_base,
+                         pu_base.s_base)
+
+    def _define_seq0_topology(self, y_series_mn_seq0_pu: complex, y_series_np_seq0_pu: complex,
+                              y_series_mp_seq0_pu: complex):
+        self.branches_seq0 = [ImmittanceConstant(y_series_mn_seq0_pu, self.base_m, self.id_bus_m, self.id_bus_n),
+                              ImmittanceConstant(0, self.base_m, self.id_bus_n, self.id_bus_p),
+                              ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_p)]
+
+    def _bus_m_currents(self, elements: list, time: str) -> np.ndarray:
+        # The seq0, seq1 and seq2 currents the other elements take from the bus m, through each of their terminals
+        # at it
+        currents = [current for element in elements if element is not self
+                    for id_bus, current in ((element.id_bus_m, element.i_bus_m), (element.id_bus_n, element.i_bus_n),
+                                            (element.id_bus_p, element.i_bus_p))
+                    if id_bus == self.id_bus_m]
+
+        return np.array([query_values(currents, time, seq, 'pu', 'rec').sum() for seq in ('seq0', 'seq1', 'seq2')])
+
+    def calculate_internal_currents_pre_fault_pu(self, elements: list = (), i_injected_pu: complex = 0):
+        """
+        Calculates the pre-fault current of the coupler by Kirchhoff's current law at its bus m.
+
+        Args:
+            elements (list): The other elements connected to the bus m, with their pre-fault currents calculated.
+            i_injected_pu (complex): The current injected at the bus m from outside the elements (e.g. the load of a
+                load flow).
+        """
+        i_pu = complex(i_injected_pu - self._bus_m_currents(elements, 'pre')[1])
+
+        self.i_mn.define_value_pre_fault_pu(i_pu)
+        self.i_np.define_value_pre_fault_pu(0)
+        self.i_mp.define_value_pre_fault_pu(0)
+
+        self.i_bus_m.define_value_pre_fault_pu(i_pu)
+        self.i_bus_n.define_value_pre_fault_pu(-i_pu)
+        self.i_bus_p.define_value_pre_fault_pu(0)
+
+    def calculate_internal_currents_pos_fault_pu(self, elements: list = (), i_injected_seq_pu=(0, 0, 0)):
+        """
+        Calculates the seq0, seq1 and seq2 post-fault currents of the coupler by Kirchhoff's current law at its bus m.
+
+        Args:
+            elements (list): The other elements connected to the bus m, with their post-fault currents calculated.
+            i_injected_seq_pu: The seq0, seq1 and seq2 currents injected at the bus m from outside the elements (e.g.
+                -I_f if the fault is at the bus m).
+        """
+        i_seq0_pu, i_seq1_pu, i_seq2_pu = (complex(i_pu) for i_pu in
+                                           np.asarray(i_injected_seq_pu) - self._bus_m_currents(elements, 'pos'))
+
+        self.i_mn.define_values_pos_fault_pu(i_seq0_pu, i_seq1_pu, i_seq2_pu)
+        self.i_bus_m.define_values_pos_fault_pu(i_seq0_pu, i_seq1_pu, i_seq2_pu)
+        self.i_bus_n.define_values_pos_fault_pu(-i_seq0_pu, -i_seq1_pu, -i_seq2_pu)
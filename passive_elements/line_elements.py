@@ -56,74 +56,27 @@ class TransmissionLinePiModel(PassiveElement3Terminals):
                               ImmittanceConstant(y_series_mp_seq0_pu, self.base_m, self.id_bus_m, self.id_bus_p)]
 
     def calculate_internal_currents_pos_fault_pu(self):
-
-        v_bus_m = self.v_bus_m.pos().seq0().pu().rec()
-        v_bus_n = self.v_bus_n.pos().seq0().pu().rec()
-        v_bus_p = self.v_bus_p.pos().seq0().pu().rec()
-
-        y_mn_pu = self.branches_seq0[0].y_pu
-        y_np_pu = self.branches_seq0[1].y_pu
-        y_mp_pu = self.branches_seq0[2].y_pu
-
-        i_mn_seq0_pu = calculate_current(y_mn_pu, v_bus_m, v_bus_n)
-        i_np_seq0_pu = calculate_current(y_np_pu, v_bus_n, v_bus_p)
-        i_mp_seq0_pu = calculate_current(y_mp_pu, v_bus_m, v_bus_p)
-
-        y_m, y_n, y_p = delta2star(y_mn_pu, y_np_pu, y_mp_pu)
-
-        v_central_star = calculate_central_v_star(v_bus_m, v_bus_n, v_bus_p, y_m, y_n, y_p)
-
-        i_bus_m_seq0_pu = calculate_current(y_m, v_bus_m, v_central_star)
-        i_bus_n_seq0_pu = calculate_current(y_n, v_central_star, v_bus_n)
-        i_bus_p_seq0_pu = calculate_current(y_p, v_central_star, v_bus_p)
-
-        v_bus_m = self.v_bus_m.pos().seq1().pu().rec()
-        v_bus_n = self.v_bus_n.pos().seq1().pu().rec()
-        v_bus_p = self.v_bus_p.pos().seq1().pu().rec()
-
-        y_mn_pu = self.branches_seq1[0].y_pu
-        y_np_pu = self.branches_seq1[1].y_pu
-        y_mp_pu = self.branches_seq1[2].y_pu
-
-        i_mn_seq1_pu = calculate_current(y_mn_pu, v_bus_m, v_bus_n)
-        i_np_seq1_pu = calculate_current(y_np_pu, v_bus_n, v_bus_p)
-        i_mp_seq1_pu = calculate_current(y_mp_pu, v_bus_m, v_bus_p)
-
-        y_m, y_n, y_p = delta2star(y_mn_pu, y_np_pu, y_mp_pu)
-
-        v_central_star = calculate_central_v_star(v_bus_m, v_bus_n, v_bus_p, y_m, y_n, y_p)
-
-        i_bus_m_seq1_pu = calculate_current(y_m, v_bus_m, v_central_star)
-        i_bus_n_seq1_pu = calculate_current(y_n, v_central_star, v_bus_n)
-        i_bus_p_seq1_pu = calculate_current(y_p, v_central_star, v_bus_p)
-
-        v_bus_m = self.v_bus_m.pos().seq2().pu().rec()
-        v_bus_n = self.v_bus_n.pos().seq2().pu().rec()
-        v_bus_p = self.v_bus_p.pos().seq2().pu().rec()
-
-        y_mn_pu = self.branches_seq2[0].y_pu
-        y_np_pu = self.branches_seq2[1].y_pu
-        y_mp_pu = self.branches_seq2[2].y_pu
-
-        i_mn_seq2_pu = calculate_current(y_mn_pu, v_bus_m, v_bus_n)
-        i_np_seq2_pu = calculate_current(y_np_pu, v_bus_n, v_bus_p)
-        i_mp_seq2_pu = calculate_current(y_mp_pu, v_bus_m, v_bus_p)
-
-        y_m, y_n, y_p = delta2star(y_mn_pu, y_np_pu, y_mp_pu)
-
-        v_central_star = calculate_central_v_star(v_bus_m, v_bus_n, v_bus_p, y_m, y_n, y_p)
-
-        i_bus_m_seq2_pu = calculate_current(y_m, v_bus_m, v_central_star)
-        i_bus_n_seq2_pu = calculate_current(y_n, v_bus_n, v_central_star)
-        i_bus_p_seq2_pu = calculate_current(y_p, v_bus_p, v_central_star)
-
-        self.i_mn.define_values_pos_fault_pu(i_mn_seq0_pu, i_mn_seq1_pu, i_mn_seq2_pu)
-        self.i_np.define_values_pos_fault_pu(i_np_seq0_pu, i_np_seq1_pu, i_np_seq2_pu)
-        self.i_mp.define_values_pos_fault_pu(i_mp_seq0_pu, i_mp_seq1_pu, i_mp_seq2_pu)
-
-        self.i_bus_m.define_values_pos_fault_pu(i_bus_m_seq0_pu, i_bus_m_seq1_pu, i_bus_m_seq2_pu)
-        self.i_bus_n.define_values_pos_fault_pu(i_bus_n_seq0_pu, i_bus_n_seq1_pu, i_bus_n_seq2_pu)
-        self.i_bus_p.define_values_pos_fault_pu(i_bus_p_seq0_pu, i_bus_p_seq1_pu, i_bus_p_seq2_pu)
+        # The currents i_mn, i_np, i_mp, i_bus_m, i_bus_n and i_bus_p of each sequence, the currents of the terminals
+        # flowing from each terminal to the central point of the star equivalent
+        i_seqs_pu = []
+        for seq, v_bus_m, v_bus_n, v_bus_p in zip(('seq0', 'seq1', 'seq2'), self.v_bus_m.pos().seq_values,
+                                                  self.v_bus_n.pos().seq_values, self.v_bus_p.pos().seq_values):
+            y_mn_pu, y_np_pu, y_mp_pu = (branch.y_pu for branch in self.admittance_representation(seq))
+
+            y_m, y_n, y_p = delta2star(y_mn_pu, y_np_pu, y_mp_pu)
+
+            v_central_star = calculate_central_v_star(v_bus_m, v_bus_n, v_bus_p, y_m, y_n, y_p)
+
+            i_seqs_pu.append((calculate_current(y_mn_pu, v_bus_m, v_bus_n),
+                              calculate_current(y_np_pu, v_bus_n, v_bus_p),
+                              calculate_current(y_mp_pu, v_bus_m, v_bus_p),
+                              calculate_current(y_m, v_bus_m, v_central_star),
+                              calculate_current(y_n, v_bus_n, v_central_star),
+                              calculate_current(y_p, v_bus_p, v_central_star)))
+
+        for variable, i_pu in zip((self.i_mn, self.i_np, self.i_mp, self.i_bus_m, self.i_bus_n, self.i_bus_p),
+                                  zip(*i_seqs_pu)):
+            variable.define_values_pos_fault_pu(*i_pu)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,41 @@
 from passive_elements.base_elements import PassiveElement2Terminals, PassiveElement3Terminals, PassiveElement1Terminal
-from electrical_values import ImmittanceConstant
-from electrical_relations import (calculate_current, star2delta, delta2star,
-                                  equivalent_y_series, calculate_admittance_matrix_mnp_directly)
+from base_elements import BRANCH_TERMINALS
+from electrical_values import ImmittanceConstant, PuBaseManager, VIResultStore
+from electrical_relations import calculate_current, star2delta, delta2star, equivalent_y_series
 import numpy as np
 
+# How each winding connection behaves in the zero sequence: grounded star (G), delta (D) or ungrounded star (Y)
+SEQ0_WINDING_CODES = {'Yg': 'G', 'Yzn': 'G', 'D': 'D', 'Y': 'Y', 'Yn': 'Y'}
+
+# Terminal of a seq0 branch of a Transformer3Windings at the ground
+GROUND = None
+STAR2DELTA = 'star2delta'
+
+# The seq0 branches mn, np and mp of a Transformer3Windings for each triple of winding codes (primary, secondary,
+# tertiary), as (admittances, terminals). The admittances come from the star admittances y_m, y_n and y_p (those of
+# grounded windings in series with 3 times their grounding admittance) either all at once by star2delta, or one by one
+# from a rule (winding, other windings): the winding in series with the other windings in parallel, None meaning an
+# open branch. The terminals are 0, 1 and 2 for m, n and p. The triples missing have every branch open.
+SEQ0_TOPOLOGIES_3WINDINGS = {
+    ('G', 'G', 'G'): (STAR2DELTA, ((0, 1), (1, 2), (0, 2))),
+    ('G', 'G', 'D'): (STAR2DELTA, ((0, 1), (1, GROUND), (0, GROUND))),
+    ('G', 'G', 'Y'): (((0, (1,)), None, None), ((0, 1), (1, GROUND), (0, GROUND))),
+    ('G', 'D', 'G'): (STAR2DELTA, ((0, GROUND), (GROUND, 2), (0, 2))),
+    ('G', 'D', 'D'): (((0, (1, 2)), None, None), ((0, GROUND), (1, 2), (0, 2))),
+    ('G', 'D', 'Y'): (((0, (1,)), None, None), ((0, GROUND), (1, 2), (0, 2))),
+    ('G', 'Y', 'G'): ((None, None, (0, (2,))), ((0, 1), (1, 2), (0, 2))),
+    ('G', 'Y', 'D'): ((None, None, (0, (2,))), ((0, 1), (1, 2), (0, GROUND))),
+    ('D', 'G', 'G'): (STAR2DELTA, ((GROUND, 1), (1, 2), (GROUND, 2))),
+    ('D', 'G', 'D'): ((None, (1, (0, 2)), None), ((0, 1), (1, GROUND), (0, 2))),
+    ('D', 'G', 'Y'): ((None, (1, (0,)), None), ((0, 1), (1, GROUND), (0, 2))),
+    ('D', 'D', 'G'): ((None, None, (2, (0, 1))), ((0, 1), (1, 2), (GROUND, 2))),
+    ('D', 'Y', 'G'): ((None, None, (0, (2,))), ((0, 1), (1, 2), (GROUND, 2))),
+    ('Y', 'G', 'G'): ((None, (1, (2,)), None), ((0, 1), (1, 2), (0, 2))),
+    ('Y', 'G', 'D'): ((None, (1, (2,)), None), ((0, 1), (1, GROUND), (0, 2))),
+    ('Y', 'D', 'G'): ((None, None, (2, (1,))), ((0, 1), (1, 2), (GROUND, 2))),
+}
+_SEQ0_OPEN_3WINDINGS = ((None, None, None), ((0, 1), (1, 2), (0, 2)))
+
 
 class Transformer2Windings(PassiveElement2Terminals):
 
@@ -17,20 +49,27 @@ class Transformer2Windings(PassiveElement2Terminals):
         self.connections = (primary_connection, secondary_connection)
         self.delay_pri2sec = delay_pri2sec
 
+        self.v_nom_pri_kv = v_nom_pri_kv
+        self.v_nom_sec_kv = v_nom_sec_kv
+
+        # The grounding admittances are needed by _define_seq0_topology, which runs inside super().__init__, so the
+        # primary base is fetched here (it is the same base the element gets afterwards)
+        base_m = PuBaseManager.create_pu_base(v_nom_pri_kv * tap_primary * 1000, s_nom_mva * (10**6), id_bus_m)
+
+        y_grounded = [None, None]
+        zn_grounded = (zn_grounded_primary_pu, zn_grounded_secondary_pu)
         for index, connection in enumerate(self.connections):
-            self.y_grounded_primary, self.y_grounded_secondary = None, None
-            y_grounded = [self.y_grounded_primary, self.y_grounded_secondary]
-            zn_grounded = (zn_grounded_primary_pu, zn_grounded_secondary_pu)
             if connection == 'Yg':
-                y_grounded[index] = ImmittanceConstant(float('inf'), self.base_m, 0, 0)
+                y_grounded[index] = ImmittanceConstant(float('inf'), base_m, 0, 0)
             elif connection == 'Yzn':
-                y_grounded[index] = ImmittanceConstant(zn_grounded[index] ** (-1), self.base_m,
+                y_grounded[index] = ImmittanceConstant(zn_grounded[index] ** (-1), base_m,
                                                        0, 0)
             elif (connection == 'Y') or (connection == 'Yn') or (connection == 'D'):
-                y_grounded[index] = ImmittanceConstant(0, self.base_m, 0, 0)
+                y_grounded[index] = ImmittanceConstant(0, base_m, 0, 0)
             else:
                 # ! exception here:
                 pass
+        self.y_grounded_primary, self.y_grounded_secondary = y_grounded
         # ! Raise an exception if tap is complex
 
         super().__init__(z_series_pu ** (-1), z_series_pu ** (-1), z_series_pu ** (-1),
@@ -43,37 +82,37 @@ class Transformer2Windings(PassiveElement2Terminals):
         if (self.primary_connection == "Yg") or (self.primary_connection == 'Yzn'):
             y_series_seq0_pu = equivalent_y_series(y_series_seq0_pu, 3 * self.y_grounded_primary.y_pu)
 
-            if (self.primary_connection == "Yg") or (self.primary_connection == 'Yzn'):
+            if (self.secondary_connection == "Yg") or (self.secondary_connection == 'Yzn'):
                 y_series_seq0_pu = equivalent_y_series(y_series_seq0_pu, 3 * self.y_grounded_secondary.y_pu)
 
                 self.branches_seq0 = [ImmittanceConstant(y_series_seq0_pu, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n)]
 
-            elif self.primary_connection == "D":
+            elif self.secondary_connection == "D":
                 self.branches_seq0 = [ImmittanceConstant(y_series_seq0_pu, self.base_m, self.id_bus_m, 0),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n)]
 
-            elif (self.primary_connection == "Y") or (self.primary_connection == "Yn"):
+            elif (self.secondary_connection == "Y") or (self.secondary_connection == "Yn"):
                 self.branches_seq0 = [ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n)]
 
         elif self.primary_connection == "D":
-            if (self.primary_connection == "Yg") or (self.primary_connection == 'Yzn'):
+            if (self.secondary_connection == "Yg") or (self.secondary_connection == 'Yzn'):
                 y_series_seq0_pu = equivalent_y_series(y_series_seq0_pu, 3 * self.y_grounded_secondary.y_pu)
 
                 self.branches_seq0 = [ImmittanceConstant(y_series_seq0_pu, self.base_m, 0, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n)]
 
-            elif self.primary_connection == "D":
+            elif self.secondary_connection == "D":
                 self.branches_seq0 = [ImmittanceConstant(0, self.base_m, self.id_bus_m, 0),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n)]
 
-            elif (self.primary_connection == "Y") or (self.primary_connection == "Yn"):
+            elif (self.secondary_connection == "Y") or (self.secondary_connection == "Yn"):
                 self.branches_seq0 = [ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n),
                                       ImmittanceConstant(0, self.base_m, self.id_bus_m, self.id_bus_n)]
@@ -132,30 +171,44 @@ class Transformer3Windings(PassiveElement3Terminals):
         self.delay_pri2sec = delay_pri2sec
         self.delay_pri2ter = delay_pri2ter
 
+        self.v_nom_pri_kv = v_nom_pri_kv
+        self.v_nom_sec_kv = v_nom_sec_kv
+        self.v_nom_ter_kv = v_nom_ter_kv
+
         y_m_pu, y_n_pu, y_p_pu = self._calculate_star_model(z_series_prisec_pu, z_series_priter_pu, z_series_secter_pu)
         y_mn_pu, y_np_pu, y_mp_pu = star2delta(y_m_pu, y_n_pu, y_p_pu)
 
+        # The grounding admittances are needed by _define_seq0_topology, which runs inside super().__init__, so the
+        # primary base is fetched here (it is the same base the element gets afterwards)
+        base_m = PuBaseManager.create_pu_base(v_nom_pri_kv * tap_primary * 1000, s_nom_pri_mva * 10 ** 6, id_bus_m)
+
+        y_grounded = [None, None, None]
+        zn_grounded = (zn_grounded_primary_pu, zn_grounded_secondary_pu, zn_grounded_tertiary_pu)
         for index, connection in enumerate(self.connections):
-            self.y_grounded_primary, self.y_grounded_secondary, self.y_grounded_tertiary = None, None, None
-            y_grounded = [self.y_grounded_primary, self.y_grounded_secondary, self.y_grounded_tertiary]
-            zn_grounded = (zn_grounded_primary_pu, zn_grounded_secondary_pu, zn_grounded_tertiary_pu)
             if connection == 'Yg':
-                y_grounded[index] = ImmittanceConstant(float('inf'), self.base_m, 0, 0)
+                y_grounded[index] = ImmittanceConstant(float('inf'), base_m, 0, 0)
             elif connection == 'Yzn':
-                y_grounded[index] = ImmittanceConstant(zn_grounded[index] ** (-1), self.base_m,
+                y_grounded[index] = ImmittanceConstant(zn_grounded[index] ** (-1), base_m,
                                                        0, 0)
             elif (connection == 'Y') or (connection == 'Yn') or (connection == 'D'):
-                y_grounded[index] = ImmittanceConstant(0, self.base_m, 0, 0)
+                y_grounded[index] = ImmittanceConstant(0, base_m, 0, 0)
             else:
                 # ! exception here:
                 pass
+        self.y_grounded_primary, self.y_grounded_secondary, self.y_grounded_tertiary = y_grounded
         # ! Raise an exception if tap is complex
 
         super().__init__(y_mn_pu, y_mn_pu, y_mn_pu, y_np_pu, y_np_pu, y_np_pu, y_mp_pu, y_mp_pu, y_mp_pu,
                          id_bus_m, id_bus_n, id_bus_p, v_nom_pri_kv * tap_primary * 1000,
                          v_nom_sec_kv * tap_secondary * 1000, v_nom_ter_kv * tap_tertiary * 1000, 
                          s_nom_pri_mva * 10 ** 6)
-        
+
+        # The 3x3 admittance matrix of each sequence, built again only by define_branch_admittances_pu and when the
+        # base of the element changes (z_base_matrices is the z_base of base_m they were built in)
+        self._admittance_matrices = {}
+        self._z_base_matrices = None
+        self._build_admittance_matrices()
+
     def _calculate_star_model(self, z_ps_pu, z_pt_pu, z_st_pu):
         
         y_m_pu = ((1 / 2) * (z_ps_pu + z_pt_pu - z_st_pu)) ** (-1)
@@ -166,345 +219,140 @@ class Transformer3Windings(PassiveElement3Terminals):
 
     def _define_seq0_topology(self, y_series_mn_seq0_pu: complex, y_series_np_seq0_pu: complex,
                               y_series_mp_seq0_pu: complex):
-        y_m, y_n, y_p = delta2star(y_series_mn_seq0_pu, y_series_np_seq0_pu, y_series_mp_seq0_pu)
-        # ! Sequence zero configurations
-        if (self.primary_connection == "Yg") or (self.primary_connection == 'Yzn'):
-            y_m = equivalent_y_series(y_m, 3 * self.y_grounded_primary.y_pu)
-            self._is_primary_Yg_or_Yzn(y_m, y_n, y_p)
-
-        elif self.primary_connection == "D":
-            self._is_primary_D(y_m, y_n, y_p)
-
-        elif (self.primary_connection == "Y") or (self.primary_connection == "Yn"):
-            self._is_primary_Y_or_Yn(y_m, y_n, y_p)
-                
-    def _is_primary_Yg_or_Yzn(self, y_m: complex, y_n: complex, y_p: complex):
-
-        if (self.secondary_connection == "Yg") or (self.secondary_connection == 'Yzn'):
-            y_n = equivalent_y_series(y_n, 3 * self.y_grounded_secondary.y_pu)
-
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-                y_p = equivalent_y_series(y_p, 3 * self.y_grounded_tertiary.y_pu)
-                y_series_mn_seq0_pu, y_series_np_seq0_pu, y_series_mp_seq0_pu = star2delta(y_m, y_n, y_p)
-                self.branches_seq0 = [ImmittanceConstant(y_series_mn_seq0_pu, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(y_series_np_seq0_pu, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-                y_series_mn_seq0_pu, y_series_np_seq0_pu, y_series_mp_seq0_pu = star2delta(y_m, y_n, y_p)
-                self.branches_seq0 = [ImmittanceConstant(y_series_mn_seq0_pu, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(y_series_np_seq0_pu, self.base_m,
-                                                         self.id_bus_n, 0),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         self.id_bus_m, 0)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-                y_series_mn_seq0_pu = equivalent_y_series(y_m, y_n)
-                self.branches_seq0 = [ImmittanceConstant(y_series_mn_seq0_pu, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, 0),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, 0)]
-
-        elif self.secondary_connection == "D":
-
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-                y_p = equivalent_y_series(y_p, 3 * self.y_grounded_tertiary.y_pu)
-                y_series_mn_seq0_pu, y_series_np_seq0_pu, y_series_mp_seq0_pu = star2delta(y_m, y_n, y_p)
-                self.branches_seq0 = [ImmittanceConstant(y_series_mn_seq0_pu, self.base_m,
-                                                         self.id_bus_m, 0),
-                                      ImmittanceConstant(y_series_np_seq0_pu, self.base_m,
-                                                         0, self.id_bus_p),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-                y_parallel = y_n + y_p
-                y_series_mn_seq0_pu = equivalent_y_series(y_m, y_parallel)
-
-                self.branches_seq0 = [ImmittanceConstant(y_series_mn_seq0_pu, self.base_m,
-                                                         self.id_bus_m, 0),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-
-                y_series_mn_seq0_pu = equivalent_y_series(y_m, y_n)
-                self.branches_seq0 = [ImmittanceConstant(y_series_mn_seq0_pu, self.base_m,
-                                                         self.id_bus_m, 0),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-        elif (self.secondary_connection == "Y") or (self.secondary_connection == "Yn"):
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-                y_p = equivalent_y_series(y_p, 3 * self.y_grounded_tertiary.y_pu)
-                y_series_mp_seq0_pu = equivalent_y_series(y_m, y_p)
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-                y_series_mp_seq0_pu = equivalent_y_series(y_m, y_p)
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         self.id_bus_m, 0)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-    def _is_primary_D(self, y_m: complex, y_n: complex, y_p: complex):
-        if (self.secondary_connection == "Yg") or (self.secondary_connection == 'Yzn'):
-            y_n = equivalent_y_series(y_n, 3 * self.y_grounded_secondary.y_pu)
-
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-                y_p = equivalent_y_series(y_p, 3 * self.y_grounded_tertiary.y_pu)
-                y_series_mn_seq0_pu, y_series_np_seq0_pu, y_series_mp_seq0_pu = star2delta(y_m, y_n, y_p)
-                self.branches_seq0 = [ImmittanceConstant(y_series_mn_seq0_pu, self.base_m,
-                                                         0, self.id_bus_n),
-                                      ImmittanceConstant(y_series_np_seq0_pu, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         0, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-                y_parallel = y_m + y_p
-                y_series_np_seq0_pu = equivalent_y_series(y_n, y_parallel)
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(y_series_np_seq0_pu, self.base_m,
-                                                         self.id_bus_n, 0),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-                y_series_np_seq0_pu = equivalent_y_series(y_n, y_m)
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(y_series_np_seq0_pu, self.base_m,
-                                                         self.id_bus_n, 0),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-        elif self.secondary_connection == "D":
-
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-                y_p = equivalent_y_series(y_p, 3 * self.y_grounded_tertiary.y_pu)
-                y_parallel = y_m + y_n
-                y_series_mp_seq0_pu = equivalent_y_series(y_p, y_parallel)
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         0, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-        elif (self.secondary_connection == "Y") or (self.secondary_connection == "Yn"):
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-                y_p = equivalent_y_series(y_p, 3 * self.y_grounded_tertiary.y_pu)
-                y_series_mp_seq0_pu = equivalent_y_series(y_m, y_p)
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         0, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-    def _is_primary_Y_or_Yn(self, y_m: complex, y_n: complex, y_p: complex):
-        if (self.secondary_connection == "Yg") or (self.secondary_connection == 'Yzn'):
-            y_n = equivalent_y_series(y_n, 3 * self.y_grounded_secondary.y_pu)
-
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-                y_p = equivalent_y_series(y_p, 3 * self.y_grounded_tertiary.y_pu)
-                y_series_np_seq0_pu = equivalent_y_series(y_n, y_p)
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(y_series_np_seq0_pu, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-                y_series_np_seq0_pu = equivalent_y_series(y_n, y_p)
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(y_series_np_seq0_pu, self.base_m,
-                                                         self.id_bus_n, 0),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-        elif self.secondary_connection == "D":
-
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-                y_p = equivalent_y_series(y_p, 3 * self.y_grounded_tertiary.y_pu)
-                y_series_mp_seq0_pu = equivalent_y_series(y_p, y_n)
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(y_series_mp_seq0_pu, self.base_m,
-                                                         0, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-        elif (self.secondary_connection == "Y") or (self.secondary_connection == "Yn"):
-            if (self.tertiary_connection == "Yg") or (self.tertiary_connection == 'Yzn'):
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif self.tertiary_connection == "D":
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
-
-            elif (self.tertiary_connection == "Y") or (self.tertiary_connection == "Yn"):
-
-                self.branches_seq0 = [ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_n),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_n, self.id_bus_p),
-                                      ImmittanceConstant(0, self.base_m,
-                                                         self.id_bus_m, self.id_bus_p)]
+        y_star = list(delta2star(y_series_mn_seq0_pu, y_series_np_seq0_pu, y_series_mp_seq0_pu))
 
-    def calculate_internal_currents_pos_fault_pu(self):
-        v_bus_m = self.v_bus_m.pos().seq0().pu().rec()
-        v_bus_n = self.v_bus_n.pos().seq0().pu().rec()
-        v_bus_p = self.v_bus_p.pos().seq0().pu().rec()
-        
-        v_seq0 = np.array([[v_bus_m],
-                           [v_bus_n],
-                           [v_bus_p]])
-        
-        y_matrix_seq0 = calculate_admittance_matrix_mnp_directly(self.branches_seq0,
-                                                                 self.id_bus_m, self.id_bus_n, self.id_bus_p)
-        
-        i_seq0 = np.matmul(y_matrix_seq0, v_seq0)
-
-        v_bus_m = self.v_bus_m.pos().seq1().pu().rec()
-        v_bus_n = self.v_bus_n.pos().seq1().pu().rec()
-        v_bus_p = self.v_bus_p.pos().seq1().pu().rec()
-
-        v_seq1 = np.array([[v_bus_m],
-                           [v_bus_n],
-                           [v_bus_p]])
-
-        y_matrix_seq1 = calculate_admittance_matrix_mnp_directly(self.branches_seq1,
-                                                                 self.id_bus_m, self.id_bus_n, self.id_bus_p)
-
-        i_seq1 = np.matmul(y_matrix_seq1, v_seq1)
+        winding_codes = []
+        y_grounded = (self.y_grounded_primary, self.y_grounded_secondary, self.y_grounded_tertiary)
+        for index, connection in enumerate(self.connections):
+            if connection not in SEQ0_WINDING_CODES:
+                raise ValueError(f"Unknown winding connection '{connection}', expected one of "
+                                 f"{', '.join(SEQ0_WINDING_CODES)}")
 
-        v_bus_m = self.v_bus_m.pos().seq2().pu().rec()
-        v_bus_n = self.v_bus_n.pos().seq2().pu().rec()
-        v_bus_p = self.v_bus_p.pos().seq2().pu().rec()
+            winding_codes.append(SEQ0_WINDING_CODES[connection])
+            if winding_codes[-1] == 'G':
+                y_star[index] = equivalent_y_series(y_star[index], 3 * y_grounded[index].y_pu)
 
-        v_seq2 = np.array([[v_bus_m],
-                           [v_bus_n],
-                           [v_bus_p]])
+        admittance_rules, terminals = SEQ0_TOPOLOGIES_3WINDINGS.get(tuple(winding_codes), _SEQ0_OPEN_3WINDINGS)
 
-        y_matrix_seq2 = calculate_admittance_matrix_mnp_directly(self.branches_seq2,
-                                                                 self.id_bus_m, self.id_bus_n, self.id_bus_p)
+        if admittance_rules == STAR2DELTA:
+            y_branches_seq0_pu = star2delta(*y_star)
+        else:
+            y_branches_seq0_pu = []
+            for rule in admittance_rules:
+                if rule is None:
+                    y_branches_seq0_pu.append(0)
+                else:
+                    winding, other_windings = rule
+                    y_others = y_star[other_windings[0]]
+                    for other_winding in other_windings[1:]:
+                        y_others = y_others + y_star[other_winding]
+                    y_branches_seq0_pu.append(equivalent_y_series(y_star[winding], y_others))
+
+        id_buses = (self.id_bus_m, self.id_bus_n, self.id_bus_p)
+        self.branches_seq0 = [ImmittanceConstant(y_branch_pu, self.base_m,
+                                                 *[0 if terminal == GROUND else id_buses[terminal]
+                                                   for terminal in branch_terminals])
+                              for y_branch_pu, branch_terminals in zip(y_branches_seq0_pu, terminals)]
+
+    def _build_admittance_matrices(self):
+        id_buses = (self.id_bus_m, self.id_bus_n, self.id_bus_p)
+        for seq in ('seq0', 'seq1', 'seq2'):
+            y_matrix = np.zeros((3, 3), dtype=complex)
+            for (terminal_a, terminal_b), branch in zip(BRANCH_TERMINALS, self.admittance_representation(seq)):
+                # The branches are in the positions mn, np and mp, the seq1 branch mp stored from p to m, and a
+                # terminal at the ground (id 0) takes the place of the terminal of its position
+                ends = (branch.id_bus_m, branch.id_bus_n)
+                if ends == (id_buses[terminal_b], id_buses[terminal_a]) != (id_buses[terminal_a], id_buses[terminal_b]):
+                    ends = ends[::-1]
+
+                connected = [terminal for terminal, id_bus in zip((terminal_a, terminal_b), ends) if id_bus != 0]
+                for terminal in connected:
+                    y_matrix[terminal, terminal] += branch.y_pu
+                if len(connected) == 2:
+                    y_matrix[terminal_a, terminal_b] -= branch.y_pu
+                    y_matrix[terminal_b, terminal_a] -= branch.y_pu
+
+            self._admittance_matrices[seq] = y_matrix
+
+        self._z_base_matrices = self.base_m.z_base
+
+    def admittance_matrix_pu(self, seq: str) -> np.ndarray:
+        """
+        Returns the 3x3 admittance matrix of a sequence network between the terminals m, n and p (i_mnp = Y @ v_mnp).
+
+        The matrices are built with the element and cached. They are built again when the base of the element
+        changes (e.g. when it is added to a network) and when define_branch_admittances_pu changes the branches.
+
+        Args:
+            seq (str): The sequence network, 'seq0', 'seq1' or 'seq2'.
+
+        Returns:
+            np.ndarray: The admittance matrix in pu, shape (3, 3).
+        """
+        if self.base_m.z_base != self._z_base_matrices:
+            self._build_admittance_matrices()
+
+        return self._admittance_matrices[seq]
+
+    def define_branch_admittances_pu(self, seq: str, y_mn_pu: complex, y_np_pu: complex, y_mp_pu: complex):
+        """
+        Changes the admittances of the branches mn, np and mp of a sequence network, in pu of the current base of
+        the element, and builds the admittance matrices again.
+        """
+        for branch, y_pu in zip(self.admittance_representation(seq), (y_mn_pu, y_np_pu, y_mp_pu)):
+            branch.y_pu = y_pu
+
+        self._build_admittance_matrices()
 
-        i_seq2 = np.matmul(y_matrix_seq2, v_seq2)
-        
-        self.i_bus_m.define_values_pos_fault_pu(i_seq0[0][0], i_seq1[0][0], i_seq2[0][0])
-        self.i_bus_n.define_values_pos_fault_pu(i_seq0[1][0], i_seq1[1][0], i_seq2[1][0])
-        self.i_bus_p.define_values_pos_fault_pu(i_seq0[2][0], i_seq1[2][0], i_seq2[2][0])
+    def calculate_internal_currents_pos_fault_pu(self):
+        v_terminals_pu = np.array([self.v_bus_m.pos().seq_values, self.v_bus_n.pos().seq_values,
+                                   self.v_bus_p.pos().seq_values])
+
+        i_terminals_pu = np.column_stack([self.admittance_matrix_pu(seq) @ v_terminals_pu[:, position]
+                                          for position, seq in enumerate(('seq0', 'seq1', 'seq2'))])
+
+        self.i_bus_m.define_values_pos_fault_pu(*i_terminals_pu[0])
+        self.i_bus_n.define_values_pos_fault_pu(*i_terminals_pu[1])
+        self.i_bus_p.define_values_pos_fault_pu(*i_terminals_pu[2])
+
+
+def calculate_transformers_3windings_currents_pos_fault_pu(transformers: list[Transformer3Windings]) -> np.ndarray:
+    """
+    Calculates the post-fault currents i_bus_m, i_bus_n and i_bus_p of many three winding transformers at once, from
+    the post-fault voltages of their terminals.
+
+    The cached 3x3 admittance matrices of the transformers are stacked per sequence, shape (N, 3, 3), and multiplied
+    by the stacked terminal voltages, shape (N, 3), with one einsum. Network.calculate_internal_currents_pos_fault_pu
+    calls it once with all the three winding transformers of the network.
+
+    Args:
+        transformers (list[Transformer3Windings]): The transformers.
+
+    Returns:
+        np.ndarray: The currents of the terminals m, n and p of each transformer, shape (N, 3, 3), the last axis being
+            the sequence. They are also defined in the current variables of the transformers.
+    """
+    columns = slice(VIResultStore.POS_FAULT_SEQ0, VIResultStore.POS_FAULT_SEQ2 + 1)
+
+    terminals = [(transformer.v_bus_m, transformer.v_bus_n, transformer.v_bus_p) for transformer in transformers]
+    v_terminals_pu = np.array([[variable.result_store.values[variable.slot, columns] for variable in variables]
+                               for variables in terminals], dtype=complex).reshape(-1, 3, 3)
+    # The currents of a sequence are defined when the voltages of the three terminals are
+    v_defined = np.array([[variable.result_store.defined[variable.slot, columns] for variable in variables]
+                          for variables in terminals], dtype=bool).reshape(-1, 3, 3).all(axis=1)
+
+    i_terminals_pu = np.empty_like(v_terminals_pu)
+    for position, seq in enumerate(('seq0', 'seq1', 'seq2')):
+        y_matrices = np.array([transformer.admittance_matrix_pu(seq) for transformer in transformers],
+                              dtype=complex).reshape(-1, 3, 3)
+        i_terminals_pu[..., position] = np.einsum('kij,kj->ki', y_matrices, v_terminals_pu[..., position])
+
+    for transformer, i_transformer_pu, i_defined in zip(transformers, i_terminals_pu, v_defined):
+        for variable, i_seq_pu in zip((transformer.i_bus_m, transformer.i_bus_n, transformer.i_bus_p),
+                                      i_transformer_pu):
+            variable.result_store.write(variable.slot, columns, i_seq_pu, i_defined)
+
+    return i_terminals_pu
 
 
 class GroundingTransformer(PassiveElement1Terminal):
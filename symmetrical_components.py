@@ -0,0 +1,88 @@
+import numpy as np
+
+# Fortescue operator, a = 1 /_ 120 degrees
+OPERATOR_A = np.exp(2j * np.pi / 3)
+
+# Phase values (a, b, c) from sequence values (seq0, seq1, seq2): phase = SEQ2PHASE_MATRIX @ seq
+SEQ2PHASE_MATRIX = np.array([[1, 1, 1],
+                             [1, OPERATOR_A ** 2, OPERATOR_A],
+                             [1, OPERATOR_A, OPERATOR_A ** 2]])
+
+# Sequence values from phase values: seq = PHASE2SEQ_MATRIX @ phase
+PHASE2SEQ_MATRIX = np.array([[1, 1, 1],
+                             [1, OPERATOR_A, OPERATOR_A ** 2],
+                             [1, OPERATOR_A ** 2, OPERATOR_A]]) / 3
+
+SEQ2PHASE_MATRIX.setflags(write=False)
+PHASE2SEQ_MATRIX.setflags(write=False)
+
+
+def sequence_to_phase(seq_values: np.ndarray) -> np.ndarray:
+    """
+    Converts sequence values into phase values.
+
+    Args:
+        seq_values (np.ndarray): The seq0, seq1 and seq2 values in the last axis, shape (..., 3).
+
+    Returns:
+        np.ndarray: The phase a, b and c values, shape (..., 3).
+    """
+    return np.asarray(seq_values) @ SEQ2PHASE_MATRIX.T
+
+
+def phase_to_sequence(phase_values: np.ndarray) -> np.ndarray:
+    """
+    Converts phase values into sequence values.
+
+    Args:
+        phase_values (np.ndarray): The phase a, b and c values in the last axis, shape (..., 3).
+
+    Returns:
+        np.ndarray: The seq0, seq1 and seq2 values, shape (..., 3).
+    """
+    return np.asarray(phase_values) @ PHASE2SEQ_MATRIX.T
+
+
+def to_si(values_pu: np.ndarray, value_bases: np.ndarray) -> np.ndarray:
+    """
+    Converts pu values into SI values, with one base per row.
+
+    Args:
+        values_pu (np.ndarray): The values in pu, shape (N, ...).
+        value_bases (np.ndarray): The base of each row, shape (N,), or a single base.
+
+    Returns:
+        np.ndarray: The values in SI units.
+    """
+    values_pu = np.asarray(values_pu)
+    value_bases = np.asarray(value_bases, dtype=float)
+
+    return values_pu * value_bases.reshape(value_bases.shape + (1,) * (values_pu.ndim - value_bases.ndim))
+
+
+def magnitude_angle(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the magnitudes and the angles in degrees of complex values.
+    """
+    values = np.asarray(values)
+
+    return np.abs(values), np.degrees(np.angle(values))
+
+
+def phase_report(seq_values_pu: np.ndarray, value_bases: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts (N, 3) sequence values in pu into phase magnitudes and angles, in pu or in SI units.
+
+    Args:
+        seq_values_pu (np.ndarray): The seq0, seq1 and seq2 values in pu, shape (N, 3).
+        value_bases (np.ndarray): The base of each row to report in SI units, None to report in pu.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The magnitudes and the angles in degrees of the phases a, b and c, shape (N, 3).
+    """
+    phase_values = sequence_to_phase(seq_values_pu)
+
+    if value_bases is not None:
+        phase_values = to_si(phase_values, value_bases)
+
+    return magnitude_angle(phase_values)
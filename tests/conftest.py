@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The packages of the repository are imported from its root (e.g. network_elements.generic_elements)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,66 @@
+from network_elements.generic_elements import Network
+from network_elements.matrix_assembly import SEQUENCES
+from network_elements.short_circuit import FAULT_TYPES
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.generic_elements import BusCoupler
+import numpy as np
+import pytest
+
+NUMBER_BUSES = 5
+
+
+def build_network(coupled: bool) -> tuple[Network, list]:
+    # The line to bus 5 starts at bus 4, coupled to bus 3, or at bus 3 itself (bus 4 left isolated)
+    network = Network(NUMBER_BUSES, 100e6, 1, 230e3)
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 10, 1, 2),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 15, 2, 3),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 20, 1, 3)]
+        if coupled:
+            elements += [BusCoupler(3, 4), TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 12, 4, 5)]
+        else:
+            elements += [TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 12, 3, 5)]
+    network.add_elements(elements)
+
+    return network, elements
+
+
+def test_coupled_buses_are_merged():
+    network, _ = build_network(True)
+    network.build_bus_admittance_matrices()
+
+    for seq in SEQUENCES:
+        bus_index = network.sequence_bus_index[seq]
+        assert bus_index[3] == bus_index[4]
+        assert network.sequence_number_nodes[seq] == NUMBER_BUSES - 1
+
+
+def test_coupled_network_matches_direct_connection():
+    z_coupled = build_network(True)[0].calculate_thevenin_impedances()
+    z_direct = build_network(False)[0].calculate_thevenin_impedances()
+
+    np.testing.assert_allclose(z_coupled[[0, 1, 2, 4]], z_direct[[0, 1, 2, 4]], rtol=1e-12)
+    np.testing.assert_array_equal(z_coupled[3], z_coupled[2])
+
+
+def test_bus_coupled_to_the_ground_has_zero_impedance():
+    network, _ = build_network(True)
+    network.add_elements([BusCoupler(5, 0)])
+
+    np.testing.assert_array_equal(network.calculate_thevenin_impedances()[4], 0)
+
+
+@pytest.mark.parametrize('fault_type', FAULT_TYPES)
+def test_coupler_carries_the_current_of_the_line_beyond(fault_type):
+    network, elements = build_network(True)
+    batch = next(network.iterate_fault_element_currents(fault_type, [5]))
+    network.define_bus_voltages_pos_fault_pu(batch.v_buses_pu[0])
+
+    # By Kirchhoff's current law at bus 4, where the line is the only other element
+    i_branches_pu, _ = network.calculate_element_currents_pos_fault_pu()
+    coupler, line = elements[4], elements[5]
+    np.testing.assert_allclose(i_branches_pu[network.elements.index(coupler), 0],
+                               i_branches_pu[network.elements.index(line), 0], rtol=1e-10, atol=1e-14)
+    assert np.any(i_branches_pu[network.elements.index(line), 0] != 0)
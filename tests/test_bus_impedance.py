@@ -0,0 +1,85 @@
+from network_elements.generic_elements import Network
+from network_elements.matrix_assembly import SEQUENCES
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.transformer_elements import Transformer2Windings
+import numpy as np
+import pytest
+
+
+def radial_network():
+    # A source at bus 1, a meshed 230 kV part (1, 2, 3) and a 69 kV bus behind a grounded transformer
+    network = Network(4, 100e6, 1, 230e3)
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 10, 1, 2),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 15, 2, 3),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 20, 1, 3),
+                    Transformer2Windings(0.08j, 3, 4, 230, 69, 50, 'Yg', 'Yg', 0)]
+    network.add_elements(elements)
+
+    return network
+
+
+def interleaved_islands_network():
+    # Two islands with their own source, the buses {1, 3} and {2, 4}, so their nodes {0, 2} and {1, 3} interleave
+    network = Network(4, 100e6, 1, 230e3)
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+                    NetworkEquivalent(0.2j, 0.1j, 0.1j, 2, 230, 100),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 10, 1, 3),
+                    TransmissionLine(2 + 12j, 0.5 + 5j, 0.5 + 5j, 12, 2, 4)]
+    network.add_elements(elements)
+
+    return network
+
+
+def dense_bus_impedance_matrix(network: Network, seq: str) -> np.ndarray:
+    # Zbus by the dense inverse of the bus admittance matrix, indexed by bus id (the ground and the buses merged with
+    # it have null rows and columns)
+    bus_index = network.sequence_bus_index[seq]
+    z_nodes = np.linalg.inv(network.bus_admittance_matrix[seq].toarray())
+
+    z_buses = np.zeros((len(bus_index), len(bus_index)), dtype=complex)
+    buses = np.flatnonzero(bus_index >= 0)
+    z_buses[np.ix_(buses, buses)] = z_nodes[np.ix_(bus_index[buses], bus_index[buses])]
+
+    return z_buses
+
+
+@pytest.mark.parametrize('network_factory', [radial_network, interleaved_islands_network])
+def test_thevenin_impedances_match_dense_inverse(network_factory):
+    network = network_factory()
+    z_thevenin = network.calculate_thevenin_impedances()
+
+    for position, seq in enumerate(SEQUENCES):
+        z_buses = dense_bus_impedance_matrix(network, seq)
+
+        np.testing.assert_allclose(z_thevenin[:, position], np.diag(z_buses)[1:], rtol=1e-10)
+
+
+@pytest.mark.parametrize('network_factory', [radial_network, interleaved_islands_network])
+def test_bus_impedance_columns_match_dense_inverse(network_factory):
+    network = network_factory()
+    network.factorize_bus_admittance_matrices()
+
+    for seq in SEQUENCES:
+        z_buses = dense_bus_impedance_matrix(network, seq)
+
+        for id_bus in range(1, network.number_buses + 1):
+            np.testing.assert_allclose(network.bus_impedance_column(seq, id_bus), z_buses[:, id_bus], rtol=1e-10,
+                                       atol=1e-14)
+
+
+def test_interleaved_islands_are_decoupled():
+    network = interleaved_islands_network()
+
+    islands = network.bus_islands('seq1')
+    assert islands[1] == islands[3] != islands[2] == islands[4]
+    bus_index = network.sequence_bus_index['seq1']
+    assert sorted(bus_index[[1, 3]]) == [0, 2] and sorted(bus_index[[2, 4]]) == [1, 3]
+
+    # A current injected in one island doesn't reach the buses of the other
+    z_column = network.bus_impedance_column('seq1', 1)
+    assert z_column[2] == 0 and z_column[4] == 0
+    assert z_column[3] != 0
@@ -0,0 +1,68 @@
+from network_elements.generic_elements import Network
+from network_elements.short_circuit import FAULT_TYPES
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.transformer_elements import Transformer2Windings
+import numpy as np
+import pytest
+
+NUMBER_BUSES = 6
+
+# The outages, as positions in network_elements(): single lines of the mesh, a transformer, two lines together and the
+# radial line of bus 6, which leaves the bus without a source
+OUTAGES = [(1,), (2,), (3,), (4,), (5,), (1, 4), (6,)]
+
+
+def network_elements() -> list:
+    return [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+            TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 10, 1, 2),
+            TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 15, 2, 3),
+            TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 20, 1, 3),
+            Transformer2Windings(0.08j, 3, 4, 230, 69, 50, 'Yg', 'Yg', 0),
+            Transformer2Windings(0.1j, 2, 5, 230, 69, 50, 'Yg', 'D', 30),
+            TransmissionLine(0.3 + 1j, 0.1 + 0.5j, 0.1 + 0.5j, 4, 4, 6),
+            TransmissionLine(0.3 + 1j, 0.1 + 0.5j, 0.1 + 0.5j, 6, 4, 5)]
+
+
+def build_network(outage: tuple = ()) -> tuple[Network, list]:
+    network = Network(NUMBER_BUSES, 100e6, 1, 230e3)
+    with network:
+        elements = network_elements()
+    network.add_elements([element for position, element in enumerate(elements) if position not in outage])
+
+    return network, elements
+
+
+@pytest.fixture(scope='module')
+def contingency_sweep():
+    network, elements = build_network()
+
+    return network.calculate_contingency_sweep([[elements[position] for position in outage] for outage in OUTAGES])
+
+
+def assert_close_with_inf(actual: np.ndarray, desired: np.ndarray):
+    # The buses without a path to a source have infinite impedances in both results
+    np.testing.assert_array_equal(np.isinf(actual), np.isinf(desired))
+    np.testing.assert_allclose(np.where(np.isinf(actual), 0, actual), np.where(np.isinf(desired), 0, desired),
+                               rtol=1e-8, atol=1e-12)
+
+
+@pytest.mark.parametrize('index', range(len(OUTAGES)))
+def test_outage_thevenin_impedances_match_rebuilt_network(contingency_sweep, index):
+    network, _ = build_network(OUTAGES[index])
+
+    assert_close_with_inf(contingency_sweep.z_thevenin[index], network.calculate_thevenin_impedances())
+
+
+@pytest.mark.parametrize('index', range(len(OUTAGES)))
+def test_outage_fault_currents_match_rebuilt_network(contingency_sweep, index):
+    network, _ = build_network(OUTAGES[index])
+    sweep = network.calculate_short_circuit_sweep()
+
+    for fault_type in FAULT_TYPES:
+        np.testing.assert_allclose(contingency_sweep.currents[fault_type][index], sweep.currents[fault_type],
+                                   rtol=1e-8, atol=1e-12)
+
+
+def test_islanding_outages_are_flagged(contingency_sweep):
+    np.testing.assert_array_equal(contingency_sweep.islanding, [outage == (6,) for outage in OUTAGES])
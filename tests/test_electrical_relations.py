@@ -0,0 +1,51 @@
+from electrical_relations import (calculate_current, equivalent_y_series, delta2star, star2delta,
+                                  calculate_central_v_star, calculate_current_array, equivalent_y_series_array,
+                                  delta2star_array, star2delta_array, calculate_central_v_star_array)
+import numpy as np
+import pytest
+
+RNG = np.random.default_rng(7)
+Y_RANDOM = [RNG.normal(size=50) + 1j * RNG.normal(size=50) for _ in range(3)]
+V_RANDOM = [RNG.normal(size=50) + 1j * RNG.normal(size=50) for _ in range(3)]
+
+# Deltas with one and two open branches and series admittances with an ideal one, where the scalar relations have
+# their special cases
+Y_DELTAS_OPEN = (np.array([0, 2 - 1j, 3j, 0, 4, 0]), np.array([1 + 1j, 0, 2, 5j, 0, 0]),
+                 np.array([2j, 1 - 2j, 0, 0, 0, 1 + 1j]))
+Y_SERIES_IDEAL = (np.array([np.inf, 2 - 1j, np.inf, 0]), np.array([3j, np.inf, 1 + 1j, 4]))
+
+
+def scalar_results(function, *arrays) -> np.ndarray:
+    return np.array([function(*(complex(array[index]) for array in arrays)) for index in range(len(arrays[0]))])
+
+
+@pytest.mark.parametrize('y_deltas', [Y_RANDOM, Y_DELTAS_OPEN])
+def test_delta2star_array_matches_scalar(y_deltas):
+    np.testing.assert_allclose(np.transpose(delta2star_array(*y_deltas)), scalar_results(delta2star, *y_deltas),
+                               rtol=1e-12)
+
+
+def test_star2delta_array_matches_scalar():
+    np.testing.assert_allclose(np.transpose(star2delta_array(*Y_RANDOM)), scalar_results(star2delta, *Y_RANDOM),
+                               rtol=1e-12)
+
+
+@pytest.mark.parametrize('y_series', [Y_RANDOM[:2], Y_SERIES_IDEAL])
+def test_equivalent_y_series_array_matches_scalar(y_series):
+    np.testing.assert_allclose(equivalent_y_series_array(*y_series), scalar_results(equivalent_y_series, *y_series),
+                               rtol=1e-12)
+
+
+def test_current_and_central_voltage_arrays_match_scalar():
+    np.testing.assert_allclose(calculate_current_array(Y_RANDOM[0], *V_RANDOM[:2]),
+                               scalar_results(calculate_current, Y_RANDOM[0], *V_RANDOM[:2]), rtol=1e-12)
+    np.testing.assert_allclose(calculate_central_v_star_array(*V_RANDOM, *Y_RANDOM),
+                               scalar_results(calculate_central_v_star, *V_RANDOM, *Y_RANDOM), rtol=1e-12)
+
+
+def test_array_special_cases():
+    # The cases the scalar relations divide by zero in
+    np.testing.assert_array_equal(equivalent_y_series_array(0, 0), 0)
+    np.testing.assert_array_equal(star2delta_array(0, 0, 0), (0, 0, 0))
+    np.testing.assert_array_equal(delta2star_array(0, 0, 0), (0, 0, 0))
+    assert np.isnan(calculate_central_v_star_array(1, 2, 3, 0, 0, 0))
@@ -0,0 +1,92 @@
+from network_elements.generic_elements import Network
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine, TransmissionLinePiModel
+from passive_elements.transformer_elements import Transformer2Windings, Transformer3Windings
+from passive_elements.generic_elements import BusCoupler
+from passive_elements.base_elements import PassiveCompositeElement
+from electrical_values import VIResultStore
+import numpy as np
+import pytest
+
+NUMBER_BUSES = 7
+CURRENT_NAMES = ('i_mn', 'i_np', 'i_mp', 'i_bus_m', 'i_bus_n', 'i_bus_p')
+
+
+def build_network() -> tuple[Network, list]:
+    # Pi sections, a double line (composite), a three winding transformer and a bus coupler to the bus 7
+    network = Network(NUMBER_BUSES, 100e6, 1, 230e3)
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+                    TransmissionLinePiModel(1 + 10j, 0.5 + 4j, 0.5 + 4j, 1e-6j, 3e-6j, 3e-6j, 10, 1, 2),
+                    TransmissionLinePiModel(1 + 10j, 0.5 + 4j, 0.5 + 4j, 1e-6j, 3e-6j, 3e-6j, 15, 2, 3),
+                    PassiveCompositeElement([TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 20, 1, 3),
+                                             TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 20, 1, 3)]),
+                    Transformer3Windings(0.1j, 0.12j, 0.08j, 3, 4, 5, 230, 69, 13.8, 50, 30, 'Yg', 'Yg', 'D', 0, 30),
+                    Transformer2Windings(0.08j, 2, 6, 230, 69, 50, 'Yg', 'Yg', 0),
+                    TransmissionLine(0.3 + 1j, 0.1 + 0.5j, 0.1 + 0.5j, 4, 6, 7),
+                    BusCoupler(4, 7)]
+    network.add_elements(elements)
+    network.calculate_load_flow()
+
+    return network, elements
+
+
+def define_fault_state(network: Network, fault_type: str, id_fault_bus: int) -> np.ndarray:
+    # Defines the post-fault bus voltages of a fault and returns the currents injected into the buses
+    batch = next(network.iterate_fault_element_currents(fault_type, [id_fault_bus]))
+    network.define_bus_voltages_pos_fault_pu(batch.v_buses_pu[0])
+
+    i_fault_seq_pu = network.calculate_short_circuit_sweep().currents[fault_type]
+    i_injected_seq_pu = np.zeros((NUMBER_BUSES, 3), dtype=complex)
+    i_injected_seq_pu[id_fault_bus - 1] = -i_fault_seq_pu[id_fault_bus - 1]
+
+    return i_injected_seq_pu
+
+
+def element_currents(element) -> tuple[np.ndarray, np.ndarray]:
+    # The post-fault currents i_mn, i_np, i_mp, i_bus_m, i_bus_n and i_bus_p of an element and where they are defined
+    columns = slice(VIResultStore.POS_FAULT_SEQ0, None)
+    variables = [getattr(element, name) for name in CURRENT_NAMES]
+
+    return (np.array([variable.result_store.values[variable.slot, columns] for variable in variables]),
+            np.array([variable.result_store.defined[variable.slot, columns] for variable in variables]))
+
+
+@pytest.mark.parametrize('fault_type', ['3ph', 'slg'])
+@pytest.mark.parametrize('id_fault_bus', [3, 7])
+def test_network_pass_matches_element_methods(fault_type, id_fault_bus):
+    network, elements = build_network()
+    i_injected_seq_pu = define_fault_state(network, fault_type, id_fault_bus)
+
+    network.calculate_internal_currents_pos_fault_pu(i_injected_seq_pu)
+    network_currents = [element_currents(element) for element in elements]
+
+    # The terminal voltages the network pass defined, and the bus coupler last by Kirchhoff's current law
+    for element in elements[:-1]:
+        element.calculate_internal_currents_pos_fault_pu()
+    elements[-1].calculate_internal_currents_pos_fault_pu(elements[:-1], i_injected_seq_pu[elements[-1].id_bus_m - 1])
+
+    for element, (currents, defined) in zip(elements, network_currents):
+        element_values, element_defined = element_currents(element)
+        np.testing.assert_array_equal(defined, element_defined)
+        np.testing.assert_allclose(currents[defined], element_values[defined], rtol=1e-12, atol=1e-14)
+
+
+@pytest.mark.parametrize('fault_type', ['3ph', 'slg'])
+@pytest.mark.parametrize('id_fault_bus', [3, 7])
+def test_element_currents_map_matches_element_methods(fault_type, id_fault_bus):
+    network, elements = build_network()
+    i_injected_seq_pu = define_fault_state(network, fault_type, id_fault_bus)
+
+    network.calculate_internal_currents_pos_fault_pu(i_injected_seq_pu)
+    element_methods_currents = [element_currents(element) for element in elements]
+
+    # The map writes every current into the store, so the values of the element methods are read before it runs
+    i_branches_pu, i_buses_pu = network.calculate_element_currents_pos_fault_pu(i_injected_seq_pu)
+    for position, (element_values, element_defined) in enumerate(element_methods_currents):
+        # The currents an element method leaves undefined (e.g. the branches of a three winding transformer) aren't
+        # compared
+        currents = np.concatenate((i_branches_pu[position], i_buses_pu[position]))
+        np.testing.assert_allclose(currents[element_defined], element_values[element_defined], rtol=1e-10,
+                                   atol=1e-12)
+        np.testing.assert_allclose(element_currents(elements[position])[0], currents, rtol=1e-12, atol=1e-14)
@@ -0,0 +1,81 @@
+from network_elements.generic_elements import Network
+from network_elements.matrix_assembly import SEQUENCES
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.transformer_elements import Transformer2Windings
+from passive_elements.element_tables import TransformerTable
+import numpy as np
+import itertools
+import pytest
+
+CONNECTIONS = ('Yg', 'Yzn', 'Y', 'Yn', 'D')
+CONNECTION_PAIRS = list(itertools.product(CONNECTIONS, repeat=2))
+
+# A transformer per connection pair, each from the bus 1 of the source to a bus of its own, with taps and neutral
+# impedances so the bases and the grounding of every row are exercised
+ID_BUSES_N = np.arange(2, len(CONNECTION_PAIRS) + 2)
+Z_SERIES_PU, V_NOM_PRI_KV, V_NOM_SEC_KV, S_NOM_MVA, DELAY_PRI2SEC = 0.08j, 230, 69, 50, 30
+TAP_PRIMARY, TAP_SECONDARY = 1.02, 0.98
+ZN_GROUNDED_PRIMARY_PU, ZN_GROUNDED_SECONDARY_PU = 0.05 + 0.1j, 0.02 + 0.3j
+
+
+def transformer_table() -> TransformerTable:
+    primary_connections, secondary_connections = zip(*CONNECTION_PAIRS)
+
+    return TransformerTable(Z_SERIES_PU, np.ones_like(ID_BUSES_N), ID_BUSES_N, V_NOM_PRI_KV, V_NOM_SEC_KV, S_NOM_MVA,
+                            primary_connections, secondary_connections, DELAY_PRI2SEC, TAP_PRIMARY, TAP_SECONDARY,
+                            ZN_GROUNDED_PRIMARY_PU, ZN_GROUNDED_SECONDARY_PU)
+
+
+def transformers() -> list:
+    return [Transformer2Windings(Z_SERIES_PU, 1, int(id_bus_n), V_NOM_PRI_KV, V_NOM_SEC_KV, S_NOM_MVA, primary,
+                                 secondary, DELAY_PRI2SEC, TAP_PRIMARY, TAP_SECONDARY, ZN_GROUNDED_PRIMARY_PU,
+                                 ZN_GROUNDED_SECONDARY_PU)
+            for id_bus_n, (primary, secondary) in zip(ID_BUSES_N, CONNECTION_PAIRS)]
+
+
+def build_network(with_table: bool) -> Network:
+    network = Network(len(CONNECTION_PAIRS) + 1, 100e6, 1, 230e3 * TAP_PRIMARY)
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100)]
+        if not with_table:
+            elements.extend(transformers())
+    network.add_elements(elements)
+    if with_table:
+        network.add_element_tables([transformer_table()])
+
+    return network
+
+
+@pytest.mark.parametrize('seq', SEQUENCES)
+def test_transformer_table_bus_admittance_matrices_match_objects(seq):
+    table_network, object_network = build_network(True), build_network(False)
+    table_network.build_bus_admittance_matrices()
+    object_network.build_bus_admittance_matrices()
+
+    np.testing.assert_array_equal(table_network.sequence_bus_index[seq], object_network.sequence_bus_index[seq])
+    np.testing.assert_allclose(table_network.bus_admittance_matrix[seq].toarray(),
+                               object_network.bus_admittance_matrix[seq].toarray(), rtol=1e-12, atol=1e-12)
+
+
+def test_transformer_table_thevenin_impedances_match_objects():
+    np.testing.assert_allclose(build_network(True).calculate_thevenin_impedances(),
+                               build_network(False).calculate_thevenin_impedances(), rtol=1e-10)
+
+
+@pytest.mark.parametrize('index', range(len(CONNECTION_PAIRS)))
+def test_transformer_table_rows_match_objects(index):
+    table = transformer_table()
+    transformer = transformers()[index]
+    # The objects are in pu of their nominal base, so are the rows with it as the base of the bus m
+    z_bases = np.full(len(CONNECTION_PAIRS) + 2, transformer.base_m.z_base)
+
+    for seq in SEQUENCES:
+        branch = getattr(transformer, 'branches_' + seq)[0]
+        id_buses_m, id_buses_n = table.branch_terminals(seq)
+        y_pu = table.admittances_pu(seq, z_bases)[index]
+
+        if branch.y_pu == 0:
+            assert y_pu == 0
+        else:
+            assert (id_buses_m[index], id_buses_n[index]) == (branch.id_bus_m, branch.id_bus_n)
+            assert y_pu == pytest.approx(branch.y_pu, rel=1e-12)
@@ -0,0 +1,69 @@
+from network_elements.generic_elements import Network
+from network_elements.matrix_assembly import SEQUENCES
+from active_elements.vsource_elements import NetworkEquivalent, MultiPortEquivalent
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.transformer_elements import Transformer2Windings
+import numpy as np
+import pytest
+
+NUMBER_BUSES = 6
+# The upstream grid (buses 1 to 4) is reduced to the buses 2 (230 kV) and 4 (69 kV), where the feeder (buses 5 and 6)
+# is connected, with a mesh through the feeder from one port to the other
+BOUNDARY_BUSES = [2, 4]
+STUDY_BUSES = [2, 4, 5, 6]
+
+
+def upstream_elements() -> list:
+    return [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+            TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 10, 1, 2),
+            TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 15, 2, 3),
+            TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 20, 1, 3),
+            Transformer2Windings(0.08j, 3, 4, 230, 69, 50, 'Yg', 'Yg', 0)]
+
+
+def feeder_elements() -> list:
+    return [TransmissionLine(0.3 + 1j, 0.1 + 0.5j, 0.1 + 0.5j, 4, 4, 5),
+            TransmissionLine(0.3 + 1j, 0.1 + 0.5j, 0.1 + 0.5j, 6, 5, 6),
+            Transformer2Windings(0.1j, 2, 6, 230, 69, 30, 'Yg', 'Yg', 0)]
+
+
+def build_network(elements_factories: list) -> Network:
+    network = Network(NUMBER_BUSES, 100e6, 2, 230e3)
+    with network:
+        elements = [element for elements_factory in elements_factories for element in elements_factory()]
+    network.add_elements(elements)
+
+    return network
+
+
+@pytest.fixture(scope='module')
+def full_network() -> Network:
+    return build_network([upstream_elements, feeder_elements])
+
+
+def test_saved_equivalent_matches_full_network(full_network, tmp_path):
+    build_network([upstream_elements]).kron_reduction(BOUNDARY_BUSES).save(tmp_path / 'upstream.npz')
+
+    # The feeder study only has the equivalent of the upstream grid, loaded into its own scope
+    study_network = Network(NUMBER_BUSES, 100e6, 2, 230e3)
+    with study_network:
+        elements = [MultiPortEquivalent.load(tmp_path / 'upstream.npz')] + feeder_elements()
+    study_network.add_elements(elements)
+
+    np.testing.assert_allclose(study_network.calculate_thevenin_impedances()[np.subtract(STUDY_BUSES, 1)],
+                               full_network.calculate_thevenin_impedances()[np.subtract(STUDY_BUSES, 1)],
+                               rtol=1e-10)
+
+
+def test_equivalent_matches_dense_schur_complement(full_network):
+    equivalent = full_network.kron_reduction(STUDY_BUSES)
+
+    for seq in SEQUENCES:
+        bus_index = full_network.sequence_bus_index[seq]
+        y_nodes = full_network.bus_admittance_matrix[seq].toarray()
+        kept = bus_index[STUDY_BUSES]
+        eliminated = np.setdiff1d(np.arange(len(y_nodes)), kept)
+        y_reduced = (y_nodes[np.ix_(kept, kept)] - y_nodes[np.ix_(kept, eliminated)] @
+                     np.linalg.solve(y_nodes[np.ix_(eliminated, eliminated)], y_nodes[np.ix_(eliminated, kept)]))
+
+        np.testing.assert_allclose(equivalent.admittance_matrices[seq], y_reduced, rtol=1e-10, atol=1e-12)
@@ -0,0 +1,52 @@
+from network_elements.generic_elements import Network
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.transformer_elements import Transformer2Windings
+import numpy as np
+import pytest
+
+S_LOAD_PU = np.array([0, 0.4 + 0.15j, 0.3 + 0.1j, 0.2 + 0.05j, 0.25 + 0.1j])
+S_GENERATION_PU = np.array([0, 0, 0, 0.3, 0])
+PV_BUSES = [4]
+V_SET_PU = [1.02]
+
+
+def build_network() -> Network:
+    # A meshed 230 kV part with the slack source at bus 1 and a PV bus, and a 69 kV load bus behind a transformer
+    network = Network(5, 100e6, 1, 230e3)
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+                    NetworkEquivalent(0.2j, 0.1j, 0.1j, 4, 230, 100),
+                    TransmissionLine(1 + 10j, 0.05 + 0.4j, 0.05 + 0.4j, 40, 1, 2),
+                    TransmissionLine(1 + 10j, 0.05 + 0.4j, 0.05 + 0.4j, 60, 2, 3),
+                    TransmissionLine(1 + 10j, 0.05 + 0.4j, 0.05 + 0.4j, 50, 1, 3),
+                    TransmissionLine(1 + 10j, 0.05 + 0.4j, 0.05 + 0.4j, 30, 3, 4),
+                    Transformer2Windings(0.08j, 2, 5, 230, 69, 100, 'Yg', 'Yg', 0)]
+    network.add_elements(elements)
+
+    return network
+
+
+@pytest.mark.parametrize('method', ['newton', 'fast_decoupled'])
+def test_load_flow_meets_specifications(method):
+    network = build_network()
+    result = network.calculate_load_flow(S_LOAD_PU, S_GENERATION_PU, PV_BUSES, V_SET_PU, tolerance=1e-10,
+                                         method=method)
+
+    assert result.converged
+    assert result.v_buses_pu[1] == pytest.approx(1)
+    assert abs(result.v_buses_pu[4]) == pytest.approx(V_SET_PU[0])
+    # The power injected by the network equals the specified one at the PQ buses, and its active part at the PV bus
+    s_specified_pu = S_GENERATION_PU - S_LOAD_PU
+    np.testing.assert_allclose(result.s_buses_pu[[2, 3, 5]], s_specified_pu[[1, 2, 4]], atol=1e-9)
+    assert result.s_buses_pu[4].real == pytest.approx(s_specified_pu[3].real, abs=1e-9)
+
+
+def test_newton_raphson_matches_fast_decoupled():
+    newton = build_network().calculate_load_flow(S_LOAD_PU, S_GENERATION_PU, PV_BUSES, V_SET_PU, tolerance=1e-10)
+    fast_decoupled = build_network().calculate_load_flow(S_LOAD_PU, S_GENERATION_PU, PV_BUSES, V_SET_PU,
+                                                         tolerance=1e-10, method='fast_decoupled')
+
+    assert newton.converged and fast_decoupled.converged
+    np.testing.assert_allclose(newton.v_buses_pu, fast_decoupled.v_buses_pu, atol=1e-8)
+    np.testing.assert_allclose(newton.s_buses_pu, fast_decoupled.s_buses_pu, atol=1e-8)
@@ -0,0 +1,57 @@
+from network_elements.generic_elements import Network
+from network_elements.matrix_assembly import SEQUENCES
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.transformer_elements import Transformer2Windings
+from electrical_values import PuBaseManager
+import numpy as np
+import pytest
+
+
+def build_network() -> Network:
+    # A source at bus 1, a meshed 230 kV part (1, 2, 3), a 69 kV bus behind a grounded transformer and a 13.8 kV bus
+    # behind a delta winding, whose seq0 network is open
+    network = Network(5, 100e6, 1, 230e3)
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 10, 1, 2),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 15, 2, 3),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 20, 1, 3),
+                    Transformer2Windings(0.08j, 3, 4, 230, 69, 50, 'Yg', 'Yg', 0),
+                    Transformer2Windings(0.1j, 2, 5, 230, 13.8, 30, 'Yg', 'D', 30)]
+    network.add_elements(elements)
+
+    return network
+
+
+@pytest.fixture(scope='module')
+def equivalents():
+    return build_network().calculate_network_equivalents()
+
+
+@pytest.mark.parametrize('id_bus', [1, 2, 3, 4])
+def test_equivalents_match_defined_by_sc_capacity(equivalents, id_bus):
+    row = np.flatnonzero(equivalents.id_buses == id_bus)[0]
+
+    # Both elements in pu of the voltage base of the bus and of the power base of the table
+    with PuBaseManager():
+        table_equivalent = equivalents.network_equivalent(id_bus)
+    with PuBaseManager():
+        sc_capacity_equivalent = NetworkEquivalent.defined_by_sc_capacity(
+            complex(equivalents.s_sc3_mva[row]), complex(equivalents.s_sc1_mva[row]), id_bus,
+            float(equivalents.v_nom_kv[row]), equivalents.s_base_mva)
+
+    # defined_by_sc_capacity takes the seq2 impedance equal to the seq1 one, as it is in this network
+    for seq in SEQUENCES:
+        y_table_pu = getattr(table_equivalent, 'branches_' + seq)[0].y_pu
+        y_sc_capacity_pu = getattr(sc_capacity_equivalent, 'branches_' + seq)[0].y_pu
+        assert y_table_pu == pytest.approx(y_sc_capacity_pu, rel=1e-10)
+
+
+def test_open_seq0_network_has_no_single_phase_capacity(equivalents):
+    row = np.flatnonzero(equivalents.id_buses == 5)[0]
+
+    assert np.isinf(equivalents.z_thevenin_pu[row, 0])
+    assert equivalents.s_sc1_mva[row] == 0
+    assert equivalents.s_sc3_mva[row] == pytest.approx(np.conj(1 / equivalents.z_thevenin_pu[row, 1]) *
+                                                       equivalents.s_base_mva)
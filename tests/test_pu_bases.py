@@ -0,0 +1,29 @@
+from network_elements.generic_elements import Network
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.transformer_elements import Transformer2Windings
+import numpy as np
+
+
+def network_elements() -> list:
+    return [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+            TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 10, 1, 2),
+            Transformer2Windings(0.08j, 2, 3, 230, 69, 50, 'Yg', 'Yg', 0),
+            TransmissionLine(0.3 + 1j, 0.1 + 0.5j, 0.1 + 0.5j, 4, 3, 4)]
+
+
+def test_elements_created_outside_the_network_scope():
+    scoped_network = Network(4, 100e6, 1, 230e3)
+    with scoped_network:
+        scoped_elements = network_elements()
+    scoped_network.add_elements(scoped_elements)
+
+    # Created with the default manager and moved to the bases of the network when added
+    elements = network_elements()
+    network = Network(4, 100e6, 1, 230e3)
+    network.add_elements(elements)
+
+    assert all(element.base_m is network.pu_base_manager.pu_bases[element.id_bus_m] for element in elements)
+    assert all(element.v_bus_m.result_store is network.result_store for element in elements)
+    np.testing.assert_allclose(network.calculate_thevenin_impedances(),
+                               scoped_network.calculate_thevenin_impedances(), rtol=1e-12)
@@ -0,0 +1,29 @@
+from electrical_values import VIResultStore, PuBase, VoltageVariable, CurrentVariable
+
+
+def test_bases_are_dropped_with_their_last_slot():
+    store = VIResultStore()
+
+    for _ in range(100):
+        pu_base = PuBase(230e3, 100e6, 1)
+        variables = [VoltageVariable(pu_base, store), CurrentVariable(pu_base, store)]
+        # The variables release their slots when they are deleted
+        del variables
+
+    assert len(store.pu_bases) == 1
+    assert store._pu_base_positions == {}
+
+
+def test_base_change_keeps_the_other_slots_of_a_base():
+    store = VIResultStore()
+    old_base, new_base = PuBase(230e3, 100e6, 1), PuBase(69e3, 100e6, 1)
+    voltage, current = VoltageVariable(old_base, store), CurrentVariable(old_base, store)
+
+    voltage.define_value_pre_fault_pu(1.02)
+    voltage.change_base(new_base)
+
+    assert voltage.pu_base is new_base and current.pu_base is old_base
+    assert sorted(id(pu_base) for pu_base in store.pu_bases) == sorted([id(old_base), id(new_base)])
+
+    current.change_base(new_base)
+    assert [pu_base for pu_base in store.pu_bases if pu_base is not None] == [new_base]
@@ -0,0 +1,87 @@
+from network_elements.generic_elements import Network
+from network_elements.short_circuit import FAULT_TYPES
+from active_elements.vsource_elements import NetworkEquivalent
+from passive_elements.line_elements import TransmissionLine
+from passive_elements.transformer_elements import Transformer2Windings
+from symmetrical_components import sequence_to_phase
+import numpy as np
+import pytest
+
+NUMBER_BUSES = 5
+Z_FAULT_PU = 0.02 + 0.01j
+S_LOAD_PU = np.array([0, 0.3 + 0.1j, 0.2 + 0.05j, 0.4 + 0.15j, 0])
+
+
+def build_network() -> Network:
+    # A meshed 230 kV part, a loaded 69 kV bus behind a grounded transformer and a 13.8 kV bus behind a delta winding,
+    # whose seq0 network is open; the pre-fault voltages come from a load flow
+    network = Network(NUMBER_BUSES, 100e6, 1, 230e3)
+    with network:
+        elements = [NetworkEquivalent(0.1j, 0.05j, 0.05j, 1, 230, 100),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 10, 1, 2),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 15, 2, 3),
+                    TransmissionLine(1 + 10j, 0.5 + 4j, 0.5 + 4j, 20, 1, 3),
+                    Transformer2Windings(0.08j, 3, 4, 230, 69, 50, 'Yg', 'Yg', 0),
+                    Transformer2Windings(0.1j, 2, 5, 230, 13.8, 30, 'Yg', 'D', 30)]
+    network.add_elements(elements)
+    network.calculate_load_flow(S_LOAD_PU)
+
+    return network
+
+
+def fault_currents(fault_type: str, z_seq0: complex, z_seq1: complex, z_seq2: complex, v_pre_fault: complex) -> tuple:
+    # The closed forms of a single fault with the phase A as the reference
+    if fault_type == '3ph':
+        i_seq1 = v_pre_fault / (z_seq1 + Z_FAULT_PU)
+        return 0, i_seq1, 0
+    if fault_type == 'slg':
+        i_seq1 = v_pre_fault / (z_seq0 + z_seq1 + z_seq2 + 3 * Z_FAULT_PU)
+        return i_seq1, i_seq1, i_seq1
+    if fault_type == 'll':
+        i_seq1 = v_pre_fault / (z_seq1 + z_seq2 + Z_FAULT_PU)
+        return 0, i_seq1, -i_seq1
+    if np.isinf(z_seq0):
+        i_seq1 = v_pre_fault / (z_seq1 + z_seq2)
+        return 0, i_seq1, -i_seq1
+    z_seq0_fault = z_seq0 + 3 * Z_FAULT_PU
+    i_seq1 = v_pre_fault / (z_seq1 + z_seq2 * z_seq0_fault / (z_seq2 + z_seq0_fault))
+    i_seq2 = -i_seq1 * z_seq0_fault / (z_seq2 + z_seq0_fault)
+    return -(i_seq1 + i_seq2), i_seq1, i_seq2
+
+
+@pytest.fixture(scope='module')
+def network() -> Network:
+    return build_network()
+
+
+@pytest.fixture(scope='module')
+def sweep(network):
+    return network.calculate_short_circuit_sweep(Z_FAULT_PU)
+
+
+@pytest.mark.parametrize('fault_type', FAULT_TYPES)
+@pytest.mark.parametrize('id_bus', range(1, NUMBER_BUSES + 1))
+def test_sweep_matches_single_bus_closed_form(network, sweep, fault_type, id_bus):
+    z_seq0, z_seq1, z_seq2 = network.thevenin_impedances(id_bus)
+    v_pre_fault = network.pre_fault_voltages()[id_bus - 1]
+
+    np.testing.assert_allclose(sweep.currents[fault_type][id_bus - 1],
+                               fault_currents(fault_type, z_seq0, z_seq1, z_seq2, v_pre_fault), rtol=1e-10,
+                               atol=1e-14)
+
+
+@pytest.mark.parametrize('fault_type', FAULT_TYPES)
+def test_sweep_meets_phase_boundary_conditions(sweep, fault_type):
+    i_a, i_b, i_c = sequence_to_phase(sweep.currents[fault_type]).T
+    v_a, v_b, v_c = sequence_to_phase(sweep.voltages[fault_type]).T
+
+    if fault_type == '3ph':
+        conditions = [v_a - Z_FAULT_PU * i_a, v_b - Z_FAULT_PU * i_b, v_c - Z_FAULT_PU * i_c]
+    elif fault_type == 'slg':
+        conditions = [i_b, i_c, v_a - Z_FAULT_PU * i_a]
+    elif fault_type == 'll':
+        conditions = [i_a, i_b + i_c, v_b - v_c - Z_FAULT_PU * i_b]
+    else:
+        conditions = [i_a, v_b - v_c, v_b - Z_FAULT_PU * (i_b + i_c)]
+
+    np.testing.assert_allclose(conditions, 0, atol=1e-10)
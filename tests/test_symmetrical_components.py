@@ -0,0 +1,46 @@
+from electrical_values import PuBaseManager, CurrentVariable
+from symmetrical_components import sequence_to_phase, phase_to_sequence, phase_report
+import numpy as np
+import cmath
+import pytest
+
+RNG = np.random.default_rng(7)
+SEQ_VALUES_PU = RNG.normal(size=(6, 3)) + 1j * RNG.normal(size=(6, 3))
+
+
+def fortescue(value_seq0: complex, value_seq1: complex, value_seq2: complex) -> tuple[complex, complex, complex]:
+    # The phase values of a single set of sequence values, a = 1 /_ 120 degrees
+    a = cmath.rect(1, 2 * cmath.pi / 3)
+
+    return (value_seq0 + value_seq1 + value_seq2,
+            value_seq0 + a ** 2 * value_seq1 + a * value_seq2,
+            value_seq0 + a * value_seq1 + a ** 2 * value_seq2)
+
+
+def test_sequence_to_phase_matches_scalar_fortescue():
+    np.testing.assert_allclose(sequence_to_phase(SEQ_VALUES_PU), [fortescue(*row) for row in SEQ_VALUES_PU],
+                               rtol=1e-12)
+    np.testing.assert_allclose(phase_to_sequence(sequence_to_phase(SEQ_VALUES_PU)), SEQ_VALUES_PU, rtol=1e-12)
+
+
+@pytest.mark.parametrize('row', range(len(SEQ_VALUES_PU)))
+def test_variable_requests_match_sequence_to_phase(row):
+    with PuBaseManager():
+        base = PuBaseManager.create_pu_base(69e3, 100e6, 1)
+        variable = CurrentVariable(base)
+    variable.define_values_pos_fault_pu(*SEQ_VALUES_PU[row])
+
+    phase_values_pu = sequence_to_phase(SEQ_VALUES_PU[row])
+    for position, phase in enumerate(('a', 'b', 'c')):
+        request = getattr(variable.pos(), phase)()
+        assert request.pu().rec() == pytest.approx(phase_values_pu[position], rel=1e-12)
+        assert request.si().rec() == pytest.approx(phase_values_pu[position] * base.i_base, rel=1e-12)
+
+
+def test_phase_report_in_si_units():
+    i_bases = np.linspace(100, 600, len(SEQ_VALUES_PU))
+    magnitudes, angles = phase_report(SEQ_VALUES_PU, i_bases)
+
+    phase_values = np.array([fortescue(*row) for row in SEQ_VALUES_PU]) * i_bases[:, np.newaxis]
+    np.testing.assert_allclose(magnitudes, np.abs(phase_values), rtol=1e-12)
+    np.testing.assert_allclose(angles, np.degrees(np.angle(phase_values)), rtol=1e-10)